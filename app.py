@@ -1,11 +1,23 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import json
-import google.generativeai as genai
 from datetime import datetime
-import io
+import copy
+import os
+
+from profitcalc import ai, compare, depots, engine, fleet, generator, profiling, projection, risk, sensitivity, session, solver
+from profitcalc.cache import ScenarioCache
+from profitcalc.depots import DepotGroup
+from profitcalc.lazy import LazyModule
+from profitcalc.report import ReportCache
+from profitcalc.store import ScenarioStore
+
+# import 가 무거운 모듈은 처음 쓰는 화면에서 불러온다 (콜드 스타트·첫 화면 시간 단축)
+pd = LazyModule("pandas")
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+actuals = LazyModule("profitcalc.actuals")
+drivers = LazyModule("profitcalc.drivers")
 
 # ---------------------------------------------------------
 # 설정 및 유틸리티
@@ -69,40 +81,109 @@ def load_data_callback():
         except Exception as e:
             st.error(f"데이터 파일 읽기 실패: {e}")
 
+def load_depots_callback():
+    uploaded_files = st.session_state.depot_loader
+    for uploaded_file in uploaded_files or []:
+        try:
+            data = json.load(uploaded_file)
+            depot = {"name": uploaded_file.name.rsplit(".", 1)[0], "basic_info": data['basic_info'], "scenarios": data['scenarios']}
+            st.session_state.depots = [d for d in st.session_state.depots if d['name'] != depot['name']] + [depot]
+        except Exception as e:
+            st.error(f"차고지 파일 읽기 실패 ({uploaded_file.name}): {e}")
+
+def apply_overrides_callback(overrides):
+    for key, value in overrides.items():
+        st.session_state[key] = value
+
+# 계산 캐시는 입력 지문을 키로 쓰므로 모든 세션이 함께 써도 안전하다 (서버 전체 항목 수 상한)
+SHARED_CACHE_SIZE = int(os.environ.get("TAXI_PROFIT_CACHE_SIZE", 20000))
+
+@st.cache_resource
+def get_shared_cache():
+    return ScenarioCache(maxsize=SHARED_CACHE_SIZE)
+
+@st.cache_resource
+def get_shared_depot_group():
+    return DepotGroup(maxsize=SHARED_CACHE_SIZE // 16)
+
+@st.cache_resource
+def get_report_cache():
+    return ReportCache()
+
+@st.cache_resource
+def get_scenario_store():
+    # 모든 세션이 같은 DB 연결을 공유 (ScenarioStore 내부에서 잠금 처리)
+    return ScenarioStore()
+
+def load_library_callback(company, ids):
+    store = get_scenario_store()
+    loaded = store.load_scenarios(ids)
+    names = {sc['name'] for sc in loaded}
+    st.session_state.scenarios = [sc for sc in st.session_state.scenarios if sc['name'] not in names] + loaded
+    if company:
+        basic = store.load_basic(company)
+        for key, value in (basic or {}).items():
+            st.session_state[key] = value
+    st.toast(f"✅ 시나리오 {len(loaded)}개를 불러왔습니다.", icon="🗄️")
+
+def add_generated_callback(positions):
+    gen = st.session_state.generated
+    names = {sc['name'] for sc in st.session_state.scenarios}
+    added = 0
+    for i in positions:
+        sc = gen['grid'].scenario(gen['basic_info'], int(i))
+        if sc['name'] not in names:
+            st.session_state.scenarios.append(sc)
+            names.add(sc['name'])
+            added += 1
+    st.toast(f"✅ 생성한 시나리오 {added}개를 추가했습니다.", icon="🧮")
+
 # API Key 처리 로직
 def get_api_key():
     if "GOOGLE_API_KEY" in st.secrets:
         return st.secrets["GOOGLE_API_KEY"]
     return None
 
-def generate_analysis(api_key, prompt):
-    genai.configure(api_key=api_key)
-    valid_model_name = None
-    try:
-        available_models = []
-        for m in genai.list_models():
-            if 'generateContent' in m.supported_generation_methods:
-                available_models.append(m.name)
-        
-        priority_list = ['models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-pro']
-        for p_model in priority_list:
-            if p_model in available_models:
-                valid_model_name = p_model
-                break
-        if not valid_model_name and available_models:
-            valid_model_name = available_models[0]
-    except Exception:
-        valid_model_name = 'gemini-pro'
-
-    if not valid_model_name:
-        return "사용 가능한 AI 모델을 찾을 수 없습니다.", "Unknown"
-
-    try:
-        model = genai.GenerativeModel(valid_model_name)
-        response = model.generate_content(prompt)
-        return response.text, valid_model_name
-    except Exception as e:
-        return f"AI 호출 오류: {str(e)}", valid_model_name
+# AI 호출은 공유 스레드 풀에서 돌고 (동시 호출 수 상한), 화면은 진행 중인 작업을 1초마다 다시 그린다
+AI_WORKERS = int(os.environ.get("TAXI_PROFIT_AI_WORKERS", 4))
+
+@st.cache_resource
+def get_ai_service():
+    # 모델 목록 캐시·응답 캐시·스레드 풀을 모든 세션이 공유
+    return ai.AnalysisService(max_workers=AI_WORKERS)
+
+def show_ai_job(polling):
+    job = st.session_state.get("ai_job")
+    if job is None:
+        return
+    if job.running:
+        retry = f" · 재시도 {job.attempts - 1}회" if job.attempts > 1 else ""
+        st.caption(f"⏳ AI가 데이터를 분석 중입니다... ({job.model or '모델 확인 중'} · {job.elapsed():.0f}초{retry})")
+        st.markdown(job.text)
+    elif polling:
+        # 끝났으면 전체를 한 번 다시 그려 주기적 갱신을 멈춘다
+        st.rerun()
+    elif job.status == "error":
+        st.error(job.error)
+    else:
+        note = " (저장된 분석 결과)" if job.cached else f" ({job.elapsed():.1f}초)"
+        st.success(f"✅ 심층 분석 완료!{note}")
+        st.caption(f"모델: {job.model}")
+        st.markdown(job.text)
+
+@st.cache_resource
+def start_profiling_outputs():
+    # JSON 로그·지표 엔드포인트는 환경 변수로 설정했을 때만 프로세스에 한 번 연다
+    profiling.configure_log()
+    return profiling.serve_metrics()
+
+# 성능 진단 (사이드바 '🔬 성능 진단' 에서 켜면 이번 재실행의 구간별 시간을 모은다)
+start_profiling_outputs()
+profiler = profiling.Profiler(
+    enabled=st.session_state.get("profile_enabled", profiling.ENABLED_BY_DEFAULT),
+    memory=st.session_state.get("profile_memory", False),
+    context={"scenarios": len(st.session_state.get("scenarios", []))},
+)
 
 st.title("🚖 택시회사 급여 수익성 분석툴 with 레브모빌리티")
 st.markdown("---")
@@ -110,7 +191,7 @@ st.markdown("---")
 # ---------------------------------------------------------
 # 사이드바 & 입력 로직
 # ---------------------------------------------------------
-with st.sidebar:
+with st.sidebar, profiler.span("사이드바 입력"):
     st.header("1. 회사 기초 환경 설정")
     st.markdown("👇 **노란색 칸**에 회사 데이터를 입력하세요.")
     
@@ -163,6 +244,12 @@ if 'scenarios' not in st.session_state:
     st.session_state.scenarios = []
 if 'form_id' not in st.session_state:
     st.session_state.form_id = 0
+if 'depots' not in st.session_state:
+    st.session_state.depots = []
+calc_cache = get_shared_cache()
+depot_group = get_shared_depot_group()
+# 이전 form_id 로 만들었던 등록 폼 위젯 키 정리
+session.evict(st.session_state, session.FORM_FIELDS, session.numbered_keys(session.FORM_FIELDS, st.session_state.form_id))
 
 with st.form("scenario_form"):
     st.write("👇 **아래 노란색 칸에 시나리오 정보를 입력하세요.**")
@@ -209,160 +296,186 @@ with st.form("scenario_form"):
             st.session_state.form_id += 1
             st.rerun()
 
+with st.expander("📥 운행 실적으로 시나리오 만들기 (기사별 일일 운송수입 CSV/XLSX)"):
+    st.caption("열 이름: 날짜, 기사, 근무형태(주간/야간/교대/일차), 운송수입, 연료(L) · 한 행 = 기사 1명의 하루 기록. 한 번 읽은 파일은 캐시되어 다시 열 때 바로 표시됩니다.")
+    log_file = st.file_uploader("운행 기록 파일", type=["csv", "xlsx"], key="actuals_loader")
+    if log_file is not None:
+        try:
+            with st.spinner("운행 기록을 집계 중입니다..."):
+                actual_records = actuals.load_actuals(log_file)
+        except Exception as e:
+            st.error(f"운행 기록 읽기 실패: {e}")
+            actual_records = []
+        if actual_records:
+            df_actuals = pd.DataFrame(actual_records)
+            df_actuals['shift'] = df_actuals['shift'].map(dict(zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)))
+            df_actuals = df_actuals.rename(columns={
+                "month": "월", "shift": "근무형태", "driver_days": "운행 건수", "drivers": "기사 수",
+                "mean_sanap": "평균 사납금", "median_sanap": "중앙 사납금", "mean_days": "평균 근무일수",
+                "mean_liters": "1일 평균 연료(L)", "total_revenue": "운송수입 합계", "total_liters": "연료 합계(L)"})
+            st.dataframe(df_actuals.style.format({
+                    "운행 건수": "{:,.0f}", "기사 수": "{:,.0f}", "평균 사납금": "{:,.0f}", "중앙 사납금": "{:,.0f}",
+                    "평균 근무일수": "{:.1f}", "1일 평균 연료(L)": "{:.1f}", "운송수입 합계": "{:,.0f}", "연료 합계(L)": "{:,.0f}"
+                }), use_container_width=True, height=300)
+            overrides = actuals.actual_basic_overrides(actual_records)
+            st.button("⛽ 전체 기간 실적 연료량·근무일수를 사이드바에 반영", on_click=apply_overrides_callback, args=(overrides,))
+            if st.session_state.scenarios:
+                ac1, ac2 = st.columns(2)
+                template_name = ac1.selectbox("급여 조건을 가져올 기준 시나리오", [sc['name'] for sc in st.session_state.scenarios], key="actuals_template")
+                actual_stat = ac2.radio("사납금 기준", ["평균", "중앙값"], horizontal=True, key="actuals_stat")
+                if st.button("➕ 월별 실적 시나리오 추가"):
+                    template = next(sc for sc in st.session_state.scenarios if sc['name'] == template_name)
+                    new_scenarios = actuals.actual_scenarios(actual_records, template, "mean_sanap" if actual_stat == "평균" else "median_sanap")
+                    # 같은 달 실적을 다시 가져오면 이름이 겹치므로 기존 "실적 YYYY-MM" 시나리오를 새 값으로 바꾼다
+                    new_names = {sc['name'] for sc in new_scenarios}
+                    n_replaced = sum(sc['name'] in new_names for sc in st.session_state.scenarios)
+                    st.session_state.scenarios = [sc for sc in st.session_state.scenarios if sc['name'] not in new_names] + new_scenarios
+                    st.success(f"실적 시나리오 {len(new_scenarios)}개가 추가되었습니다." + (f" (기존 {n_replaced}개 교체)" if n_replaced else ""))
+                    st.rerun()
+            else:
+                st.info("급여 조건을 가져올 기준 시나리오를 먼저 하나 등록해주세요.")
+
+with st.expander("🧮 급여 조건 일괄 생성 (시급 · 소정근로 · 비과세 · 사납금 범위 → 파레토 프런티어)"), profiler.span("급여 조건 일괄 생성"):
+    if not st.session_state.scenarios:
+        st.info("기준이 될 시나리오를 먼저 하나 등록해주세요.")
+    else:
+        st.caption("기준 시나리오를 항목별 범위의 모든 조합으로 펼쳐 한 번에 계산하고, 회사 영업이익과 기사 실수령액 중 어느 쪽도 더 나은 조합이 없는 안(파레토 프런티어)만 보여줍니다. "
+                   "실수령액은 급여 총액에서 근로자 부담 4대보험(국민연금·건강·장기요양·실업급여, 과세분 기준)을 빼고 (1일 운송수입 - 사납금) × 만근일수를 더한 금액이며, 소득세는 빼지 않았습니다.")
+        gen_basic = {k: st.session_state[k] for k in engine.BASIC_KEYS}
+        gen_names = [sc['name'] for sc in st.session_state.scenarios]
+        gc1, gc2 = st.columns([2, 1])
+        gen_template_name = gc1.selectbox("기준 시나리오", gen_names, key="gen_template")
+        gen_idx = gen_names.index(gen_template_name)
+        gen_template = st.session_state.scenarios[gen_idx]
+        gen_link_pay = gc2.checkbox("시급·소정근로 변경분을 급여 총액에 반영", value=True, key="gen_link_pay",
+                                    help="(시급 × 소정근로 × 만근일수) 가 기준 시나리오보다 늘어난 만큼 근무형태별 급여 총액을 올립니다.")
+
+        def range_inputs(label, key, default, step):
+            rc0, rc1, rc2, rc3 = st.columns([1, 2, 2, 2])
+            rc0.markdown(f"###### {label}")
+            start = rc1.number_input(f"{label} 시작", value=int(default), step=step, key=f"gen_{key}_start_{gen_idx}")
+            stop = rc2.number_input(f"{label} 끝", value=int(default) + 4 * step, step=step, key=f"gen_{key}_stop_{gen_idx}")
+            size = rc3.number_input(f"{label} 간격", value=step, min_value=0, step=step, key=f"gen_{key}_step_{gen_idx}")
+            return generator.value_range(start, stop, size)
+
+        gen_axes = {"hourly": range_inputs("통상 시급", "hourly", gen_template['hourly'], 250)}
+        gen_counts = engine.driver_counts(engine.normalize_basic(gen_basic))
+        for k, label, count in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS, gen_counts):
+            # 인원 0명인 근무형태는 결과에 영향이 없으므로 기준 시나리오 값으로 고정
+            if count > 0:
+                gen_axes[f"sanap_{k}"] = range_inputs(f"{label} 사납금", f"sanap_{k}", gen_template[k]['sanap'] - 10000, 5000)
+        st.markdown("###### 기사 1일 평균 운송수입 (사납금을 넘는 금액은 기사 몫)")
+        rev_cols = st.columns(len(engine.SHIFT_KEYS))
+        gen_revenue = [
+            rc.number_input(f"{label} 운송수입", value=int(gen_template[k]['sanap']), step=5000,
+                                            disabled=count == 0, key=f"gen_revenue_{k}_{gen_idx}")
+            for rc, k, label, count in zip(rev_cols, engine.SHIFT_KEYS, engine.SHIFT_LABELS, gen_counts)
+        ]
+        lc1, lc2 = st.columns(2)
+        gen_errors = []
+        try:
+            gen_axes["work_time"] = generator.parse_values(lc1.text_input("1일 소정근로(시간, 쉼표 구분)", f"{gen_template['work_time']:g}", key=f"gen_work_time_{gen_idx}"))
+        except ValueError as e:
+            gen_errors.append(f"1일 소정근로: {e}")
+        try:
+            gen_axes["tf"] = generator.parse_values(lc2.text_input("비과세 조정액(원, 쉼표 구분 · 근무형태별 기준 비과세에 더함)", "0", key=f"gen_tf_{gen_idx}"))
+        except ValueError as e:
+            gen_errors.append(f"비과세 조정액: {e}")
+
+        gen_grid = generator.ScenarioGrid(gen_template, gen_axes, link_pay=gen_link_pay)
+        n_gen = len(gen_grid)
+        for message in gen_errors:
+            st.error(message)
+        if n_gen > generator.MAX_SCENARIOS:
+            st.warning(f"조합이 {n_gen:,}개로 최대 {generator.MAX_SCENARIOS:,}개를 넘습니다. 범위를 좁히거나 간격을 늘려주세요.")
+        if st.button(f"▶ {n_gen:,}개 조합 생성 및 계산", disabled=bool(gen_errors) or n_gen > generator.MAX_SCENARIOS, key="gen_run"):
+            started = datetime.now()
+            with st.spinner(f"{n_gen:,}개 조합을 계산 중입니다..."), profiler.span("일괄 생성 계산"):
+                gen_out = generator.evaluate(gen_basic, gen_grid, revenue=gen_revenue)
+                st.session_state.generated = {
+                    "grid": gen_grid, "basic_info": gen_basic, "revenue": gen_revenue, **gen_out,
+                    "front": generator.pareto_front(gen_out['profit'], gen_out['take_home']),
+                    "seconds": (datetime.now() - started).total_seconds(),
+                }
+
+        gen = st.session_state.get("generated")
+        if gen:
+            if gen['basic_info'] != gen_basic or gen['revenue'] != gen_revenue:
+                st.warning("계산한 뒤 사이드바 기초 환경이나 운송수입이 바뀌었습니다. 최신 값으로 보려면 다시 계산해주세요.")
+            front = gen['front']
+            gm1, gm2, gm3 = st.columns(3)
+            gm1.metric("계산한 조합", f"{len(gen['profit']):,}개")
+            gm2.metric("파레토 프런티어", f"{len(front):,}개")
+            gm3.metric("계산 시간", f"{gen['seconds']:.2f}초")
+
+            front_values = gen['grid'].values(front)
+            front_columns = {
+                "통상 시급": front_values['hourly'],
+                "1일 소정근로": front_values['work_time'],
+                "비과세 조정액": front_values['tf'],
+                **{generator.AXIS_LABELS[f"sanap_{k}"]: front_values[f"sanap_{k}"]
+                   for k in engine.SHIFT_KEYS if len(gen['grid'].axes[f"sanap_{k}"]) > 1},
+                "영업이익 (월)": gen['profit'][front],
+                "이익률": gen['margin'][front],
+                "기사 평균 실수령액": gen['take_home'][front],
+            }
+            df_front = pd.DataFrame(front_columns)
+            front_event = st.dataframe(
+                df_front.style.format({col: "{:.2f}" if col == "1일 소정근로" else "{:.1f}%" if col == "이익률" else "{:,.0f}" for col in df_front.columns}),
+                on_select="rerun", selection_mode="multi-row", use_container_width=True, height=300, key="gen_table")
+            front_selected = [front[i] for i in front_event.selection.rows if i < len(front)]
+            st.button(f"➕ 선택한 {len(front_selected)}개를 시나리오로 추가", disabled=not front_selected,
+                      on_click=add_generated_callback, args=(front_selected,), key="gen_add")
+
+            with profiler.span("일괄 생성 차트"):
+                # 전체 조합은 격자 칸마다 한 점만 남기고(프런티어는 유지) WebGL 로 그린다
+                shown = compare.downsample(gen['take_home'], gen['profit'], keep=front)
+                scatter = go.Scattergl if len(shown) > compare.WEBGL_THRESHOLD else go.Scatter
+                fig_front = go.Figure()
+                fig_front.add_trace(scatter(x=gen['take_home'][shown], y=gen['profit'][shown], mode="markers", name="전체 조합",
+                                            marker=dict(color="lightgray", size=4),
+                                            hovertemplate="실수령액 %{x:,.0f}<br>영업이익 %{y:,.0f}<extra></extra>"))
+                fig_front.add_trace(go.Scatter(x=gen['take_home'][front], y=gen['profit'][front], mode="lines+markers", name="파레토 프런티어",
+                                               marker=dict(color="crimson", size=7),
+                                               hovertemplate="실수령액 %{x:,.0f}<br>영업이익 %{y:,.0f}<extra></extra>"))
+                sample_note = f" (표시 {len(shown):,}/{len(gen['profit']):,}개)" if len(shown) < len(gen['profit']) else ""
+                fig_front.update_layout(title=f"기사 평균 실수령액 vs 회사 영업이익{sample_note}",
+                                        xaxis_title="기사 평균 실수령액 (월)", yaxis_title="영업이익 (월)")
+                st.plotly_chart(fig_front, use_container_width=True)
+
 st.markdown("---")
 st.header("3. 상세 검증 및 분석")
 
 if st.session_state.scenarios:
-    # 계산 로직
-    net_rent_cost = rent_cost / 1.1
-    net_admin_salary = admin_salary_total
-    net_car_price = car_price / 1.1
-    net_car_maint_val = car_maint / 1.1
-    monthly_dep = (net_car_price / car_dep_years / 12) if car_dep_years > 0 else 0
-    monthly_ins = (insurance_year / 12)
-    car_fixed_cost_monthly = monthly_dep + monthly_ins + net_car_maint_val
-    
-    cars_used_by_daily = n_daily
-    cars_available_for_shared = n_cars - cars_used_by_daily
-    if cars_available_for_shared < 0: cars_available_for_shared = 0
-    total_slots_shared = cars_available_for_shared * 2
-    used_slots_shared = n_day + n_night + n_shift
-    empty_slots = total_slots_shared - used_slots_shared
-    if empty_slots < 0: empty_slots = 0
-    cost_per_half_slot = car_fixed_cost_monthly / 2
-    total_leakage_cost = empty_slots * cost_per_half_slot
-    total_overhead_sum = net_rent_cost + net_admin_salary + total_leakage_cost
-    cost_overhead = total_overhead_sum / total_drivers if total_drivers > 0 else 0
-
-    def get_car_cost_details(driver_type):
-        ratio = 1.0 if driver_type == 'single' else 0.5
-        c_dep = monthly_dep * ratio
-        c_ins = monthly_ins * ratio 
-        c_maint = net_car_maint_val * ratio
-        return c_dep, c_ins, c_maint
+    # 계산 로직 (profitcalc.engine 배치 연산, 입력이 바뀐 시나리오만 재계산)
+    basic_info = {k: st.session_state[k] for k in engine.BASIC_KEYS}
+    fixed = engine.fixed_costs(basic_info)
+    car_fixed_cost_monthly = fixed['car_fixed_cost_monthly']
+    total_overhead_sum = fixed['total_overhead_sum']
+    cost_overhead = fixed['cost_overhead']
 
     def calculate_scenario(sc_data, override_sanap=None):
-        hourly_wage = sc_data['hourly']
-        work_time_sc = sc_data['work_time']
-        s_day = override_sanap['day'] if override_sanap else sc_data['day']['sanap']
-        s_night = override_sanap['night'] if override_sanap else sc_data['night']['sanap']
-        s_shift = override_sanap['shift'] if override_sanap else sc_data['shift']['sanap']
-        s_daily = override_sanap['daily'] if override_sanap else sc_data['daily']['sanap']
-
-        types = [
-            ("주간", n_day, s_day, fuel_day, sc_data['day']['pay'], sc_data['day']['tf'], 'shared'),
-            ("야간", n_night, s_night, fuel_night, sc_data['night']['pay'], sc_data['night']['tf'], 'shared'),
-            ("교대", n_shift, s_shift, fuel_shift, sc_data['shift']['pay'], sc_data['shift']['tf'], 'shared'),
-            ("일차", n_daily, s_daily, fuel_daily, sc_data['daily']['pay'], sc_data['daily']['tf'], 'single')
-        ]
+        if override_sanap:
+            sc_data = engine.with_sanap(sc_data, override_sanap)
+        return calc_cache.evaluate(basic_info, [sc_data])[0]
 
-        total_profit = 0
-        total_revenue = 0
-        total_labor = 0
-        details = []
-        debug_rows = {}
-
-        for t_name, count, sanap, fuel, pay, tf, d_type in types:
-            if count == 0: continue
-            monthly_sanap = sanap * full_days
-            vat_out = monthly_sanap * (10 / 110)
-            card_fee = monthly_sanap * 0.015
-            fuel_liter = fuel * full_days
-            net_fuel_cost = fuel_liter * (lpg_price / 1.1)
-            c_dep, c_ins, c_maint = get_car_cost_details(d_type)
-            total_car_fixed = c_dep + c_ins + c_maint
-            
-            total_pay = pay
-            taxable_pay = pay - tf
-            if taxable_pay < 0: taxable_pay = 0
-            severance = total_pay / 12 
-            annual_leave = hourly_wage * work_time_sc * 1.25
-            
-            ins_pension = taxable_pay * rate_pension
-            ins_health = taxable_pay * rate_health
-            ins_care = ins_health * rate_care_ratio
-            ins_emp = taxable_pay * (rate_emp_unemp + rate_emp_stabil)
-            ins_sanjae = total_pay * rate_sanjae
-            
-            total_4ins = ins_pension + ins_health + ins_care + ins_emp + ins_sanjae
-            total_labor_cost = total_pay + severance + annual_leave + total_4ins
-            
-            total_cost_person = (vat_out + card_fee + net_fuel_cost + total_car_fixed + total_labor_cost + cost_overhead)
-            profit_person = monthly_sanap - total_cost_person
-            
-            group_profit = profit_person * count
-            total_profit += group_profit
-            total_revenue += (monthly_sanap * count)
-            total_labor += (total_labor_cost * count)
-            labor_ratio = (total_labor_cost / monthly_sanap * 100) if monthly_sanap > 0 else 0
-            
-            details.append({
-                "근무형태": t_name,
-                "1인 매출": monthly_sanap,
-                "1인 영업이익": profit_person,
-                "1인 인건비": total_labor_cost,
-                "인건비율": labor_ratio
-            })
-            
-            rows = []
-            rows.append(("1. 월 매출(사납금)", monthly_sanap, f"{sanap:,}원 × {full_days}일"))
-            
-            rows.append(("▼ 매출 공제(세금/수수료)", -(vat_out + card_fee), ""))
-            rows.append(("   └ 부가세(매출세액)", -vat_out, "사납금의 10/110"))
-            rows.append(("   └ 카드수수료", -card_fee, "사납금의 1.5%"))
-            
-            rows.append(("▼ 연료비(Net)", -net_fuel_cost, "부가세 제외 공급가 기준"))
-            
-            rows.append(("▼ 차량 고정비 합계", -total_car_fixed, "감가+보험+유지"))
-            rows.append(("   └ 감가상각비", -c_dep, ""))
-            rows.append(("   └ 보험료", -c_ins, ""))
-            rows.append(("   └ 유지비", -c_maint, ""))
-            
-            rows.append(("▼ 인건비 합계", -total_labor_cost, f"매출 대비 {labor_ratio:.1f}%"))
-            rows.append(("   └ 급여 지급액(Gross)", -total_pay, "입력된 총액"))
-            rows.append(("   └ 퇴직금 적립액", -severance, "급여총액 ÷ 12"))
-            rows.append(("   └ 연차수당", -annual_leave, f"{hourly_wage:,}원×{work_time_sc}h×1.25"))
-            rows.append(("   ▼ [상세] 4대보험 계", -total_4ins, ""))
-            rows.append(("      - 국민연금", -ins_pension, f"{rate_pension*100:.2f}%"))
-            rows.append(("      - 건강보험", -ins_health, f"{rate_health*100:.3f}%"))
-            rows.append(("      - 장기요양", -ins_care, f"건보료의 {rate_care_ratio*100:.2f}%"))
-            rows.append(("      - 고용보험", -ins_emp, f"{(rate_emp_unemp+rate_emp_stabil)*100:.2f}%"))
-            rows.append(("      - 산재보험", -ins_sanjae, f"{rate_sanjae*100:.2f}%"))
-            
-            rows.append(("▼ 공통 운영비 합계", -cost_overhead, ""))
-            rows.append(("   └ 차고지 임대료", -(net_rent_cost/total_drivers), ""))
-            rows.append(("   └ 관리직원 급여", -(net_admin_salary/total_drivers), ""))
-            if total_leakage_cost > 0:
-                rows.append(("   └ ⚠️ 차량 유휴비용", -(total_leakage_cost/total_drivers), f"총 {int(total_leakage_cost):,}원 배분"))
-            
-            rows.append(("■ 최종 영업이익", profit_person, "매출 - 비용합계"))
-            debug_rows[f"{sc_data['name']} - {t_name}"] = rows
-
-        profit_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
-        labor_margin = (total_labor / total_revenue * 100) if total_revenue > 0 else 0
-        return {
-            "name": sc_data['name'],
-            "revenue": total_revenue,
-            "profit": total_profit,
-            "labor": total_labor,
-            "margin": profit_margin,
-            "labor_rate": labor_margin,
-            "details": details,
-            "debug": debug_rows
-        }
-
-    all_results_data = [calculate_scenario(sc) for sc in st.session_state.scenarios]
-    global_debug = {}
-    for res in all_results_data:
-        global_debug.update(res['debug'])
-
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎛️ 사납금 조정", "🏆 시나리오 비교", "📊 근무형태별 분석", "🧾 상세 계산 검증", "🤖 AI 경영 컨설팅"])
-
-    with tab1:
+    with profiler.span("시나리오 계산"):
+        all_results_data = calc_cache.evaluate(basic_info, st.session_state.scenarios)
+    # 상세 계산 검증은 선택된 항목만 필요할 때 계산 (여기서는 이름 목록만)
+    with profiler.span("상세 검증 목록"):
+        debug_index = engine.debug_index(basic_info, st.session_state.scenarios)
+
+    tab1, tab_solver, tab2, tab3, tab_sens, tab_risk, tab_fleet, tab_proj, tab4, tab5 = st.tabs(["🎛️ 사납금 조정", "🎯 손익분기 사납금", "🏆 시나리오 비교", "📊 근무형태별 분석", "📈 민감도 분석", "🎲 리스크 시뮬레이션", "🚕 인력 구성 최적화", "📅 장기 전망", "🧾 상세 계산 검증", "🤖 AI 경영 컨설팅"])
+
+    with tab1, profiler.span("탭: 사납금 조정"):
         st.subheader("🎛️ 사납금 조정 시뮬레이터 (What-If)")
         sc_names = [sc['name'] for sc in st.session_state.scenarios]
         selected_sc_name = st.selectbox("조정할 시나리오 선택", sc_names)
         selected_sc_idx = sc_names.index(selected_sc_name)
+        # 저장 전 조정값은 다른 시나리오를 보는 동안에도 남기고, 없어진 시나리오 위치의 키만 지운다
+        sim_live = set().union(*(session.numbered_keys(session.SIM_FIELDS, i) for i in range(len(sc_names))))
+        session.evict(st.session_state, session.SIM_FIELDS, sim_live)
+        session.keep(st.session_state, sim_live - session.numbered_keys(session.SIM_FIELDS, selected_sc_idx))
         origin_sc = st.session_state.scenarios[selected_sc_idx]
         st.write(f"▼ **'{selected_sc_name}'의 1일 사납금을 조정해 보세요.**")
         ac1, ac2, ac3, ac4 = st.columns(4)
@@ -388,61 +501,320 @@ if st.session_state.scenarios:
             st.success("✅ 업데이트 완료!")
             st.rerun()
 
-    with tab2:
+    with tab_solver, profiler.span("탭: 손익분기 사납금"):
+        st.subheader("🎯 손익분기 · 목표 사납금 역산")
+        st.caption("1인 기준으로 계산합니다. 부가세·카드수수료만 사납금에 비례하므로 필요한 1일 사납금을 바로 구할 수 있습니다.")
+        tc1, tc2 = st.columns(2)
+        target_margin = tc1.number_input("목표 영업이익률 (%)", value=10.0, step=1.0, format="%.1f", key="solver_margin")
+        target_profit = tc2.number_input("목표 1인 월 영업이익 (원)", value=500000, step=100000, key="solver_profit")
+        df_solver = pd.DataFrame(solver.solve_table(basic_info, st.session_state.scenarios, target_margin, target_profit))
+        st.dataframe(df_solver.style.format({
+                "현재 사납금": "{:,.0f}",
+                "현재 1인 영업이익": "{:,.0f}",
+                "손익분기 사납금": "{:,.0f}",
+                "목표 이익률 사납금": "{:,.0f}",
+                "목표 이익 사납금": "{:,.0f}",
+                "공통비 충당 최소 기사 수": "{:,.0f}명"
+            }, na_rep="불가"), use_container_width=True)
+        st.caption("※ 최소 기사 수: 해당 근무형태 기사만으로 운영할 때 임대료·관리직 급여와 빈 차량 비용을 충당하는 데 필요한 인원 "
+                   "(현재 사납금 기준, 빈 차량 비용은 인원마다 다시 계산)")
+
+    with tab2, profiler.span("탭: 시나리오 비교"):
         st.subheader("🏆 시나리오 총괄 비교표")
-        summary_rows = []
-        for res in all_results_data:
-            summary_rows.append({
-                "시나리오명": res['name'],
-                "총 매출 (월)": res['revenue'],
-                "총 인건비 (월)": res['labor'],
-                "영업이익 (월)": res['profit'],
-                "인건비율": res['labor_rate'],
-                "이익률": res['margin']
-            })
-        df_summary = pd.DataFrame(summary_rows)
-        
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df_summary.to_excel(writer, index=False, sheet_name='Summary')
-        
+        # 시나리오가 수천 개여도 되도록 결과를 열 배열로 모아 정렬·필터·페이지를 서버에서 처리하고 한 페이지만 그린다
+        results_table = compare.ResultsTable.from_results(all_results_data)
+        # 엑셀은 다운로드를 누를 때만 만들고, 입력이 같으면 만들어 둔 파일을 재사용
+        report_scenarios = list(st.session_state.scenarios)
+        def get_report_data():
+            return get_report_cache().get(basic_info, report_scenarios)
+
+        fc1, fc2, fc3, fc4 = st.columns([2, 2, 1, 1])
+        cmp_filter = fc1.text_input("시나리오명 검색", key="cmp_filter")
+        cmp_sort = fc2.selectbox("정렬 기준", ["등록 순서", *compare.COLUMNS], key="cmp_sort")
+        cmp_ascending = fc3.radio("정렬 방향", ["내림차순", "오름차순"], key="cmp_order") == "오름차순"
+        cmp_min_margin = fc4.number_input("최소 이익률 (%)", value=None, step=1.0, format="%.1f", key="cmp_min_margin")
+        gc1, gc2, gc3 = st.columns([1, 1, 2])
+        cmp_top = gc1.number_input("상위 N개만 (0 = 전체)", min_value=0, step=10, key="cmp_top")
+        cmp_page_size = gc2.selectbox("페이지당 행 수", [25, 50, 100, 200], index=1, key="cmp_page_size")
+        cmp_index = results_table.query(cmp_filter, None if cmp_sort == "등록 순서" else cmp_sort, cmp_ascending,
+                                        int(cmp_top) or None, {"이익률": cmp_min_margin})
+        cmp_pages = max(1, -(-len(cmp_index) // cmp_page_size))
+        if st.session_state.get("cmp_page", 1) > cmp_pages:
+            st.session_state.cmp_page = cmp_pages
+        cmp_page = gc3.number_input(f"페이지 (전체 {cmp_pages:,}쪽)", min_value=1, max_value=cmp_pages, step=1, key="cmp_page")
+        page_index, _ = results_table.page(cmp_index, cmp_page, cmp_page_size)
+
         c1, c2 = st.columns([4, 1])
-        c1.dataframe(df_summary.style.format({
-                "총 매출 (월)": "{:,.0f}", 
-                "총 인건비 (월)": "{:,.0f}", 
-                "영업이익 (월)": "{:,.0f}", 
-                "인건비율": "{:.1f}%", 
-                "이익률": "{:.1f}%"
-            }).background_gradient(subset=["영업이익 (월)", "이익률"], cmap="Greens").background_gradient(subset=["총 인건비 (월)", "인건비율"], cmap="Reds"), use_container_width=True)
+        with profiler.span("비교표 렌더링"):
+            df_summary = pd.DataFrame(results_table.rows(page_index), index=page_index)
+            # 색은 전체 표 기준으로 미리 계산한 값을 이 페이지 셀에만 입힌다
+            df_colors = pd.DataFrame("", index=df_summary.index, columns=df_summary.columns)
+            for column, styles in results_table.colors(page_index).items():
+                df_colors[column] = styles
+            c1.dataframe(df_summary.style.format({
+                    "총 매출 (월)": "{:,.0f}", 
+                    "총 인건비 (월)": "{:,.0f}", 
+                    "영업이익 (월)": "{:,.0f}", 
+                    "인건비율": "{:.1f}%", 
+                    "이익률": "{:.1f}%"
+                }).apply(lambda _: df_colors, axis=None), use_container_width=True)
+            c1.caption(f"전체 {len(results_table):,}개 중 조건에 맞는 {len(cmp_index):,}개 · {cmp_page}/{cmp_pages}쪽")
         
         c2.download_button(
             label="📥 엑셀 다운로드",
-            data=buffer.getvalue(),
+            data=profiling.timed("엑셀 보고서", get_report_data, enabled=profiler.enabled, scenarios=len(report_scenarios)),
             file_name=f"taxi_analysis_{datetime.now().strftime('%Y%m%d')}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
 
-    with tab3:
+        if st.toggle("📊 분포 차트 보기", key="cmp_charts") and len(cmp_index):
+            with profiler.span("비교 차트"):
+                cmp_x = results_table.columns["인건비율"][cmp_index]
+                cmp_y = results_table.columns["이익률"][cmp_index]
+                # 점이 많으면 격자 칸마다 한 점만 남기고(상위 항목은 유지) WebGL 로 그린다
+                shown = compare.downsample(cmp_x, cmp_y, keep=np.arange(min(len(cmp_index), compare.SERIES_LIMIT)))
+                scatter = go.Scattergl if len(shown) > compare.WEBGL_THRESHOLD else go.Scatter
+                fig_scatter = go.Figure(scatter(
+                    x=cmp_x[shown], y=cmp_y[shown], mode="markers", text=results_table.names[cmp_index[shown]],
+                    marker=dict(color=results_table.columns["영업이익 (월)"][cmp_index[shown]], colorscale="Greens", showscale=True,
+                                colorbar=dict(title="영업이익"), size=8 if len(shown) <= compare.WEBGL_THRESHOLD else 4),
+                    hovertemplate="%{text}<br>인건비율 %{x:.1f}%<br>이익률 %{y:.1f}%<extra></extra>"))
+                sample_note = f" (표시 {len(shown):,}/{len(cmp_index):,}개)" if len(shown) < len(cmp_index) else ""
+                fig_scatter.update_layout(title=f"인건비율 vs 이익률{sample_note}", xaxis_title="인건비율 (%)", yaxis_title="이익률 (%)")
+                bar_index = cmp_index[:compare.SERIES_LIMIT]
+                bar_column = cmp_sort if cmp_sort in compare.FIELDS else "영업이익 (월)"
+                fig_top = go.Figure(go.Bar(x=results_table.names[bar_index], y=results_table.columns[bar_column][bar_index]))
+                fig_top.update_layout(title=f"{bar_column} - 현재 정렬 순서 앞 {len(bar_index)}개", xaxis_title=None)
+                ch1, ch2 = st.columns(2)
+                ch1.plotly_chart(fig_scatter, use_container_width=True)
+                ch2.plotly_chart(fig_top, use_container_width=True)
+
+    with tab3, profiler.span("탭: 근무형태별 분석"):
         st.subheader("🧐 근무 형태별 수익성 상세")
         if all_results_data:
             target_sc = st.selectbox("분석할 시나리오", sc_names, key="tab3_sel")
             target_res = next(r for r in all_results_data if r['name'] == target_sc)
             df_detail = pd.DataFrame(target_res['details'])
             c1, c2 = st.columns(2)
-            fig_bar = go.Figure()
-            fig_bar.add_trace(go.Bar(name='1인 매출', x=df_detail['근무형태'], y=df_detail['1인 매출'], text=df_detail['1인 매출'], texttemplate='%{text:,.0f}'))
-            fig_bar.add_trace(go.Bar(name='1인 이익', x=df_detail['근무형태'], y=df_detail['1인 영업이익'], text=df_detail['1인 영업이익'], texttemplate='%{text:,.0f}'))
-            fig_bar.update_layout(title=f"[{target_sc}] 1인당 실적 비교", barmode='group')
-            c1.plotly_chart(fig_bar, use_container_width=True)
-            fig_rate = px.bar(df_detail, x='근무형태', y='인건비율', color='근무형태', text='인건비율', title=f"[{target_sc}] 인건비율 (%)")
-            fig_rate.update_traces(texttemplate='%{text:.1f}%')
-            c2.plotly_chart(fig_rate, use_container_width=True)
-
-    with tab4:
+            with profiler.span("근무형태별 차트"):
+                fig_bar = go.Figure()
+                fig_bar.add_trace(go.Bar(name='1인 매출', x=df_detail['근무형태'], y=df_detail['1인 매출'], text=df_detail['1인 매출'], texttemplate='%{text:,.0f}'))
+                fig_bar.add_trace(go.Bar(name='1인 이익', x=df_detail['근무형태'], y=df_detail['1인 영업이익'], text=df_detail['1인 영업이익'], texttemplate='%{text:,.0f}'))
+                fig_bar.update_layout(title=f"[{target_sc}] 1인당 실적 비교", barmode='group')
+                c1.plotly_chart(fig_bar, use_container_width=True)
+                fig_rate = px.bar(df_detail, x='근무형태', y='인건비율', color='근무형태', text='인건비율', title=f"[{target_sc}] 인건비율 (%)")
+                fig_rate.update_traces(texttemplate='%{text:.1f}%')
+                c2.plotly_chart(fig_rate, use_container_width=True)
+
+            st.markdown("---")
+            st.markdown("##### 👤 기사별 상세 모델")
+            st.caption("기사마다 급여·사납금·연료량·근무일수·배정 차량을 따로 입력해 계산합니다. 열: 근무형태, 급여총액, 비과세, 일 사납금, 시급, 소정근로(h), 연료(L), 근무일수, 차량(번호, -1=미배정) · 빠진 열이나 빈칸은 위 시나리오 값으로 채웁니다.")
+            target_sc_data = st.session_state.scenarios[sc_names.index(target_sc)]
+            dc1, dc2 = st.columns([3, 1])
+            driver_file = dc1.file_uploader("기사 명단 (CSV/XLSX)", type=["csv", "xlsx"], key="drivers_loader")
+            def get_driver_template():
+                return drivers.DriverTable.from_scenario(basic_info, target_sc_data).to_frame().to_csv(index=False).encode('utf-8-sig')
+            dc2.download_button(
+                label="📄 명단 양식 받기",
+                data=get_driver_template,
+                file_name="drivers_template.csv",
+                mime="text/csv"
+            )
+            if driver_file is not None:
+                driver_table = None
+                try:
+                    df_drivers = pd.read_excel(driver_file) if driver_file.name.lower().endswith(".xlsx") else pd.read_csv(driver_file)
+                    driver_table = drivers.DriverTable.from_frame(df_drivers, basic_info, target_sc_data)
+                except Exception as e:
+                    st.error(f"기사 명단 읽기 실패: {e}")
+                if driver_table is not None and len(driver_table) > 0:
+                    driver_result = drivers.evaluate(basic_info, driver_table)
+                    driver_res = drivers.summarize(driver_result, f"{target_sc} (기사별)")
+                    m1, m2, m3 = st.columns(3)
+                    m1.metric("기사 수", f"{len(driver_table):,}명", f"근무형태별 모델 {int(fixed['total_drivers']):,}명", delta_color="off")
+                    m2.metric("월 영업이익", f"{int(driver_res['profit']):,}원", f"{int(driver_res['profit'] - target_res['profit']):,}원")
+                    m3.metric("빈 차량 슬롯", f"{driver_result['empty_slots']:,.0f}개")
+                    df_compare = pd.DataFrame([engine.summary_row(target_res), engine.summary_row(driver_res)])
+                    st.dataframe(df_compare.style.format({
+                            "총 매출 (월)": "{:,.0f}", "총 인건비 (월)": "{:,.0f}", "영업이익 (월)": "{:,.0f}",
+                            "인건비율": "{:.1f}%", "이익률": "{:.1f}%"
+                        }), use_container_width=True)
+                    st.dataframe(pd.DataFrame(driver_res['details']).style.format({
+                            "1인 매출": "{:,.0f}", "1인 영업이익": "{:,.0f}", "1인 인건비": "{:,.0f}", "인건비율": "{:.1f}%"
+                        }), use_container_width=True)
+                    fig_drivers = px.histogram(
+                        x=driver_result['profit_person'], color=np.asarray(engine.SHIFT_LABELS)[driver_result['shift']],
+                        nbins=50, barmode='overlay', labels={'x': '1인 월 영업이익 (원)', 'color': '근무형태'},
+                        title=f"[{target_sc}] 기사별 1인 영업이익 분포"
+                    )
+                    st.plotly_chart(fig_drivers, use_container_width=True)
+
+    with tab_sens, profiler.span("탭: 민감도 분석"):
+        st.subheader("📈 민감도 분석 (2차원)")
+        st.caption("두 입력값을 구간별로 바꿔가며 월 영업이익/이익률을 한 번에 계산합니다.")
+        sens_sc_name = st.selectbox("분석할 시나리오", sc_names, key="sens_sc")
+        sens_sc = st.session_state.scenarios[sc_names.index(sens_sc_name)]
+        param_keys = list(sensitivity.PARAMS)
+
+        def axis_inputs(axis_label, default_param):
+            a1, a2, a3, a4 = st.columns([2, 1, 1, 1])
+            param = a1.selectbox(f"{axis_label} 항목", param_keys, index=param_keys.index(default_param),
+                                 format_func=sensitivity.PARAMS.get, key=f"sens_{axis_label}_param")
+            current = float(sensitivity.current_value(basic_info, sens_sc, param))
+            lo_default, hi_default = sensitivity.default_range(param, current)
+            lo = a2.number_input("시작", value=lo_default, key=f"sens_{axis_label}_lo_{param}")
+            hi = a3.number_input("끝", value=hi_default, key=f"sens_{axis_label}_hi_{param}")
+            steps = a4.number_input("구간 수", value=41, min_value=2, max_value=400, key=f"sens_{axis_label}_steps")
+            return param, sensitivity.axis_values(param, lo, hi, steps)
+
+        x_param, x_values = axis_inputs("가로축", "sanap")
+        y_param, y_values = axis_inputs("세로축", "lpg_price")
+        sens_metric = st.radio("표시 지표", ["영업이익 (월)", "이익률"], horizontal=True, key="sens_metric")
+        if x_param == y_param:
+            st.warning("가로축과 세로축에 서로 다른 항목을 선택해주세요.")
+        else:
+            with profiler.span("민감도 격자 계산"):
+                sens = sensitivity.grid(basic_info, sens_sc, x_param, x_values, y_param, y_values)
+            z = sens['profit'] if sens_metric == "영업이익 (월)" else sens['margin']
+            fig_sens = go.Figure(go.Heatmap(x=sens['x'], y=sens['y'], z=z, colorscale="RdYlGn", zmid=0,
+                                            hovertemplate="%{x:,.0f} / %{y:,.0f}<br>%{z:,.1f}<extra></extra>"))
+            fig_sens.update_layout(title=f"[{sens_sc_name}] {sens_metric}",
+                                   xaxis_title=sensitivity.PARAMS[x_param], yaxis_title=sensitivity.PARAMS[y_param])
+            st.plotly_chart(fig_sens, use_container_width=True)
+
+    with tab_risk, profiler.span("탭: 리스크 시뮬레이션"):
+        st.subheader("🎲 리스크 시뮬레이션 (몬테카를로)")
+        st.caption("LPG 단가·연료량·실근무 일수·기사 결원을 무작위로 뽑아 월 영업이익 분포를 계산합니다. 같은 Seed 는 같은 결과를 냅니다.")
+        rc1, rc2, rc3, rc4 = st.columns(4)
+        risk_lpg_cv = rc1.number_input("LPG 단가 변동 (표준편차 %)", value=5.0, step=1.0, format="%.1f", key="risk_lpg_cv")
+        risk_fuel_cv = rc2.number_input("연료량 변동 (표준편차 %)", value=10.0, step=1.0, format="%.1f", key="risk_fuel_cv")
+        risk_min_days = rc3.number_input("최소 실근무 일수", value=max(full_days - 2, 0), key="risk_min_days")
+        risk_vacancy = rc4.number_input("최대 결원율 (%)", value=10.0, step=1.0, format="%.1f", key="risk_vacancy")
+        rc5, rc6 = st.columns(2)
+        risk_samples = rc5.selectbox("시나리오별 표본 수", [10_000, 100_000, 1_000_000], index=1, format_func=lambda n: f"{n:,}", key="risk_samples")
+        risk_seed = rc6.number_input("Seed", value=42, step=1, key="risk_seed")
+        if st.button("▶ 시뮬레이션 실행"):
+            risk_specs = risk.basic_specs(basic_info, risk_lpg_cv / 100, risk_fuel_cv / 100, risk_min_days, risk_vacancy / 100)
+            with st.spinner("시뮬레이션 중입니다..."), profiler.span("몬테카를로 시뮬레이션"):
+                # 서버 프로세스 안에서 세션마다 프로세스 풀을 띄우지 않도록 현재 프로세스에서 계산 (결과는 workers 수와 무관)
+                risk_results = risk.simulate(basic_info, st.session_state.scenarios, risk_specs, n_samples=risk_samples,
+                                             seed=int(risk_seed), workers=1)
+            df_risk = pd.DataFrame([{
+                "시나리오명": res['name'],
+                "평균 영업이익": res['mean'],
+                "하위 5%": res['percentiles'][5],
+                "중앙값": res['percentiles'][50],
+                "상위 5%": res['percentiles'][95],
+                "손실 확률": res['prob_loss'] * 100,
+                "기대 손실(하위 5% 평균)": res['expected_shortfall'],
+            } for res in risk_results])
+            st.dataframe(df_risk.style.format({
+                    "평균 영업이익": "{:,.0f}",
+                    "하위 5%": "{:,.0f}",
+                    "중앙값": "{:,.0f}",
+                    "상위 5%": "{:,.0f}",
+                    "손실 확률": "{:.1f}%",
+                    "기대 손실(하위 5% 평균)": "{:,.0f}"
+                }), use_container_width=True)
+
+    with tab_fleet, profiler.span("탭: 인력 구성 최적화"):
+        st.subheader("🚕 인력 구성 최적화")
+        st.caption(f"차량 {n_cars}대를 고정하고 주간/야간/교대/일차 인원 조합 중 월 영업이익이 가장 큰 구성을 찾습니다. (공유 차량은 1대당 2명, 일차는 1대당 1명)")
+        fc1, fc2, fc3, fc4 = st.columns(4)
+        fleet_sc_name = fc1.selectbox("최적화할 시나리오", sc_names, key="fleet_sc")
+        fleet_max_total = fc2.number_input("최대 총 기사 수", value=2 * n_cars, min_value=0, key="fleet_max_total")
+        fleet_min_daily = fc3.number_input("최소 일차 기사 수", value=0, min_value=0, key="fleet_min_daily")
+        fleet_top_k = fc4.number_input("표시할 구성 수", value=5, min_value=1, max_value=50, key="fleet_top_k")
+        fleet_sc = st.session_state.scenarios[sc_names.index(fleet_sc_name)]
+        with profiler.span("인력 구성 탐색"):
+            fleet_rows = fleet.optimize(basic_info, [fleet_sc], max_total=int(fleet_max_total), min_daily=int(fleet_min_daily), top_k=int(fleet_top_k))[0]
+        if not fleet_rows:
+            st.warning("조건을 만족하는 인력 구성이 없습니다. 차량 대수와 제약 조건을 확인해주세요.")
+        else:
+            current_res = all_results_data[sc_names.index(fleet_sc_name)]
+            df_fleet = pd.DataFrame([{
+                "구분": "현재" if i is None else f"추천 {i + 1}",
+                "주간": n_day if i is None else row['n_day'],
+                "야간": n_night if i is None else row['n_night'],
+                "교대": n_shift if i is None else row['n_shift'],
+                "일차": n_daily if i is None else row['n_daily'],
+                "영업이익 (월)": current_res['profit'] if i is None else row['profit'],
+                "이익률": current_res['margin'] if i is None else row['margin'],
+            } for i, row in [(None, None)] + list(enumerate(fleet_rows))])
+            st.dataframe(df_fleet.style.format({
+                    "영업이익 (월)": "{:,.0f}",
+                    "이익률": "{:.1f}%"
+                }), use_container_width=True)
+
+    with tab_proj, profiler.span("탭: 장기 전망"):
+        st.subheader("📅 다년도 손익 전망")
+        st.caption("임금·최저임금·사납금·LPG·운영비 인상과 연도별 4대보험 요율, 차량 구입 시기별 감가상각·교체를 반영해 월별 손익을 계산합니다.")
+        pc1, pc2, pc3 = st.columns(3)
+        proj_start_year = pc1.number_input("시작 연도", value=datetime.now().year, min_value=2000, max_value=2100, key="proj_start_year")
+        proj_start_month = pc2.number_input("시작 월", value=1, min_value=1, max_value=12, key="proj_start_month")
+        proj_years = pc3.slider("전망 기간 (년)", 1, projection.MAX_YEARS, 5, key="proj_years")
+
+        gc1, gc2, gc3 = st.columns(3)
+        proj_hourly_growth = gc1.number_input("시급 인상률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_hourly_growth")
+        proj_pay_growth = gc2.number_input("급여 인상률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_pay_growth")
+        proj_sanap_growth = gc3.number_input("사납금 인상률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_sanap_growth")
+        proj_lpg_growth = gc1.number_input("LPG 단가 변동률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_lpg_growth")
+        proj_cost_growth = gc2.number_input("운영비 인상률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_cost_growth", help="임대료·관리직 급여·차량 유지비·보험료")
+        proj_car_growth = gc3.number_input("차량 가격 상승률 (%/년)", value=0.0, step=0.5, format="%.1f", key="proj_car_growth")
+
+        rate_labels = {"rate_pension": "국민연금 (%)", "rate_health": "건강보험 (%)", "rate_care_ratio": "장기요양 (%)",
+                       "rate_emp_unemp": "실업급여 (%)", "rate_emp_stabil": "고용안정 (%)", "rate_sanjae": "산재보험 (%)"}
+        with st.expander("연도별 요율 · 최저시급 · 차량 구성"):
+            st.caption("연도별 표는 해당 연도부터 적용되며, 표에 없는 연도는 직전 값(없으면 현재 입력값)을 씁니다. "
+                       "최저시급은 시급과 함께 급여 총액 하한(최저시급 × 1일 소정근로 × 만근일수)에도 적용되고, 감가상각비는 차량 구성표의 대수·구입 시기대로 계산합니다.")
+            df_rates = st.data_editor(pd.DataFrame(columns=["연도", *rate_labels.values()]), num_rows="dynamic", use_container_width=True, key="proj_rates")
+            wc1, wc2 = st.columns([1, 2])
+            df_min_wage = wc1.data_editor(pd.DataFrame(columns=["연도", "최저시급"]), num_rows="dynamic", use_container_width=True, key="proj_min_wage")
+            df_vehicles = wc2.data_editor(pd.DataFrame([{"구입연월": f"{proj_start_year}-{proj_start_month:02d}", "대수": n_cars, "구입가": car_price}]),
+                                          num_rows="dynamic", use_container_width=True, key="proj_vehicles")
+            proj_replace = st.checkbox(f"감가상각 기간({car_dep_years}년)이 끝난 차량은 새 차로 교체", value=True, key="proj_replace")
+
+        rate_table = {}
+        for _, row in df_rates.dropna(subset=["연도"]).iterrows():
+            rate_table[int(row["연도"])] = {k: float(row[label]) for k, label in rate_labels.items() if pd.notna(row[label])}
+        min_wage_table = {int(row["연도"]): float(row["최저시급"]) for _, row in df_min_wage.dropna().iterrows()}
+        vehicle_rows = [{"purchased": str(row["구입연월"]), "count": float(row["대수"]), "price": float(row["구입가"])}
+                        for _, row in df_vehicles.dropna().iterrows()]
+        try:
+            with profiler.span("장기 전망 계산"):
+                proj = projection.project(
+                    basic_info, st.session_state.scenarios, int(proj_start_year), int(proj_start_month), int(proj_years),
+                    rate_table=rate_table, hourly_growth=proj_hourly_growth, min_wage=min_wage_table,
+                    pay_growth=proj_pay_growth, sanap_growth=proj_sanap_growth, lpg_growth=proj_lpg_growth,
+                    cost_growth=proj_cost_growth, vehicles=vehicle_rows or None, replace=proj_replace,
+                    car_price_growth=proj_car_growth
+                )
+        except ValueError as e:
+            st.error(f"전망 계산 실패: {e}")
+            proj = None
+        if proj is not None:
+            fig_proj = go.Figure()
+            # 시나리오가 많으면 마지막 달 누적 영업이익 상위 항목만 선으로 그린다
+            proj_shown = np.argsort(-proj['cumulative_profit'][:, -1], kind="stable")[:compare.SERIES_LIMIT]
+            for i in sorted(proj_shown):
+                fig_proj.add_trace(go.Scatter(x=proj['months'], y=proj['cumulative_profit'][i], mode='lines', name=proj['names'][i]))
+            fig_proj.add_hline(y=0, line_dash="dot", line_color="gray")
+            proj_note = f" (상위 {len(proj_shown)}/{len(proj['names']):,}개)" if len(proj_shown) < len(proj['names']) else ""
+            fig_proj.update_layout(title=f"누적 영업이익{proj_note}", xaxis_title="월", yaxis_title="원")
+            st.plotly_chart(fig_proj, use_container_width=True)
+            st.dataframe(pd.DataFrame(projection.annual_rows(proj)).style.format({
+                    "총 매출": "{:,.0f}",
+                    "총 인건비": "{:,.0f}",
+                    "영업이익": "{:,.0f}",
+                    "이익률": "{:.1f}%"
+                }), use_container_width=True)
+
+    with tab4, profiler.span("탭: 상세 계산 검증"):
         st.info("💡 **[▼]** 표시된 항목은 합계, **[└]** 는 상세 내역입니다.")
-        selected_key = st.selectbox("검증할 대상", list(global_debug.keys()))
+        selected_key = st.selectbox("검증할 대상", list(debug_index.keys()))
         if selected_key:
-            records = global_debug[selected_key]
+            debug_sc = st.session_state.scenarios[debug_index[selected_key]]
+            records = calc_cache.breakdown(basic_info, debug_sc)[selected_key]
             df_debug = pd.DataFrame(records, columns=["항목", "금액(원)", "비고"])
             def highlight_row(row):
                 if "최종" in row["항목"]: return ['background-color: #dff9fb; font-weight: bold; color: black'] * len(row)
@@ -452,21 +824,26 @@ if st.session_state.scenarios:
             # [수정] 높이를 800 -> 1200으로 변경
             st.dataframe(df_debug.style.apply(highlight_row, axis=1).format({"금액(원)": "{:,.0f}"}), use_container_width=True, height=1200)
 
-    with tab5:
+    with tab5, profiler.span("탭: AI 경영 컨설팅"):
         st.subheader("🤖 AI 경영 컨설턴트")
         st.markdown("입력된 시나리오 데이터를 분석하여 **수익 개선 전략**을 제안합니다.")
         
         secret_key = get_api_key()
         user_key = None
         
-        if secret_key:
+        if ai.offline():
+            st.caption("🧪 오프라인 스텁 모드 (TAXI_PROFIT_AI_BACKEND=stub) - 외부 API를 호출하지 않습니다.")
+            final_api_key = "stub"
+        elif secret_key:
             final_api_key = secret_key
         else:
             st.info("💡 등록된 시스템 키가 없습니다. 개인 API Key를 입력해주세요.")
             user_key = st.text_input("Google API Key", type="password")
             final_api_key = user_key
         
-        if st.button("AI 분석 요청하기"):
+        ai_job = st.session_state.get("ai_job")
+        ai_running = ai_job is not None and ai_job.running
+        if st.button("AI 분석 요청하기", disabled=ai_running):
             if not final_api_key:
                 st.error("API Key가 없습니다. 키를 입력하거나 관리자에게 문의하세요.")
             else:
@@ -487,9 +864,10 @@ if st.session_state.scenarios:
                         context_info += f"   - 월 매출: {int(res['revenue']):,}원 / 월 영업이익: {int(res['profit']):,}원\n"
                         context_info += f"   - 영업이익률: {res['margin']:.2f}% / 인건비율: {res['labor_rate']:.2f}%\n"
 
+                    # 응답 캐시는 날짜를 뺀 프롬프트로 찾아, 같은 데이터면 날이 바뀌어도 다시 호출하지 않는다
                     prompt = f"""
                     당신은 노련한 '택시 회사 경영 전문 컨설턴트'입니다.
-                    아래 데이터(오늘 날짜: {today_date})를 바탕으로 정밀한 경영 분석 보고서를 작성하세요.
+                    아래 데이터(오늘 날짜: {{today}})를 바탕으로 정밀한 경영 분석 보고서를 작성하세요.
                     [분석할 데이터]
                     {context_info}
                     [작성 목차]
@@ -501,36 +879,176 @@ if st.session_state.scenarios:
                     톤앤매너: 전문적이고 냉철하게, 한국어로 작성.
                     """
                     
-                    with st.spinner("AI가 데이터를 분석 중입니다..."):
-                        response_text, model_name = generate_analysis(final_api_key, prompt)
-                        if "오류" in response_text:
-                            st.error(response_text)
-                        else:
-                            st.success("✅ 심층 분석 완료!")
-                            st.markdown(response_text)
+                    st.session_state.ai_job = get_ai_service().submit(final_api_key, prompt.replace("{today}", today_date),
+                                                                      cache_prompt=prompt)
+                    ai_running = True
                 except Exception as e:
                     st.error(f"AI 오류: {e}")
 
+        # 분석은 백그라운드에서 진행되므로 다른 탭을 써도 멈추지 않고, 이 영역만 1초마다 갱신된다
+        if "ai_job" in st.session_state:
+            st.fragment(show_ai_job, run_every=1.0 if ai_running else None)(ai_running)
+
 else:
     st.info("👈 왼쪽 사이드바에서 시나리오를 등록해주세요.")
 
+st.markdown("---")
+st.header("4. 다중 차고지 통합 분석")
+
+with st.expander("🏢 차고지별 데이터 등록 및 그룹 합산", expanded=bool(st.session_state.depots)), profiler.span("다중 차고지"):
+    st.caption("차고지마다 임대료·관리비·차량 대수와 시나리오를 따로 두고, 공통 운영비는 차고지 안에서만 배부합니다. 입력이 바뀐 차고지만 다시 계산합니다.")
+    dc1, dc2 = st.columns([3, 1])
+    depot_name = dc1.text_input("차고지 이름", "", key="depot_name")
+    if dc2.button("➕ 현재 입력을 차고지로 추가"):
+        if depot_name == "":
+            st.error("차고지 이름을 입력해주세요.")
+        else:
+            depot = {
+                "name": depot_name,
+                "basic_info": {k: st.session_state[k] for k in engine.BASIC_KEYS},
+                "scenarios": copy.deepcopy(st.session_state.scenarios),
+            }
+            st.session_state.depots = [d for d in st.session_state.depots if d['name'] != depot_name] + [depot]
+            st.success(f"[{depot_name}] 차고지가 추가되었습니다.")
+    st.file_uploader("차고지 파일 열기 (JSON, 여러 개 선택 가능)", type=["json"], accept_multiple_files=True,
+                     key="depot_loader", on_change=load_depots_callback)
+
+    if st.session_state.depots:
+        depot_results = depot_group.evaluate(st.session_state.depots)
+        best_row, best_picks = depots.best_mix(depot_results)
+        gm1, gm2, gm3 = st.columns(3)
+        gm1.metric("차고지 수", f"{len(depot_results)} 곳")
+        gm2.metric("최적 조합 월 영업이익", f"{best_row['영업이익 (월)']:,.0f} 원")
+        gm3.metric("최적 조합 이익률", f"{best_row['이익률']:.2f} %")
+        st.caption("최적 조합: " + ", ".join(f"{k} → {v}" for k, v in best_picks.items()))
+
+        st.markdown("##### 📊 그룹 합계 (같은 이름의 시나리오 기준)")
+        df_group = pd.DataFrame(depots.group_table(depot_results))
+        st.dataframe(df_group.style.format({
+                "총 매출 (월)": "{:,.0f}",
+                "총 인건비 (월)": "{:,.0f}",
+                "영업이익 (월)": "{:,.0f}",
+                "인건비율": "{:.1f}%",
+                "이익률": "{:.1f}%"
+            }), use_container_width=True)
+
+        st.markdown("##### 🏢 차고지별 비교")
+        df_depots = pd.DataFrame(depots.depot_table(depot_results))
+        if not df_depots.empty:
+            st.dataframe(df_depots.style.format({
+                    "총 매출 (월)": "{:,.0f}",
+                    "총 인건비 (월)": "{:,.0f}",
+                    "영업이익 (월)": "{:,.0f}",
+                    "인건비율": "{:.1f}%",
+                    "이익률": "{:.1f}%",
+                    "기사 수": "{:,.0f}",
+                    "차량 대수": "{:,.0f}",
+                    "공통 운영비 (월)": "{:,.0f}",
+                    "1인당 공통비": "{:,.0f}"
+                }), use_container_width=True)
+
+        rc1, rc2 = st.columns([3, 1])
+        depot_to_remove = rc1.selectbox("삭제할 차고지", [d['name'] for d in st.session_state.depots], key="depot_remove")
+        if rc2.button("🗑️ 차고지 삭제"):
+            st.session_state.depots = [d for d in st.session_state.depots if d['name'] != depot_to_remove]
+            st.rerun()
+
+st.markdown("---")
+st.header("5. 시나리오 라이브러리")
+library = get_scenario_store()
+with st.expander("🗄️ 회사별 시나리오 저장소 (로컬 DB)"), profiler.span("시나리오 라이브러리"):
+    st.caption("회사별로 기초 환경과 시나리오를 저장해 두고 필요한 것만 골라 불러옵니다. 저장 시 내용이 바뀐 시나리오만 기록됩니다. "
+               "이 서버에 접속한 모든 사용자가 같은 저장소를 보므로 한 사무실 안에서만 쓰세요.")
+    lc1, lc2 = st.columns([3, 1])
+    library_company = lc1.text_input("회사명", key="library_company")
+    if lc2.button("💾 현재 작업 저장", disabled=not library_company):
+        library.save_basic(library_company, {k: st.session_state[k] for k in engine.BASIC_KEYS if k in st.session_state})
+        n_saved = library.sync(library_company, st.session_state.scenarios)
+        st.success(f"'{library_company}' 에 변경된 시나리오 {n_saved}개를 저장했습니다.")
+
+    fc1, fc2, fc3, fc4 = st.columns(4)
+    filter_company = fc1.selectbox("회사", ["전체"] + [c[0] for c in library.companies()], key="library_filter_company")
+    filter_name = fc2.text_input("이름 검색", key="library_filter_name")
+    filter_since = fc3.date_input("수정일 (이후)", value=None, key="library_filter_since")
+    page_size = fc4.selectbox("페이지당", [20, 50, 100], index=1, key="library_page_size")
+    company_arg = None if filter_company == "전체" else filter_company
+    since_arg = filter_since.isoformat() if filter_since else None
+
+    n_library = library.count_scenarios(company_arg, filter_name, since_arg)
+    n_pages = max((n_library - 1) // page_size + 1, 1)
+    if st.session_state.get("library_page", 1) > n_pages:
+        st.session_state.library_page = n_pages
+    page = st.number_input(f"페이지 (총 {n_library:,}개 / {n_pages}쪽)", min_value=1, max_value=n_pages, step=1, key="library_page")
+    library_rows = library.query_scenarios(company_arg, filter_name, since_arg, limit=page_size, offset=(page - 1) * page_size)
+    if library_rows:
+        df_library = pd.DataFrame(library_rows).drop(columns="id").rename(columns={"company": "회사", "name": "시나리오명", "updated_at": "수정일"})
+        library_event = st.dataframe(df_library, on_select="rerun", selection_mode="multi-row", use_container_width=True, key="library_table")
+        selected_ids = [library_rows[i]['id'] for i in library_event.selection.rows if i < len(library_rows)]
+        bc1, bc2, bc3, bc4 = st.columns(4)
+        with_basic = bc1.checkbox("회사 기초 환경도 불러오기", disabled=company_arg is None, key="library_with_basic")
+        bc2.button(f"📂 선택한 {len(selected_ids)}개 불러오기", disabled=not selected_ids, on_click=load_library_callback,
+                   args=(company_arg if with_basic else None, selected_ids))
+        # 삭제는 회사를 골라 목록을 그 회사로 좁힌 뒤 확인까지 해야 한다
+        confirm_delete = bc3.checkbox("삭제 확인", disabled=company_arg is None, key="library_confirm_delete",
+                                      help="회사를 선택해야 그 회사의 시나리오를 삭제할 수 있습니다.")
+        if bc4.button("🗑️ 선택 삭제", disabled=not (selected_ids and company_arg and confirm_delete)):
+            n_deleted = library.delete_scenarios(company_arg, selected_ids)
+            st.toast(f"시나리오 {n_deleted}개를 삭제했습니다.", icon="🗑️")
+            st.rerun()
+    else:
+        st.info("조건에 맞는 저장된 시나리오가 없습니다.")
+    if company_arg:
+        st.download_button(
+            label=f"📥 '{company_arg}' 전체 JSON 내보내기",
+            data=lambda company=company_arg: library.export_json(company),
+            file_name=f"{company_arg}_taxi_profit_data.json",
+            mime="application/json"
+        )
+
 with st.sidebar:
     st.markdown("---")
     st.header("📂 데이터 저장 / 불러오기")
     st.file_uploader("저장된 파일 열기 (JSON)", type=["json"], key="loader_widget", on_change=load_data_callback)
+    # 직렬화는 다운로드 버튼을 눌렀을 때만 (콜백은 별도 스레드에서 실행되므로 현재 값을 미리 잡아 둔다)
+    current_basic = {k: st.session_state[k] for k in engine.BASIC_KEYS if k in st.session_state}
+    current_scenarios = list(st.session_state.get('scenarios', []))
     def get_current_data():
-        keys_to_save = [
-            'n_day', 'n_night', 'n_shift', 'n_daily', 'n_cars',
-            'car_price', 'car_dep_years', 'car_maint', 'insurance_year',
-            'rent_cost', 'admin_salary_total',
-            'full_days', 'lpg_price',
-            'fuel_day', 'fuel_night', 'fuel_shift', 'fuel_daily',
-            'rate_pension', 'rate_health', 'rate_care_ratio', 
-            'rate_emp_unemp', 'rate_emp_stabil', 'rate_sanjae'
-        ]
-        basic_info = {}
-        for k in keys_to_save:
-            if k in st.session_state:
-                basic_info[k] = st.session_state[k]
-        return json.dumps({"basic_info": basic_info, "scenarios": st.session_state.get('scenarios', [])}, indent=4, ensure_ascii=False)
-    st.download_button(label="💾 작업 내용 PC 저장", data=get_current_data(), file_name="taxi_profit_data.json", mime="application/json")
+        return json.dumps({"basic_info": current_basic, "scenarios": current_scenarios}, indent=4, ensure_ascii=False)
+    st.download_button(label="💾 작업 내용 PC 저장", data=profiling.timed("JSON 저장", get_current_data, enabled=profiler.enabled), file_name="taxi_profit_data.json", mime="application/json")
+
+    with st.expander("🧠 세션 메모리"):
+        if st.checkbox("사용량 계산", key="show_memory_usage"):
+            memory_rows = session.usage(st.session_state)
+            st.write(f"**이 세션: {sum(size for _, size in memory_rows) / 1024:,.1f} KB ({len(memory_rows)}개 키)**")
+            st.dataframe(pd.DataFrame(memory_rows[:20], columns=["키", "바이트"]).style.format({"바이트": "{:,.0f}"}), use_container_width=True)
+            cache_stats = calc_cache.stats()
+            st.caption("서버 공유 계산 캐시 (모든 세션 공용): " + " · ".join(
+                f"{name} {v['entries']:,}/{v['maxsize']:,}개 (적중 {v['hits']:,} / 미적중 {v['misses']:,})" for name, v in cache_stats.items()))
+
+    # 맨 마지막에 그려야 이번 재실행의 모든 구간이 들어간다
+    with st.expander("🔬 성능 진단"):
+        st.checkbox("구간별 실행 시간 측정", value=profiling.ENABLED_BY_DEFAULT, key="profile_enabled")
+        st.checkbox("구간별 최고 메모리도 측정 (실행이 느려짐)", key="profile_memory", disabled=not profiler.enabled)
+        if profiler.enabled:
+            profile_rows = profiler.finish()
+            st.write(f"**이번 재실행: {profiler.elapsed() * 1000:,.0f} ms**")
+            df_profile = pd.DataFrame([{
+                "구간": "　" * row["depth"] + row["name"],
+                "횟수": row["count"],
+                "누적(ms)": row["total_ms"],
+                "최대(ms)": row["max_ms"],
+                "최고 메모리(KB)": row["peak_kb"],
+            } for row in profile_rows])
+            profile_format = {"누적(ms)": "{:,.1f}", "최대(ms)": "{:,.1f}"}
+            if profiler.memory:
+                profile_format["최고 메모리(KB)"] = "{:,.0f}"
+            else:
+                df_profile = df_profile.drop(columns="최고 메모리(KB)")
+            st.dataframe(df_profile.style.format(profile_format), use_container_width=True, hide_index=True)
+            metrics = profiling.METRICS.snapshot()
+            if metrics:
+                st.caption(f"서버 누적 (모든 세션, 재실행 {profiling.METRICS.reruns:,}회)")
+                df_metrics = pd.DataFrame([{"구간": name, "횟수": m["count"], "누적(ms)": m["total_ms"], "평균(ms)": m["total_ms"] / m["count"], "최대(ms)": m["max_ms"]}
+                                           for name, m in metrics.items()]).sort_values("누적(ms)", ascending=False)
+                st.dataframe(df_metrics.style.format({"누적(ms)": "{:,.0f}", "평균(ms)": "{:,.1f}", "최대(ms)": "{:,.1f}"}),
+                             use_container_width=True, hide_index=True)
@@ -0,0 +1,247 @@
+"""계산 엔진 · 화면 재실행 · 내보내기 · 차트 생성 시간 측정.
+
+그룹 (--groups 로 고를 수 있다)
+  - core: 시나리오 × 근무형태 조합 1 / 100 / 1만 / 100만 개의 pack → evaluate → summarize,
+          공유 계산 캐시(ScenarioCache)의 첫 계산과 재사용
+  - rerun: 시나리오 10 / 100 / 1,000 개를 등록한 상태로 app.py 전체 실행 (AppTest, 브라우저 없음)
+  - export: 엑셀 보고서와 '작업 내용 PC 저장' JSON 만들기
+  - chart: 근무형태별 막대 차트와 민감도 히트맵 (그림 생성 + 브라우저로 보낼 JSON 직렬화)
+
+기초 환경은 fixtures/standard.json 을 쓰고, 시나리오는 그 첫 시나리오를 고정 seed 로 흔들어 만든다.
+
+    python benchmarks/bench.py --json bench.json
+    python benchmarks/bench.py --quick --groups core,export
+    python benchmarks/bench.py --compare bench.json      # 이전 결과보다 25% 넘게 느려지면 종료 코드 1
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from profitcalc import engine, report, sensitivity  # noqa: E402
+from profitcalc.cache import ScenarioCache  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+FIXTURE = os.path.join(HERE, "fixtures", "standard.json")
+GROUPS = ("core", "rerun", "export", "chart")
+CORE_SIZES = (1, 100, 10_000, 1_000_000)
+RERUN_SIZES = (10, 100, 1000)
+EXPORT_SIZES = (10, 100, 1000)
+CHART_SIZES = (41, 200, 400)
+QUICK = {"core": CORE_SIZES[:3], "rerun": RERUN_SIZES[:2], "export": EXPORT_SIZES[:2], "chart": CHART_SIZES[:2]}
+
+
+def load_basic():
+    with open(FIXTURE, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["basic_info"], data["scenarios"][0]
+
+
+def make_scenarios(template, n, seed=0):
+    """template 의 사납금·급여를 ±10% 안에서 흔든 시나리오 n 개 (같은 seed 면 같은 값)."""
+    rng = np.random.default_rng(seed)
+    factors = rng.uniform(0.9, 1.1, size=(n, 2, len(engine.SHIFT_KEYS)))
+    scenarios = []
+    for i in range(n):
+        sc = copy.deepcopy(template)
+        sc['name'] = f"시나리오 {i + 1}"
+        for j, k in enumerate(engine.SHIFT_KEYS):
+            sc[k]['sanap'] = int(round(template[k]['sanap'] * factors[i, 0, j], -3))
+            sc[k]['pay'] = int(round(template[k]['pay'] * factors[i, 1, j], -4))
+        scenarios.append(sc)
+    return scenarios
+
+
+def timeit(func, min_time=0.2, min_repeat=3, max_repeat=50):
+    """func 를 min_time 초 이상, min_repeat 번 이상 실행한 시간 (첫 실행이 min_time 을 넘으면 1번)."""
+    times = []
+    while True:
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+        if times[0] >= min_time > 0 or len(times) >= max_repeat:
+            break
+        if len(times) >= min_repeat and sum(times) >= min_time:
+            break
+    return {"median": statistics.median(times), "min": min(times), "repeat": len(times)}
+
+
+def record(group, name, size, timing, **extra):
+    return {"group": group, "name": name, "size": size, **timing, **extra}
+
+
+def bench_core(basic_info, template, sizes):
+    results = []
+    info = engine.normalize_basic(basic_info)
+    for combos in sizes:
+        n = max(1, math.ceil(combos / len(engine.SHIFT_KEYS)))
+        scenarios = make_scenarios(template, n)
+        extra = {"scenarios": n, "combos": n * len(engine.SHIFT_KEYS)}
+        batch = engine.pack_scenarios(scenarios)
+        r = engine.evaluate(info, batch)
+        results.append(record("core", "pack", combos, timeit(lambda: engine.pack_scenarios(scenarios)), **extra))
+        results.append(record("core", "evaluate", combos, timeit(lambda: engine.evaluate(info, batch)), **extra))
+        results.append(record("core", "summarize", combos, timeit(lambda: engine.summarize(r)), **extra))
+
+        def cache_cold():
+            ScenarioCache(maxsize=n).evaluate(basic_info, scenarios)
+        warm = ScenarioCache(maxsize=n)
+        warm.evaluate(basic_info, scenarios)
+        results.append(record("core", "cache_cold", combos, timeit(cache_cold), **extra))
+        results.append(record("core", "cache_warm", combos, timeit(lambda: warm.evaluate(basic_info, scenarios)), **extra))
+    return results
+
+
+def bench_rerun(basic_info, template, sizes, reruns=3):
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for n in sizes:
+        at = AppTest.from_file(APP, default_timeout=600)
+        at.secrets["GOOGLE_API_KEY"] = ""
+        for key, value in basic_info.items():
+            at.session_state[key] = value
+        at.session_state["scenarios"] = make_scenarios(template, n, seed=n)
+
+        def run():
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"app.py 실행 오류 (시나리오 {n}개): {at.exception[0].value}")
+        # first_run: 계산 캐시가 비어 있는 첫 실행 (가장 작은 크기에는 pandas·plotly 첫 import 도 포함)
+        results.append(record("rerun", "first_run", n, timeit(run, min_time=0, min_repeat=1, max_repeat=1)))
+        results.append(record("rerun", "rerun", n, timeit(run, min_time=0, min_repeat=reruns, max_repeat=reruns)))
+    return results
+
+
+def bench_export(basic_info, template, sizes):
+    results = []
+    for n in sizes:
+        scenarios = make_scenarios(template, n)
+        timing = timeit(lambda: report.report_bytes(basic_info, scenarios))
+        results.append(record("export", "excel", n, timing, bytes=len(report.report_bytes(basic_info, scenarios))))
+        results.append(record("export", "json", n, timeit(
+            lambda: json.dumps({"basic_info": basic_info, "scenarios": scenarios}, indent=4, ensure_ascii=False))))
+    return results
+
+
+def bench_chart(basic_info, template, sizes):
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    results = []
+    res = engine.summarize(engine.evaluate(engine.normalize_basic(basic_info), engine.pack_scenarios([template])))[0]
+
+    def detail_charts():
+        # tab3 근무형태별 분석과 같은 그림
+        df_detail = pd.DataFrame(res['details'])
+        fig_bar = go.Figure()
+        fig_bar.add_trace(go.Bar(name='1인 매출', x=df_detail['근무형태'], y=df_detail['1인 매출'], text=df_detail['1인 매출'], texttemplate='%{text:,.0f}'))
+        fig_bar.add_trace(go.Bar(name='1인 이익', x=df_detail['근무형태'], y=df_detail['1인 영업이익'], text=df_detail['1인 영업이익'], texttemplate='%{text:,.0f}'))
+        fig_bar.update_layout(title="1인당 실적 비교", barmode='group')
+        fig_rate = px.bar(df_detail, x='근무형태', y='인건비율', color='근무형태', text='인건비율', title="인건비율 (%)")
+        fig_rate.update_traces(texttemplate='%{text:.1f}%')
+        return fig_bar.to_json(), fig_rate.to_json()
+    detail_charts()  # plotly 템플릿 로딩은 측정에서 제외
+    results.append(record("chart", "detail_bars", 1, timeit(detail_charts)))
+
+    for steps in sizes:
+        x_values = np.linspace(80, 120, steps)
+        y_values = np.linspace(basic_info['lpg_price'] * 0.8, basic_info['lpg_price'] * 1.2, steps)
+
+        def heatmap():
+            # tab_sens 민감도 분석과 같은 그림 (격자 계산 포함)
+            sens = sensitivity.grid(basic_info, template, "sanap", x_values, "lpg_price", y_values)
+            fig = go.Figure(go.Heatmap(x=sens['x'], y=sens['y'], z=sens['profit'], colorscale="RdYlGn", zmid=0,
+                                       hovertemplate="%{x:,.0f} / %{y:,.0f}<br>%{z:,.1f}<extra></extra>"))
+            return fig.to_json()
+        results.append(record("chart", "sensitivity_heatmap", steps, timeit(heatmap), cells=steps * steps))
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=ROOT, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+    }
+
+
+def run(groups=GROUPS, quick=False):
+    basic_info, template = load_basic()
+    sizes = QUICK if quick else {"core": CORE_SIZES, "rerun": RERUN_SIZES, "export": EXPORT_SIZES, "chart": CHART_SIZES}
+    benches = {"core": bench_core, "rerun": bench_rerun, "export": bench_export, "chart": bench_chart}
+    results = []
+    for group in groups:
+        results += benches[group](basic_info, template, sizes[group])
+    return {"environment": environment(), "results": results}
+
+
+def compare(previous, current, threshold=1.25):
+    """같은 (group, name, size) 끼리 중앙값 비율. threshold 배보다 느려진 항목 목록도 함께."""
+    before = {(r["group"], r["name"], r["size"]): r["median"] for r in previous["results"]}
+    rows, slower = [], []
+    for r in current["results"]:
+        key = (r["group"], r["name"], r["size"])
+        if key in before and before[key] > 0:
+            ratio = r["median"] / before[key]
+            rows.append((*key, before[key], r["median"], ratio))
+            if ratio > threshold:
+                slower.append(key)
+    return rows, slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수익성 계산 벤치마크")
+    parser.add_argument("--groups", default=",".join(GROUPS), help=f"측정할 그룹 (쉼표 구분, {', '.join(GROUPS)})")
+    parser.add_argument("--quick", action="store_true", help="가장 큰 크기는 건너뛴다")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=1.25, help="--compare 에서 회귀로 볼 배수")
+    args = parser.parse_args(argv)
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(sorted(unknown))}")
+
+    result = run(groups, args.quick)
+    for r in result["results"]:
+        print(f"{r['group']:>7} {r['name']:>20} {r['size']:>9,}: {r['median'] * 1000:10.2f} ms (중앙값, {r['repeat']}회)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            rows, slower = compare(json.load(f), result, args.threshold)
+        print()
+        for group, name, size, old, new, ratio in rows:
+            mark = "  ⚠️" if (group, name, size) in slower else ""
+            print(f"{group:>7} {name:>20} {size:>9,}: {old * 1000:10.2f} → {new * 1000:10.2f} ms (×{ratio:.2f}){mark}")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
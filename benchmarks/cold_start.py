@@ -0,0 +1,122 @@
+"""콜드 스타트 · 첫 화면 렌더링 시간 측정 (브라우저 없이 Streamlit AppTest 로 실행).
+
+매 회 새 파이썬 프로세스에서 다음을 잰다.
+  - import: streamlit 테스트 하네스 import 까지 걸린 시간
+  - first_paint: 빈 세션으로 app.py 를 처음 끝까지 실행한 시간 (시나리오 미등록 화면)
+  - first_render: 예제 회사 데이터를 넣고 분석 탭까지 그린 시간
+  - heavy_modules: 각 시점까지 실제로 import 된 무거운 모듈
+
+    python benchmarks/cold_start.py --repeat 5
+    python benchmarks/cold_start.py --repeat 5 --json cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+HEAVY_MODULES = ("pandas", "plotly.express", "plotly.graph_objects", "google.generativeai", "matplotlib")
+METRICS = ("import", "first_paint", "first_render", "total")
+
+SAMPLE_BASIC = {
+    'n_day': 20, 'n_night': 18, 'n_shift': 6, 'n_daily': 10, 'n_cars': 40,
+    'car_price': 33000000, 'car_dep_years': 5, 'car_maint': 250000, 'insurance_year': 1800000,
+    'rent_cost': 5000000, 'admin_salary_total': 12000000,
+    'full_days': 26, 'lpg_price': 1100,
+    'fuel_day': 25, 'fuel_night': 28, 'fuel_shift': 26, 'fuel_daily': 35,
+}
+SAMPLE_SCENARIO = {
+    "name": "기본안", "hourly": 10320, "work_time": 4.0,
+    "day": {"pay": 2300000, "tf": 0, "sanap": 150000},
+    "night": {"pay": 2500000, "tf": 200000, "sanap": 170000},
+    "shift": {"pay": 2400000, "tf": 100000, "sanap": 160000},
+    "daily": {"pay": 2800000, "tf": 100000, "sanap": 220000},
+}
+
+
+def _loaded():
+    return [m for m in HEAVY_MODULES if m in sys.modules]
+
+
+def measure_once(n_scenarios=3):
+    """현재 프로세스에서 한 번 측정 (새 프로세스에서 불러야 콜드 스타트 값이 된다)."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.secrets["GOOGLE_API_KEY"] = ""
+    at.run()
+    painted = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(f"첫 실행 오류: {at.exception[0].value}")
+    modules_first_paint = _loaded()
+
+    for key, value in SAMPLE_BASIC.items():
+        at.session_state[key] = value
+    at.session_state["scenarios"] = [dict(SAMPLE_SCENARIO, name=f"시나리오 {i + 1}") for i in range(n_scenarios)]
+    at.run()
+    rendered = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(f"분석 화면 오류: {at.exception[0].value}")
+    return {
+        "import": imported - started,
+        "first_paint": painted - imported,
+        "first_render": rendered - painted,
+        "total": rendered - started,
+        "heavy_modules": {"first_paint": modules_first_paint, "first_render": _loaded()},
+    }
+
+
+def run(repeat=5, n_scenarios=3):
+    """repeat 번 새 프로세스에서 측정한 결과 목록과 지표별 중앙값."""
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, __file__, "--child", "--scenarios", str(n_scenarios)],
+                             capture_output=True, text=True, cwd=ROOT)
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "측정 실패")
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        result["process"] = time.perf_counter() - started
+        runs.append(result)
+    summary = {m: statistics.median(r[m] for r in runs) for m in (*METRICS, "process")}
+    return {
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "scenarios": n_scenarios,
+        "median": summary,
+        "heavy_modules": runs[-1]["heavy_modules"],
+        "runs": runs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="app.py 콜드 스타트 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 횟수 (매번 새 프로세스)")
+    parser.add_argument("--scenarios", type=int, default=3, help="분석 화면 측정에 쓸 시나리오 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_once(args.scenarios)))
+        return 0
+
+    result = run(args.repeat, args.scenarios)
+    for m in (*METRICS, "process"):
+        print(f"{m:>13}: {result['median'][m] * 1000:8.0f} ms (중앙값, {args.repeat}회)")
+    for stage, modules in result["heavy_modules"].items():
+        print(f"{stage:>13}: {', '.join(modules) or '-'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""골든 값 회귀 검사 - 계산 결과가 원 단위 이하까지 그대로인지 확인.
+
+fixtures/*.json (사이드바 '작업 내용 PC 저장' 과 같은 형식) 을 계산해 golden/*.json 에 고정해 둔
+값과 비교한다. 시나리오별 합계·근무형태별 값과 상세 계산 검증 탭의 모든 줄(항목, 금액, 비고)을
+비교하며, 엔진을 직접 부른 결과와 공유 계산 캐시(ScenarioCache)를 거친 결과를 모두 본다.
+금액은 JSON 에 float repr 로 저장되므로 기본값(--rtol 0)은 비트 단위 일치를 요구한다.
+
+    python benchmarks/golden.py                 # 검사 (불일치가 있으면 종료 코드 1)
+    python benchmarks/golden.py --json out.json # 결과를 JSON 으로도 저장
+    python benchmarks/golden.py --update        # 산식을 의도적으로 바꾼 뒤 골든 값 갱신
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from profitcalc import engine  # noqa: E402
+from profitcalc.cache import ScenarioCache  # noqa: E402
+
+FIXTURE_DIR = os.path.join(HERE, "fixtures")
+GOLDEN_DIR = os.path.join(HERE, "golden")
+SUMMARY_KEYS = ("revenue", "profit", "labor", "margin", "labor_rate")
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["basic_info"], data["scenarios"]
+
+
+def _summary(res):
+    return {
+        **{k: float(res[k]) for k in SUMMARY_KEYS},
+        "details": [{k: (v if isinstance(v, str) else float(v)) for k, v in d.items()} for d in res['details']],
+    }
+
+
+def compute(basic_info, scenarios):
+    """골든 파일과 같은 구조의 계산 결과."""
+    info = engine.normalize_basic(basic_info)
+    r = engine.evaluate(info, engine.pack_scenarios(scenarios))
+    debug = {}
+    for i, sc in enumerate(scenarios):
+        for key, rows in engine.debug_rows(info, sc, r, i).items():
+            debug[key] = [[item, float(amount), note] for item, amount, note in rows]
+    return {
+        "summary": {res['name']: _summary(res) for res in engine.summarize(r)},
+        "cached_summary": {res['name']: _summary(res) for res in ScenarioCache().evaluate(basic_info, scenarios)},
+        "debug": debug,
+    }
+
+
+def _same(expected, actual, rtol):
+    if isinstance(expected, float) and isinstance(actual, float):
+        return expected == actual or math.isclose(expected, actual, rel_tol=rtol, abs_tol=0)
+    return expected == actual
+
+
+def diff(expected, actual, rtol=0.0, path=""):
+    """다른 곳의 목록 [(경로, 기대값, 실제값), ...]."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        out = []
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            out += diff(expected.get(key), actual.get(key), rtol, f"{path}/{key}")
+        return out
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [(path + "/len", len(expected), len(actual))]
+        out = []
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            out += diff(e, a, rtol, f"{path}/{i}")
+        return out
+    return [] if _same(expected, actual, rtol) else [(path, expected, actual)]
+
+
+def check(rtol=0.0, update=False):
+    """모든 픽스처를 검사 (update 면 골든 파일을 새로 쓴다)."""
+    results = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        golden_path = os.path.join(GOLDEN_DIR, name + ".json")
+        actual = compute(*load_fixture(path))
+        # 캐시를 거친 결과는 엔진 결과와 같아야 하므로 골든 파일에는 한 번만 저장
+        cached = actual.pop("cached_summary")
+        if update:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(golden_path, "w", encoding="utf-8") as f:
+                json.dump(actual, f, ensure_ascii=False, indent=1)
+            results.append({"fixture": name, "status": "updated", "lines": sum(len(rows) for rows in actual["debug"].values()),
+                            "mismatches": []})
+            continue
+        if not os.path.exists(golden_path):
+            results.append({"fixture": name, "status": "missing", "lines": 0, "mismatches": []})
+            continue
+        with open(golden_path, encoding="utf-8") as f:
+            expected = json.load(f)
+        mismatches = diff(expected, actual, rtol) + diff(expected["summary"], cached, rtol, "/cached_summary")
+        results.append({
+            "fixture": name,
+            "status": "ok" if not mismatches else "failed",
+            "lines": sum(len(rows) for rows in expected["debug"].values()),
+            "mismatches": [{"path": p, "expected": e, "actual": a} for p, e, a in mismatches],
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="계산 결과 골든 값 회귀 검사")
+    parser.add_argument("--update", action="store_true", help="현재 계산 결과로 골든 파일을 다시 쓴다")
+    parser.add_argument("--rtol", type=float, default=0.0, help="허용 상대 오차 (기본 0 = 완전 일치)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args(argv)
+
+    results = check(args.rtol, args.update)
+    for r in results:
+        print(f"{r['fixture']:>16}: {r['status']} ({r['lines']}줄)")
+        for m in r["mismatches"][:20]:
+            print(f"    {m['path']}: 기대 {m['expected']!r} / 실제 {m['actual']!r}")
+        if len(r["mismatches"]) > 20:
+            print(f"    ... 외 {len(r['mismatches']) - 20}건")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0 if all(r["status"] in ("ok", "updated") for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
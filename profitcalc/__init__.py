@@ -0,0 +1 @@
+"""택시회사 급여 수익성 계산 모듈 (Streamlit 비의존)."""
@@ -0,0 +1,208 @@
+"""기사별 일일 운송수입/연료 기록(CSV/XLSX) 가져오기.
+
+파일을 chunk 단위로 읽어 (월, 근무형태) 별 누적값만 유지하므로 행 수와 무관하게 메모리가 일정하다.
+집계 결과는 디스크에 캐시해 같은 파일을 다시 열면 파싱하지 않는다.
+
+기본 열 이름: 날짜, 기사, 근무형태(주간/야간/교대/일차), 운송수입, 연료(L)
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+
+DEFAULT_COLUMNS = {"date": "날짜", "driver": "기사", "shift": "근무형태", "revenue": "운송수입", "liters": "연료(L)"}
+SHIFT_ALIASES = {
+    **{label: key for key, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+    **{key: key for key in engine.SHIFT_KEYS},
+}
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "taxi-profit", "actuals")
+ALL_MONTHS = "전체"
+
+
+def _source_key(source, columns, bin_width):
+    """캐시 키: 경로는 (절대경로, 크기, 수정시각), 업로드 파일 등 file-like 는 내용 해시."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([columns, bin_width], sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    if isinstance(source, (str, os.PathLike)):
+        st = os.stat(source)
+        h.update(f"{os.path.abspath(source)}|{st.st_size}|{st.st_mtime_ns}".encode("utf-8"))
+    else:
+        source.seek(0)
+        for block in iter(lambda: source.read(1 << 20), b""):
+            h.update(block)
+        source.seek(0)
+    return h.hexdigest()
+
+
+def _is_excel(source):
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+    return str(name).lower().endswith((".xlsx", ".xlsm"))
+
+
+def _excel_chunks(source, chunksize):
+    from openpyxl import load_workbook
+    book = load_workbook(source, read_only=True, data_only=True)
+    rows = book.active.iter_rows(values_only=True)
+    header = [str(c) for c in next(rows)]
+    buffer = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= chunksize:
+            yield pd.DataFrame(buffer, columns=header)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame(buffer, columns=header)
+    book.close()
+
+
+def iter_chunks(source, columns=None, chunksize=200_000):
+    """표준 열(date, driver, shift, revenue, liters)로 바꾼 DataFrame chunk."""
+    columns = {**DEFAULT_COLUMNS, **(columns or {})}
+    if _is_excel(source):
+        chunks = _excel_chunks(source, chunksize)
+    else:
+        chunks = pd.read_csv(source, usecols=list(columns.values()), chunksize=chunksize)
+    rename = {v: k for k, v in columns.items()}
+    for chunk in chunks:
+        yield chunk[list(columns.values())].rename(columns=rename)
+
+
+class _Accumulator:
+    """(월, 근무형태) 별 누적: 건수, 합계, 운송수입 히스토그램, 기사별 근무일 비트마스크.
+
+    월은 yyyymm 정수로 다루고 (문자열 변환은 결과를 만들 때 한 번만), 근무일은 기사·월마다
+    31비트 마스크로 합쳐 같은 날짜가 여러 chunk 에 나뉘어 있어도 한 번만 센다.
+    """
+
+    def __init__(self, bin_width):
+        self.bin_width = bin_width
+        self.count = {}
+        self.revenue = {}
+        self.liters = {}
+        self.hist = {}
+        self.driver_days = {}
+
+    def add(self, df):
+        df = df.dropna(subset=["date", "shift", "revenue"])
+        dates = pd.to_datetime(df["date"])
+        df = df.assign(
+            month=dates.dt.year * 100 + dates.dt.month,
+            day_bit=np.left_shift(1, dates.dt.day.to_numpy(dtype=np.int64) - 1),
+            shift=df["shift"].astype(str).str.strip().map(SHIFT_ALIASES),
+            revenue=pd.to_numeric(df["revenue"], errors="coerce"),
+            liters=pd.to_numeric(df["liters"], errors="coerce").fillna(0),
+        ).dropna(subset=["shift", "revenue"])
+        df["bin"] = np.floor(df["revenue"] / self.bin_width).astype(np.int64).clip(lower=0)
+
+        sums = df.groupby(["month", "shift"]).agg(count=("revenue", "size"), revenue=("revenue", "sum"), liters=("liters", "sum"))
+        for (month, shift), row in sums.iterrows():
+            key = (int(month), shift)
+            self.count[key] = self.count.get(key, 0) + int(row["count"])
+            self.revenue[key] = self.revenue.get(key, 0.0) + float(row["revenue"])
+            self.liters[key] = self.liters.get(key, 0.0) + float(row["liters"])
+        for (month, shift), bins in df.groupby(["month", "shift"])["bin"]:
+            key = (int(month), shift)
+            counts = np.bincount(bins.to_numpy())
+            prev = self.hist.get(key)
+            if prev is not None:
+                size = max(len(prev), len(counts))
+                counts = np.pad(counts, (0, size - len(counts))) + np.pad(prev, (0, size - len(prev)))
+            self.hist[key] = counts
+        # chunk 안에서 중복 날짜를 없앤 뒤 비트 합 = 비트 OR
+        days = df.drop_duplicates(["month", "shift", "driver", "day_bit"]).groupby(["month", "shift", "driver"])["day_bit"].sum()
+        for (month, shift, driver), bits in days.items():
+            per_driver = self.driver_days.setdefault((int(month), shift), {})
+            per_driver[str(driver)] = per_driver.get(str(driver), 0) | int(bits)
+
+    def _median(self, hist):
+        cum = np.cumsum(hist)
+        return float(np.searchsorted(cum, (cum[-1] + 1) / 2) * self.bin_width)
+
+    def records(self):
+        """(월, 근무형태) 별 집계 + 근무형태별 전체 기간 집계."""
+        out = []
+        months = sorted({m for m, _ in self.count}) + [ALL_MONTHS]
+        for month in months:
+            label = month if month == ALL_MONTHS else f"{month // 100:04d}-{month % 100:02d}"
+            for shift in engine.SHIFT_KEYS:
+                keys = [k for k in self.count if k[1] == shift and (month == ALL_MONTHS or k[0] == month)]
+                if not keys:
+                    continue
+                count = sum(self.count[k] for k in keys)
+                hist = np.zeros(max(len(self.hist[k]) for k in keys), dtype=np.int64)
+                for k in keys:
+                    hist[:len(self.hist[k])] += self.hist[k]
+                days = [bin(bits).count("1") for k in keys for bits in self.driver_days.get(k, {}).values()]
+                out.append({
+                    "month": label,
+                    "shift": shift,
+                    "driver_days": count,
+                    "drivers": len({drv for k in keys for drv in self.driver_days.get(k, {})}),
+                    "mean_sanap": sum(self.revenue[k] for k in keys) / count,
+                    "median_sanap": self._median(hist),
+                    "mean_days": float(np.mean(days)) if days else 0.0,
+                    "mean_liters": sum(self.liters[k] for k in keys) / count,
+                    "total_revenue": sum(self.revenue[k] for k in keys),
+                    "total_liters": sum(self.liters[k] for k in keys),
+                })
+        return out
+
+
+def load_actuals(source, columns=None, chunksize=200_000, bin_width=1000, cache_dir=DEFAULT_CACHE_DIR):
+    """운행 기록 파일의 (월, 근무형태) 집계 목록. cache_dir=None 이면 캐시하지 않는다.
+
+    중앙값은 bin_width 원 단위 히스토그램으로 계산한 근사값이다.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, _source_key(source, columns, bin_width) + ".json")
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+    acc = _Accumulator(bin_width)
+    for chunk in iter_chunks(source, columns, chunksize):
+        acc.add(chunk)
+    records = acc.records()
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+    return records
+
+
+def actual_scenarios(records, template, stat="mean_sanap", months=None):
+    """월별 실적 사납금을 넣은 시나리오 목록. 급여·비과세·시급·소정근로는 template 시나리오 값을 쓴다.
+
+    실적이 없는 근무형태는 template 의 사납금을 그대로 둔다.
+    """
+    by_month = {}
+    for rec in records:
+        by_month.setdefault(rec['month'], {})[rec['shift']] = rec
+    scenarios = []
+    for month, shifts in by_month.items():
+        if months is not None and month not in months:
+            continue
+        sanap = {k: (round(shifts[k][stat]) if k in shifts else template[k]['sanap']) for k in engine.SHIFT_KEYS}
+        sc = engine.with_sanap(template, sanap)
+        sc['name'] = f"실적 {month}"
+        scenarios.append(sc)
+    return scenarios
+
+
+def actual_basic_overrides(records, month=ALL_MONTHS):
+    """해당 월 실적의 연료량(근무형태별 1일 평균 L)과 평균 근무일수(기사 수 가중, 만근 일수 대체값).
+
+    사이드바 입력칸이 정수형이므로 정수로 반올림한다.
+    """
+    recs = [r for r in records if r['month'] == month]
+    overrides = {'fuel_' + r['shift']: round(r['mean_liters']) for r in recs}
+    drivers = sum(r['drivers'] for r in recs)
+    if drivers:
+        overrides['full_days'] = round(sum(r['mean_days'] * r['drivers'] for r in recs) / drivers)
+    return overrides
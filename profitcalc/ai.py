@@ -0,0 +1,313 @@
+"""AI 경영 컨설팅 호출 파이프라인.
+
+- 모델 목록(list_models)은 API 키별로 TTL 동안 캐시한다.
+- 응답은 (모델, 프롬프트) 해시로 디스크에 저장하고, 개수·보관 기간을 넘으면 오래된 것부터 지운다.
+  오늘 날짜처럼 매번 바뀌는 값은 cache_prompt 로 빼고 해시한다. 캐시된 응답은 모델 목록 조회로
+  API 키가 확인된 경우에만 돌려준다 (잘못된 키로 다른 사용자의 유료 호출 결과를 받지 않도록).
+- 생성은 공유 스레드 풀에서 스트리밍으로 실행되어 스크립트 실행을 막지 않는다.
+  동시에 호출하는 수는 풀 크기로 제한되며, 일시적 오류는 지수 백오프로 재시도한다.
+- TAXI_PROFIT_AI_BACKEND=stub 이면 Gemini 대신 오프라인 스텁 백엔드를 쓴다.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "taxi-profit", "ai")
+PRIORITY_MODELS = ('models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-pro')
+FALLBACK_MODEL = 'gemini-pro'
+# 재시도할 오류 (google.api_core.exceptions 의 클래스 이름 - SDK 를 import 하지 않고 판별)
+TRANSIENT_ERRORS = {"ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError",
+                    "TooManyRequests", "Aborted"}
+
+
+class TransientError(Exception):
+    """다시 시도하면 성공할 수 있는 오류 (스텁 백엔드와 테스트용)."""
+
+
+def is_transient(error):
+    return (isinstance(error, (TransientError, TimeoutError, ConnectionError))
+            or type(error).__name__ in TRANSIENT_ERRORS)
+
+
+def _digest(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class GeminiBackend:
+    """google.generativeai 백엔드. SDK 는 처음 호출할 때 import 한다."""
+
+    # genai.configure 는 프로세스 전역 설정이므로 설정과 요청 시작을 한 번에 하나씩
+    _configure_lock = threading.Lock()
+
+    def __init__(self, api_key, timeout=120):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def _genai(self):
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        return genai
+
+    def list_models(self):
+        with self._configure_lock:
+            genai = self._genai()
+            return [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+
+    def stream(self, model, prompt):
+        with self._configure_lock:
+            genai = self._genai()
+            response = genai.GenerativeModel(model).generate_content(
+                prompt, stream=True, request_options={"timeout": self.timeout})
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class StubBackend:
+    """네트워크 없이 동작하는 가짜 백엔드. 프롬프트의 시나리오 줄을 요약한 고정 형식 보고서를 흘려 보낸다.
+
+    fail_times 만큼은 첫 조각 전에 TransientError 를 내서 재시도 경로를 확인할 수 있다.
+    """
+
+    models = ['models/gemini-1.5-flash', 'models/gemini-pro']
+
+    def __init__(self, delay=None, chunk_size=40, fail_times=0):
+        self.delay = float(os.environ.get("TAXI_PROFIT_AI_STUB_DELAY", 0.02)) if delay is None else delay
+        self.chunk_size = chunk_size
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def list_models(self):
+        return list(self.models)
+
+    def render(self, model, prompt):
+        lines = [line.strip() for line in prompt.splitlines() if line.strip().startswith(("👉", "-"))]
+        body = "\n".join(f"- {line.lstrip('-👉 ').strip()}" for line in lines)
+        return (f"### 🧪 오프라인 분석 (스텁 · {model})\n\n"
+                f"입력 데이터 {len(lines)}줄을 받았습니다.\n\n{body}\n\n"
+                "**제언:** 실제 분석은 Gemini API 키로 다시 요청하세요.")
+
+    def stream(self, model, prompt):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise TransientError("스텁 일시 오류")
+        text = self.render(model, prompt)
+        for start in range(0, len(text), self.chunk_size):
+            if self.delay:
+                time.sleep(self.delay)
+            yield text[start:start + self.chunk_size]
+
+
+def offline():
+    """TAXI_PROFIT_AI_BACKEND=stub 이면 외부 API 없이 스텁 백엔드를 쓴다."""
+    return os.environ.get("TAXI_PROFIT_AI_BACKEND", "").lower() == "stub"
+
+
+def make_backend(api_key):
+    if offline():
+        return StubBackend()
+    return GeminiBackend(api_key)
+
+
+def choose_model(available):
+    for model in PRIORITY_MODELS:
+        if model in available:
+            return model
+    return available[0] if available else None
+
+
+class ModelCatalog:
+    """API 키별 사용할 모델 이름 캐시 (ttl 초)."""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def model(self, api_key, backend):
+        return self.resolve(api_key, backend)[0]
+
+    def resolve(self, api_key, backend):
+        """(모델 이름, 키 확인 여부). 목록 조회에 성공했을 때만 키가 확인된 것으로 본다."""
+        key = _digest(type(backend).__name__, api_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1], True
+        try:
+            model = choose_model(backend.list_models())
+        except Exception:
+            # 목록 조회 실패 시 원래 동작처럼 기본 모델로 시도 (캐시하지 않음)
+            return FALLBACK_MODEL, False
+        with self._lock:
+            self._entries[key] = (now + self.ttl, model)
+        return model, True
+
+
+class ResponseCache:
+    """응답 디스크 캐시. 파일 하나 = 응답 하나, 수정 시각으로 LRU 와 보관 기간을 관리한다."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=200, max_age=30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def key(self, model, prompt):
+        return _digest(model, prompt)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                text = json.load(f)["text"]
+            os.utime(path)
+            return text
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, model, text):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": model, "text": text, "saved_at": time.time()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """보관 기간이 지난 응답과 max_entries 를 넘는 오래된 응답 삭제."""
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+            except OSError:
+                return
+            entries = []
+            now = time.time()
+            for name in names:
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if now - mtime > self.max_age:
+                    _remove(path)
+                else:
+                    entries.append((mtime, path))
+            entries.sort()
+            for _, path in entries[:max(len(entries) - self.max_entries, 0)]:
+                _remove(path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class AnalysisJob:
+    """진행 중인 분석 요청. 다른 스레드가 text 를 채우는 동안 화면은 snapshot 으로 읽는다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chunks = []
+        self.status = "queued"      # queued / running / done / error
+        self.model = None
+        self.error = None
+        self.cached = False
+        self.attempts = 0
+        self.created = time.time()
+        self.finished = None
+
+    def append(self, text):
+        with self._lock:
+            self._chunks.append(text)
+
+    def reset_text(self):
+        with self._lock:
+            self._chunks = []
+
+    @property
+    def text(self):
+        with self._lock:
+            return "".join(self._chunks)
+
+    @property
+    def running(self):
+        return self.status in ("queued", "running")
+
+    def elapsed(self):
+        return (self.finished or time.time()) - self.created
+
+
+class AnalysisService:
+    """프로세스 전체가 공유하는 AI 분석 서비스 (스레드 풀 크기 = 동시 호출 수 상한)."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_workers=4, model_ttl=3600,
+                 max_retries=3, backoff=1.0, backend_factory=make_backend):
+        self.catalog = ModelCatalog(model_ttl)
+        self.cache = ResponseCache(cache_dir)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backend_factory = backend_factory
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai")
+
+    def submit(self, api_key, prompt, cache_prompt=None):
+        """분석 요청. cache_prompt 를 주면 응답 캐시 키를 prompt 대신 이것으로 만든다 (날짜 등을 뺀 프롬프트)."""
+        job = AnalysisJob()
+        self._pool.submit(self._run, job, api_key, prompt, prompt if cache_prompt is None else cache_prompt)
+        return job
+
+    def _run(self, job, api_key, prompt, cache_prompt):
+        job.status = "running"
+        try:
+            backend = self.backend_factory(api_key)
+            job.model, verified = self.catalog.resolve(api_key, backend)
+            if not job.model:
+                raise RuntimeError("사용 가능한 AI 모델을 찾을 수 없습니다.")
+            key = self.cache.key(job.model, cache_prompt)
+            # 키를 확인하지 못했으면 캐시를 건너뛰고 실제 호출로 키를 검증받는다
+            cached = self.cache.get(key) if verified else None
+            if cached is not None:
+                job.append(cached)
+                job.cached = True
+            else:
+                self._stream_with_retry(job, backend, prompt)
+                self.cache.put(key, job.model, job.text)
+            job.status = "done"
+        except Exception as e:
+            job.error = f"AI 호출 오류: {e}"
+            job.status = "error"
+        finally:
+            job.finished = time.time()
+
+    def _stream_with_retry(self, job, backend, prompt):
+        for attempt in range(self.max_retries + 1):
+            job.attempts = attempt + 1
+            job.reset_text()
+            try:
+                for chunk in backend.stream(job.model, prompt):
+                    job.append(chunk)
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient(e):
+                    raise
+                # 지수 백오프 + 지터 (동시에 실패한 요청이 한꺼번에 다시 몰리지 않도록)
+                time.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
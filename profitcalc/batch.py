@@ -0,0 +1,205 @@
+"""저장된 회사 데이터(JSON) 일괄 계산 CLI.
+
+get_current_data 형식({"basic_info": ..., "scenarios": [...]})의 파일 여러 개를
+프로세스 풀로 계산하고, 결과를 한 줄씩 CSV/XLSX/Parquet 파일에 기록한다.
+
+    python -m profitcalc.batch data/ "clients/**/*.json" -o result.csv
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import engine
+from .report import clean_text
+
+COLUMNS = ["파일", "시나리오명", "총 매출 (월)", "총 인건비 (월)", "영업이익 (월)", "인건비율", "이익률"]
+DETAIL_COLUMNS = ["파일", "시나리오명", "근무형태", "1인 매출", "1인 영업이익", "1인 인건비", "인건비율"]
+
+
+def expand_inputs(inputs):
+    """디렉터리/글롭/파일 경로를 JSON 파일 목록으로 (중복 제거, 입력 순서 유지)."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "*.json")))
+        else:
+            matches = sorted(glob.glob(item, recursive=True)) or [item]
+        paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+def evaluate_file(path, details=False):
+    """파일 하나의 결과 행 목록. 읽기 실패 시 (path, None, 오류 메시지)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        scenarios = data.get('scenarios', [])
+        if not scenarios:
+            return path, [], None
+        r = engine.evaluate(data['basic_info'], engine.pack_scenarios(scenarios))
+        rows = []
+        for res in engine.summarize(r):
+            if details:
+                for d in res['details']:
+                    rows.append([path, res['name'], d["근무형태"], float(d["1인 매출"]), float(d["1인 영업이익"]),
+                                 float(d["1인 인건비"]), float(d["인건비율"])])
+            else:
+                rows.append([path, res['name'], float(res['revenue']), float(res['labor']), float(res['profit']),
+                             float(res['labor_rate']), float(res['margin'])])
+        return path, rows, None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def _evaluate_task(args):
+    return evaluate_file(*args)
+
+
+class CsvSink:
+    def __init__(self, path, columns):
+        # Excel 에서 한글이 깨지지 않도록 BOM 포함
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class XlsxSink:
+    def __init__(self, path, columns):
+        from openpyxl import Workbook
+        self._path = path
+        self._book = Workbook(write_only=True)
+        self._sheet = self._book.create_sheet("Results")
+        self._sheet.append(columns)
+
+    def write(self, rows):
+        # 한 파일의 행을 모두 정리한 뒤에 붙여, 도중에 실패해도 일부 행만 남지 않게 한다
+        rows = [[clean_text(v) if isinstance(v, str) else v for v in row] for row in rows]
+        for row in rows:
+            self._sheet.append(row)
+
+    def close(self):
+        self._book.save(self._path)
+
+
+class ParquetSink:
+    """행을 row group 단위로 모아 기록 (메모리에는 최대 row_group_size 행만 유지)."""
+
+    def __init__(self, path, columns, row_group_size=50_000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise SystemExit("Parquet 출력에는 pyarrow 가 필요합니다: pip install pyarrow") from e
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(c, pa.string() if c in ("파일", "시나리오명", "근무형태") else pa.float64()) for c in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._buffer = []
+        self._row_group_size = row_group_size
+
+    def write(self, rows):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            cols = list(zip(*self._buffer))
+            self._writer.write_table(self._pa.table(dict(zip(self._columns, cols)), schema=self._schema))
+            self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+SINKS = {".csv": CsvSink, ".xlsx": XlsxSink, ".parquet": ParquetSink}
+
+
+def open_sink(path, columns):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in SINKS:
+        raise SystemExit(f"지원하지 않는 출력 형식: {ext} (csv / xlsx / parquet)")
+    return SINKS[ext](path, columns)
+
+
+def _results(paths, details, workers):
+    """입력 순서대로 결과를 돌려준다. 동시에 처리 중인 파일 수를 제한해 메모리를 일정하게 유지."""
+    tasks = ((p, details) for p in paths)
+    if workers == 1:
+        yield from map(_evaluate_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_evaluate_task, task))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(inputs, output, details=False, workers=None, progress=sys.stderr, progress_every=1.0):
+    """일괄 계산 실행. (처리한 파일 수, 기록한 행 수, 실패 파일 목록) 을 반환한다."""
+    paths = expand_inputs(inputs)
+    workers = workers or os.cpu_count() or 1
+    sink = open_sink(output, DETAIL_COLUMNS if details else COLUMNS)
+    started = last_report = time.perf_counter()
+    n_files = n_rows = 0
+    failed = []
+    try:
+        for path, rows, error in _results(paths, details, workers):
+            n_files += 1
+            if error is None:
+                try:
+                    sink.write(rows)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                failed.append((path, error))
+                if progress:
+                    print(f"⚠️ {path}: {error}", file=progress)
+                continue
+            n_rows += len(rows)
+            now = time.perf_counter()
+            if progress and (now - last_report >= progress_every or n_files == len(paths)):
+                rate = n_rows / (now - started) if now > started else 0
+                print(f"[{n_files}/{len(paths)}] {n_rows:,}행 · {rate:,.0f}행/초", file=progress)
+                last_report = now
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - started
+    if progress:
+        rate = n_rows / elapsed if elapsed > 0 else 0
+        print(f"완료: 파일 {n_files - len(failed)}/{len(paths)}개, {n_rows:,}행, {elapsed:.2f}초 ({rate:,.0f}행/초, 프로세스 {workers}개) -> {output}",
+              file=progress)
+    return n_files, n_rows, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m profitcalc.batch", description="택시 수익성 시나리오 일괄 계산")
+    parser.add_argument("inputs", nargs="+", help="JSON 파일, 디렉터리 또는 글롭 패턴")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 (.csv / .xlsx / .parquet)")
+    parser.add_argument("--details", action="store_true", help="근무형태별 1인 실적을 행으로 출력")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황 출력 안 함")
+    args = parser.parse_args(argv)
+    _, _, failed = run(args.inputs, args.output, details=args.details, workers=args.workers,
+                       progress=None if args.quiet else sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""입력 지문(fingerprint) 기반 계산 결과 캐시.
+
+Streamlit 은 위젯을 하나 건드릴 때마다 스크립트 전체를 다시 실행하므로,
+basic_info 와 시나리오 dict 의 해시를 키로 시나리오 단위 결과를 기억해 두고
+바뀐 시나리오만 다시 계산한다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import engine
+
+
+def fingerprint(obj):
+    """JSON 직렬화 가능한 값의 안정적인 해시 (dict 키 순서 무관)."""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def labor_fingerprint(sc_data):
+    """인건비 항목에 영향을 주는 입력(시급, 소정근로, 급여/비과세)만의 해시."""
+    return fingerprint([sc_data['hourly'], sc_data['work_time'],
+                        [[sc_data[k]['pay'], sc_data[k]['tf']] for k in engine.SHIFT_KEYS]])
+
+
+class LRUCache:
+    """크기가 제한된 LRU 캐시. 가장 오래 사용되지 않은 항목부터 제거한다.
+
+    여러 세션(스레드)이 같은 캐시를 공유할 수 있도록 get/put 은 잠금 안에서 실행한다.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ScenarioCache:
+    """시나리오별 결과 캐시와 인건비 항목 캐시.
+
+    결과는 (basic_info 해시, 시나리오 해시) 로, 인건비·4대보험 항목은 (요율 해시, 급여 입력 해시) 로
+    저장하므로 LPG 단가나 연료량만 바뀐 경우에도 인건비 계산은 재사용된다.
+    """
+
+    def __init__(self, maxsize=4096, breakdown_maxsize=64):
+        self.results = LRUCache(maxsize)
+        self.labor = LRUCache(maxsize)
+        self.breakdowns = LRUCache(breakdown_maxsize)
+
+    def clear(self):
+        self.results.clear()
+        self.labor.clear()
+        self.breakdowns.clear()
+
+    def stats(self):
+        """캐시별 {"entries", "maxsize", "hits", "misses"}."""
+        return {name: {"entries": len(c), "maxsize": c.maxsize, "hits": c.hits, "misses": c.misses}
+                for name, c in (("results", self.results), ("labor", self.labor), ("breakdowns", self.breakdowns))}
+
+    def _labor_terms(self, rates, rates_fp, batch, labor_keys):
+        rows = [self.labor.get((rates_fp, k)) for k in labor_keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if missing:
+            idx = np.array(missing)
+            fresh = engine.labor_terms(rates, batch.hourly[idx], batch.work_time[idx], batch.pay[idx], batch.tf[idx])
+            for n, i in enumerate(missing):
+                rows[i] = {k: v[n] for k, v in fresh.items()}
+                self.labor.put((rates_fp, labor_keys[i]), rows[i])
+        return {k: np.stack([row[k] for row in rows]) for k in rows[0]}
+
+    def _evaluate(self, info, scenarios):
+        rates = engine.insurance_rates(info)
+        batch = engine.pack_scenarios(scenarios)
+        labor = self._labor_terms(rates, fingerprint(rates), batch, [labor_fingerprint(sc) for sc in scenarios])
+        return engine.evaluate(info, batch, labor)
+
+    def evaluate(self, basic_info, scenarios):
+        """calculate_scenario 와 같은 형식의 결과 목록 (debug 제외). 캐시에 없는 시나리오만 한 번에 배치 계산한다."""
+        info = engine.normalize_basic(basic_info)
+        basic_fp = fingerprint(info)
+        keys = [fingerprint(sc) for sc in scenarios]
+        results = [self.results.get((basic_fp, k)) for k in keys]
+        missing = [i for i, res in enumerate(results) if res is None]
+        if missing:
+            r = self._evaluate(info, [scenarios[i] for i in missing])
+            for n, res in enumerate(engine.summarize(r)):
+                self.results.put((basic_fp, keys[missing[n]]), res)
+                results[missing[n]] = res
+        return results
+
+    def breakdown(self, basic_info, sc_data):
+        """한 시나리오의 상세 계산 검증 내역. 선택된 시나리오만 필요할 때 만든다."""
+        info = engine.normalize_basic(basic_info)
+        key = (fingerprint(info), fingerprint(sc_data))
+        debug = self.breakdowns.get(key)
+        if debug is None:
+            debug = engine.debug_rows(info, sc_data, self._evaluate(info, [sc_data]), 0)
+            self.breakdowns.put(key, debug)
+        return debug
@@ -0,0 +1,133 @@
+"""시나리오 비교표 (수천 개 시나리오용).
+
+시나리오별 합계를 열 단위 numpy 배열로 한 번 모아 두고, 정렬·필터·상위 N개·페이지 자르기는
+인덱스 배열로 처리한다. 화면에는 한 페이지만 보내므로 셀 서식과 색칠도 그 페이지만 한다.
+색은 pandas background_gradient 와 같은 matplotlib 컬러맵을 쓰되, 셀마다 Styler 를 거치지 않고
+전체 표의 최소~최대로 정규화한 열 배열을 한 번에 변환한다.
+"""
+import numpy as np
+
+# 비교표 열 → engine.summarize 결과 키
+FIELDS = {
+    "총 매출 (월)": "revenue",
+    "총 인건비 (월)": "labor",
+    "영업이익 (월)": "profit",
+    "인건비율": "labor_rate",
+    "이익률": "margin",
+}
+NAME_COLUMN = "시나리오명"
+COLUMNS = (NAME_COLUMN, *FIELDS)
+
+GRADIENTS = {"영업이익 (월)": "Greens", "이익률": "Greens", "총 인건비 (월)": "Reds", "인건비율": "Reds"}
+# pandas background_gradient 의 text_color_threshold 기본값
+TEXT_COLOR_THRESHOLD = 0.408
+
+WEBGL_THRESHOLD = 1000   # 점이 이보다 많으면 Scattergl
+MAX_POINTS = 20000       # 산점도에 보낼 최대 점 수
+SERIES_LIMIT = 50        # 막대·선 차트에 그릴 최대 시나리오 수
+
+
+class ResultsTable:
+    """시나리오 비교표의 열 배열. names 는 object 배열, 나머지 열은 float 배열."""
+
+    def __init__(self, names, columns):
+        self.names = np.asarray(names, dtype=object)
+        self.columns = {label: np.asarray(columns[label], dtype=float) for label in FIELDS}
+        self._ranges = {}
+
+    @classmethod
+    def from_results(cls, results):
+        n = len(results)
+        names = np.empty(n, dtype=object)
+        names[:] = [res['name'] for res in results]
+        columns = {label: np.fromiter((res[key] for res in results), dtype=float, count=n) for label, key in FIELDS.items()}
+        return cls(names, columns)
+
+    def __len__(self):
+        return len(self.names)
+
+    def query(self, name_filter="", sort_by=None, ascending=False, top_n=None, min_values=None):
+        """조건에 맞는 행 위치 배열 (정렬 순서). top_n 은 정렬 후 앞에서부터 자른다.
+
+        min_values: {열 이름: 최솟값} (None 인 값은 무시).
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if name_filter:
+            needle = name_filter.lower()
+            mask &= np.fromiter((needle in name.lower() for name in self.names), dtype=bool, count=len(self))
+        for label, lo in (min_values or {}).items():
+            if lo is not None:
+                mask &= self.columns[label] >= lo
+        index = np.flatnonzero(mask)
+        if sort_by in self.columns:
+            values = self.columns[sort_by][index]
+            order = np.argsort(values if ascending else -values, kind="stable")
+            index = index[order]
+        elif sort_by == NAME_COLUMN:
+            order = sorted(range(len(index)), key=lambda i: self.names[index[i]], reverse=not ascending)
+            index = index[order]
+        if top_n:
+            index = index[:top_n]
+        return index
+
+    @staticmethod
+    def page(index, page, page_size):
+        """1부터 세는 page 번째 페이지의 행 위치와 전체 페이지 수."""
+        n_pages = max(1, -(-len(index) // page_size))
+        page = min(max(page, 1), n_pages)
+        return index[(page - 1) * page_size: page * page_size], n_pages
+
+    def rows(self, index):
+        """{열 이름: 값 배열} (pd.DataFrame 에 바로 넣을 수 있는 형태)."""
+        return {NAME_COLUMN: self.names[index], **{label: values[index] for label, values in self.columns.items()}}
+
+    def _range(self, label):
+        # 색 정규화는 필터와 무관하게 전체 표 기준 (페이지를 넘겨도 같은 값은 같은 색)
+        if label not in self._ranges:
+            values = self.columns[label]
+            self._ranges[label] = (values.min(), values.max()) if len(values) else (0.0, 0.0)
+        return self._ranges[label]
+
+    def colors(self, index):
+        """{열 이름: CSS 문자열 목록} - GRADIENTS 열의 배경색과 글자색."""
+        import matplotlib
+
+        styles = {}
+        for label, cmap in GRADIENTS.items():
+            lo, hi = self._range(label)
+            values = self.columns[label][index]
+            norm = (values - lo) / (hi - lo) if hi > lo else np.zeros(len(values))
+            rgb = matplotlib.colormaps[cmap](norm)[:, :3]
+            # 상대 휘도 (WCAG) 가 낮으면 밝은 글자
+            linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+            luminance = linear @ np.array([0.2126, 0.7152, 0.0722])
+            codes = np.round(rgb * 255).astype(int)
+            styles[label] = [
+                f"background-color: #{r:02x}{g:02x}{b:02x}; color: {'#f1f1f1' if lum < TEXT_COLOR_THRESHOLD else '#000000'}"
+                for (r, g, b), lum in zip(codes, luminance)
+            ]
+        return styles
+
+
+def downsample(x, y, max_points=MAX_POINTS, keep=None):
+    """산점도용 점 줄이기. 격자 칸마다 한 점만 남겨 분포 모양과 바깥쪽 점을 유지한다.
+
+    keep 에 준 위치(예: 상위 N개)는 항상 남긴다. 반환값은 남길 위치 배열 (원래 순서).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    bins = max(int(np.sqrt(max_points)), 1)
+
+    def cell(v):
+        lo, hi = v.min(), v.max()
+        if hi <= lo:
+            return np.zeros(n, dtype=np.int64)
+        return np.minimum(((v - lo) / (hi - lo) * bins).astype(np.int64), bins - 1)
+    _, first = np.unique(cell(x) * bins + cell(y), return_index=True)
+    chosen = first
+    if keep is not None and len(keep):
+        chosen = np.union1d(chosen, np.asarray(keep))
+    return np.sort(chosen)
@@ -0,0 +1,113 @@
+"""다중 차고지 통합 분석.
+
+차고지마다 자기 basic_info(임대료, 관리직 급여, 차량 대수 등)와 시나리오 목록을 가지며,
+공통 운영비 배부도 차고지 안에서만 이루어진다. 차고지 단위 결과는 입력 지문으로 캐시하므로
+한 차고지의 입력이 바뀌면 그 차고지만 다시 계산한다. 캐시는 여러 세션이 함께 쓰므로 차고지 이름은
+넣지 않고 꺼낼 때마다 붙인다. 다시 계산할 차고지가 여럿이면
+모든 시나리오를 한 배치로 묶고 기초 환경 값을 시나리오별 배열로 넣어 engine.evaluate 를 한 번만 부른다.
+"""
+import numpy as np
+
+from . import engine
+from .cache import LRUCache, fingerprint
+
+
+def depot_fingerprint(depot):
+    return fingerprint([engine.normalize_basic(depot['basic_info']), depot.get('scenarios', [])])
+
+
+def evaluate_depot(depot):
+    """차고지 하나의 시나리오별 결과와 회사 단위 비용."""
+    return evaluate_depots([depot])[0]
+
+
+def evaluate_depots(depots):
+    """여러 차고지를 한 번의 engine.evaluate 로 계산 (결과는 evaluate_depot 과 같음)."""
+    infos = [engine.normalize_basic(d['basic_info']) for d in depots]
+    scenarios = [sc for d in depots for sc in d.get('scenarios', [])]
+    results = []
+    if scenarios:
+        owner = np.repeat(np.arange(len(depots)), [len(d.get('scenarios', [])) for d in depots])
+        # 기초 환경 값을 시나리오별 (N,) 배열로 펼치면 차고지마다 따로 계산한 것과 같은 값이 나온다
+        batch_info = {k: np.array([info[k] for info in infos], dtype=float)[owner] for k in engine.BASIC_KEYS}
+        results = engine.summarize(engine.evaluate(batch_info, engine.pack_scenarios(scenarios)))
+    out, start = [], 0
+    for depot, info in zip(depots, infos):
+        n = len(depot.get('scenarios', []))
+        out.append({
+            "name": depot['name'],
+            "n_cars": info['n_cars'],
+            "fixed": {k: float(v) for k, v in engine.fixed_costs(info).items()},
+            "results": results[start:start + n],
+        })
+        start += n
+    return out
+
+
+class DepotGroup:
+    """차고지 목록의 결과 캐시. evaluate 는 바뀐 차고지만 한 배치로 다시 계산한다.
+
+    입력이 같은 차고지는 이름이 달라도 한 항목을 같이 쓰므로 캐시에는 이름을 뺀 값만 둔다.
+    """
+
+    def __init__(self, maxsize=256):
+        self.cache = LRUCache(maxsize)
+
+    def evaluate(self, depots):
+        keys = [depot_fingerprint(d) for d in depots]
+        results = [self.cache.get(k) for k in keys]
+        missing = [i for i, res in enumerate(results) if res is None]
+        fresh = evaluate_depots([depots[i] for i in missing]) if missing else []
+        for i, res in zip(missing, fresh):
+            res = {k: v for k, v in res.items() if k != 'name'}
+            self.cache.put(keys[i], res)
+            results[i] = res
+        return [{"name": d['name'], **res} for d, res in zip(depots, results)]
+
+
+def depot_table(depot_results):
+    """차고지 × 시나리오 비교표."""
+    rows = []
+    for dep in depot_results:
+        fixed = dep['fixed']
+        for res in dep['results']:
+            rows.append({
+                "차고지": dep['name'],
+                **engine.summary_row(res),
+                "기사 수": fixed['total_drivers'],
+                "차량 대수": dep['n_cars'],
+                "공통 운영비 (월)": fixed['total_overhead_sum'],
+                "1인당 공통비": fixed['cost_overhead'],
+            })
+    return rows
+
+
+def _total_row(label_key, label, results):
+    revenue = sum(res['revenue'] for res in results)
+    labor = sum(res['labor'] for res in results)
+    profit = sum(res['profit'] for res in results)
+    return {
+        label_key: label,
+        "적용 차고지 수": len(results),
+        "총 매출 (월)": revenue,
+        "총 인건비 (월)": labor,
+        "영업이익 (월)": profit,
+        "인건비율": (labor / revenue * 100) if revenue > 0 else 0,
+        "이익률": (profit / revenue * 100) if revenue > 0 else 0,
+    }
+
+
+def group_table(depot_results):
+    """같은 이름의 시나리오를 모든 차고지에 적용했을 때의 그룹 합계 (시나리오 이름별)."""
+    by_name = {}
+    for dep in depot_results:
+        for res in dep['results']:
+            by_name.setdefault(res['name'], []).append(res)
+    return [_total_row("시나리오명", name, results) for name, results in by_name.items()]
+
+
+def best_mix(depot_results):
+    """차고지마다 영업이익이 가장 큰 시나리오를 골랐을 때의 그룹 합계와 선택 내역."""
+    picks = {dep['name']: max(dep['results'], key=lambda res: res['profit'])
+             for dep in depot_results if dep['results']}
+    return _total_row("시나리오명", "차고지별 최적 조합", list(picks.values())), {k: v['name'] for k, v in picks.items()}
@@ -0,0 +1,259 @@
+"""기사별 상세 모델.
+
+근무형태별 모델은 같은 근무형태 기사를 모두 같은 사람으로 보고 1인 이익 × 인원으로 계산한다.
+여기서는 기사마다 급여·비과세·사납금·연료량·근무일수·배정 차량을 따로 두고,
+값은 기사 수 길이의 타입 지정 배열(열)로만 보관해 한 번에 계산한다 (기사 1명당 41바이트).
+인건비 산식은 engine.labor_terms 를 그대로 쓰므로 모든 기사를 시나리오 값으로 채우면
+근무형태별 모델과 같은 결과가 나온다.
+"""
+import numpy as np
+import pandas as pd
+
+from . import engine
+
+# 열 이름 -> dtype
+COLUMNS = {
+    "shift": np.int8,         # engine.SHIFT_KEYS 위치
+    "pay": np.int32,
+    "tf": np.int32,
+    "sanap": np.int32,
+    "hourly": np.int32,
+    "work_time": np.float64,
+    "fuel": np.float64,       # 1일 평균 연료량(L)
+    "days": np.float32,       # 월 근무일수
+    "car": np.int32,          # 배정 차량 번호, -1 = 미배정
+}
+# 업로드/다운로드용 표시명
+LABELS = {
+    "shift": "근무형태", "pay": "급여총액", "tf": "비과세", "sanap": "일 사납금",
+    "hourly": "시급", "work_time": "소정근로(h)", "fuel": "연료(L)", "days": "근무일수", "car": "차량",
+}
+UNASSIGNED = -1
+
+
+def _as_column(key, values):
+    """COLUMNS dtype 배열로 변환. 정수 열은 소수·범위를 벗어난 값을 잘라내지 않고 거부한다."""
+    dtype = np.dtype(COLUMNS[key])
+    values = np.asarray(values)
+    if dtype.kind == "i" and values.dtype.kind not in "iu":
+        values = values.astype(np.float64)
+        bad = ~np.isfinite(values) | (values != np.round(values))
+        if bad.any():
+            raise ValueError(f"'{LABELS[key]}' 열에 정수가 아닌 값이 있습니다: {values[bad][:5].tolist()}")
+    info = np.iinfo(dtype) if dtype.kind == "i" else None
+    if info is not None and len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"'{LABELS[key]}' 열 값이 허용 범위({info.min:,} ~ {info.max:,})를 벗어났습니다")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+class DriverTable:
+    """기사별 입력 열 묶음. 각 열은 COLUMNS 의 dtype 을 가진 (M,) 배열."""
+
+    def __init__(self, **columns):
+        lengths = {len(np.asarray(v)) for v in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("열 길이가 서로 다릅니다")
+        for key in COLUMNS:
+            setattr(self, key, _as_column(key, columns[key]))
+
+    def __len__(self):
+        return len(self.shift)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, k).nbytes for k in COLUMNS)
+
+    @classmethod
+    def from_scenario(cls, basic_info, sc_data):
+        """근무형태별 인원수만큼 시나리오 값으로 채운 표 (차량 미배정)."""
+        info = engine.normalize_basic(basic_info)
+        counts = engine.driver_counts(info).astype(int)
+        shift = np.repeat(np.arange(len(engine.SHIFT_KEYS)), counts)
+
+        def per_shift(values):
+            return np.asarray(values)[shift]
+
+        return cls(
+            shift=shift,
+            pay=per_shift([sc_data[k]['pay'] for k in engine.SHIFT_KEYS]),
+            tf=per_shift([sc_data[k]['tf'] for k in engine.SHIFT_KEYS]),
+            sanap=per_shift([sc_data[k]['sanap'] for k in engine.SHIFT_KEYS]),
+            hourly=np.full(len(shift), sc_data['hourly']),
+            work_time=np.full(len(shift), sc_data['work_time']),
+            fuel=per_shift(engine.fuel_liters(info)),
+            days=np.full(len(shift), info['full_days']),
+            car=np.full(len(shift), UNASSIGNED),
+        )
+
+    @classmethod
+    def from_frame(cls, df, basic_info=None, sc_data=None):
+        """표시명(LABELS) 또는 열 이름으로 된 DataFrame 에서 생성.
+
+        근무형태는 "주간" 같은 표시명이나 "day" 같은 키 모두 받는다. 빠진 열은
+        basic_info / sc_data 의 해당 근무형태 값으로 채운다 (차량은 미배정).
+        """
+        df = df.rename(columns={v: k for k, v in LABELS.items()})
+        aliases = {**dict(zip(engine.SHIFT_LABELS, range(4))), **dict(zip(engine.SHIFT_KEYS, range(4)))}
+        shift = df['shift'].astype(str).str.strip().map(aliases)
+        if shift.isna().any():
+            raise ValueError(f"알 수 없는 근무형태: {sorted(set(df['shift'][shift.isna()].astype(str)))}")
+        shift = shift.to_numpy(dtype=np.int8)
+        info = engine.normalize_basic(basic_info or {})
+        defaults = {"days": np.full(4, info['full_days']), "fuel": engine.fuel_liters(info), "car": np.full(4, UNASSIGNED)}
+        if sc_data:
+            for key in ("pay", "tf", "sanap"):
+                defaults[key] = np.array([sc_data[k][key] for k in engine.SHIFT_KEYS])
+            defaults["hourly"] = np.full(4, sc_data['hourly'])
+            defaults["work_time"] = np.full(4, sc_data['work_time'])
+
+        columns = {"shift": shift}
+        for key in COLUMNS:
+            if key == "shift":
+                continue
+            if key in df:
+                values = pd.to_numeric(df[key], errors="coerce")
+                fallback = defaults.get(key)
+                if values.isna().any():
+                    if fallback is None:
+                        raise ValueError(f"'{LABELS[key]}' 열에 빈 값이 있습니다")
+                    values = values.fillna(pd.Series(fallback[shift], index=values.index))
+                columns[key] = values.to_numpy()
+            elif key in defaults:
+                columns[key] = defaults[key][shift]
+            else:
+                raise ValueError(f"'{LABELS[key]}' 열이 없습니다 (기준 시나리오를 지정하면 시나리오 값으로 채웁니다)")
+        table = cls(**columns)
+        check_cars(table, info['n_cars'])
+        return table
+
+    def to_frame(self):
+        df = pd.DataFrame({LABELS[k]: getattr(self, k) for k in COLUMNS})
+        df[LABELS['shift']] = np.asarray(engine.SHIFT_LABELS)[self.shift]
+        return df
+
+
+def car_usage(table):
+    """배정된 차량 번호와 차량별 사용 슬롯 수 (공유 근무 1, 일차 2). 번호 크기와 무관한 메모리."""
+    slots = (engine.CAR_RATIO * 2).astype(int)[table.shift]
+    assigned = table.car != UNASSIGNED
+    cars, inverse = np.unique(table.car[assigned], return_inverse=True)
+    return cars, np.bincount(inverse, weights=slots[assigned], minlength=len(cars))
+
+
+def check_cars(table, n_cars):
+    """차량 번호가 0 ~ n_cars-1 (또는 미배정 -1) 이고 차량마다 2슬롯 이하인지 확인. 아니면 ValueError."""
+    n_cars = int(n_cars)
+    assigned = table.car[table.car != UNASSIGNED]
+    invalid = np.unique(assigned[(assigned < 0) | (assigned >= n_cars)])
+    if len(invalid):
+        raise ValueError(f"차량 번호는 0 ~ {n_cars - 1} (미배정 {UNASSIGNED}) 이어야 합니다: {invalid[:10].tolist()}")
+    cars, used = car_usage(table)
+    overbooked = cars[used > 2]
+    if len(overbooked):
+        raise ValueError(f"2슬롯(공유 2명 또는 일차 1명)을 넘게 배정된 차량: {overbooked[:10].tolist()}")
+
+
+def empty_slots(basic_info, table):
+    """빈 차량 슬롯(반 대 단위) 수.
+
+    배정된 차량은 차량마다 (2 - 사용 슬롯) 을, 미배정 기사는 배정되지 않은 나머지 차량을
+    근무형태별 모델과 같은 방식(2 × (차량 - 일차) - 공유 인원)으로 나눠 쓴다고 본다.
+    차량 번호가 범위를 벗어나거나 초과 배정된 차량이 있으면 ValueError (check_cars).
+    """
+    n_cars = int(engine.normalize_basic(basic_info)['n_cars'])
+    check_cars(table, n_cars)
+    _, used = car_usage(table)
+    assigned = table.car != UNASSIGNED
+    n_assigned_cars = len(used)
+    empty = float((2 - used).sum())
+
+    free_cars = max(n_cars - n_assigned_cars, 0)
+    pool = table.shift[~assigned]
+    n_daily = np.count_nonzero(pool == engine.SHIFT_KEYS.index('daily'))
+    n_shared = len(pool) - n_daily
+    empty += max(2 * max(free_cars - n_daily, 0) - n_shared, 0)
+    return empty
+
+
+def evaluate(basic_info, table):
+    """기사별 1인 항목 (M,) 배열과 회사 합계."""
+    info = engine.normalize_basic(basic_info)
+    fixed = engine.fixed_costs(info)
+    n = len(table)
+    days = table.days.astype(float)
+    pay = table.pay.astype(float)[:, None]
+    tf = table.tf.astype(float)[:, None]
+    labor = engine.labor_terms(engine.insurance_rates(info), table.hourly.astype(float),
+                               table.work_time.astype(float), pay, tf)
+    labor = {k: np.ravel(v) for k, v in labor.items()}
+
+    monthly_sanap = table.sanap.astype(float) * days
+    vat_out = monthly_sanap * engine.VAT_RATIO
+    card_fee = monthly_sanap * engine.CARD_FEE_RATE
+    net_fuel_cost = table.fuel.astype(float) * days * (info['lpg_price'] / 1.1)
+    ratio = engine.CAR_RATIO[table.shift]
+    total_car_fixed = fixed['car_fixed_cost_monthly'] * ratio
+
+    slots = empty_slots(info, table)
+    total_overhead_sum = fixed['net_rent_cost'] + fixed['net_admin_salary'] + slots * fixed['car_fixed_cost_monthly'] / 2
+    cost_overhead = total_overhead_sum / n if n else 0.0
+
+    total_cost_person = vat_out + card_fee + net_fuel_cost + total_car_fixed + labor['total_labor_cost'] + cost_overhead
+    profit_person = monthly_sanap - total_cost_person
+    revenue = monthly_sanap.sum()
+    profit = profit_person.sum()
+    labor_total = labor['total_labor_cost'].sum()
+    return {
+        "shift": table.shift,
+        "monthly_sanap": monthly_sanap,
+        "vat_out": vat_out,
+        "card_fee": card_fee,
+        "net_fuel_cost": net_fuel_cost,
+        "total_car_fixed": total_car_fixed,
+        "total_labor_cost": labor['total_labor_cost'],
+        "cost_overhead": np.full(n, cost_overhead),
+        "profit_person": profit_person,
+        "labor_ratio": engine.safe_ratio(labor['total_labor_cost'], monthly_sanap),
+        "empty_slots": slots,
+        "total_overhead_sum": total_overhead_sum,
+        "revenue": revenue,
+        "profit": profit,
+        "labor": labor_total,
+        "margin": engine.safe_ratio(profit, revenue)[()],
+        "labor_rate": engine.safe_ratio(labor_total, revenue)[()],
+    }
+
+
+def rollup(result):
+    """근무형태별 합계 (M 과 무관하게 bincount 한 번씩)."""
+    shift = result['shift']
+    k = len(engine.SHIFT_KEYS)
+    counts = np.bincount(shift, minlength=k)
+    sums = {key: np.bincount(shift, weights=result[key], minlength=k)
+            for key in ("monthly_sanap", "profit_person", "total_labor_cost")}
+    return counts, sums
+
+
+def summarize(result, name):
+    """engine.summarize 와 같은 형식의 시나리오 결과 (근무형태별 값은 1인 평균)."""
+    counts, sums = rollup(result)
+    details = []
+    for j in np.flatnonzero(counts):
+        revenue = sums['monthly_sanap'][j] / counts[j]
+        labor = sums['total_labor_cost'][j] / counts[j]
+        details.append({
+            "근무형태": engine.SHIFT_LABELS[j],
+            "1인 매출": revenue,
+            "1인 영업이익": sums['profit_person'][j] / counts[j],
+            "1인 인건비": labor,
+            "인건비율": (labor / revenue * 100) if revenue > 0 else 0,
+        })
+    return {
+        "name": name,
+        "revenue": result['revenue'],
+        "profit": result['profit'],
+        "labor": result['labor'],
+        "margin": result['margin'],
+        "labor_rate": result['labor_rate'],
+        "details": details,
+    }
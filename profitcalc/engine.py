@@ -0,0 +1,360 @@
+"""시나리오 수익성 계산 엔진.
+
+app.py 의 calculate_scenario 산식을 시나리오 N개 × 근무형태 4개 배열로 옮긴 것.
+Streamlit 없이 import 해서 쓸 수 있고, 연산 순서를 원래 스칼라 코드와 똑같이 맞춰
+결과가 원 단위까지 동일하다.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# 근무형태: (키, 표시명, 차량 부담 비율) - 일차는 1대 단독, 나머지는 2인 1차
+SHIFTS = (
+    ("day", "주간", 0.5),
+    ("night", "야간", 0.5),
+    ("shift", "교대", 0.5),
+    ("daily", "일차", 1.0),
+)
+SHIFT_KEYS = tuple(s[0] for s in SHIFTS)
+SHIFT_LABELS = tuple(s[1] for s in SHIFTS)
+CAR_RATIO = np.array([s[2] for s in SHIFTS])
+
+# get_current_data 가 저장하는 basic_info 키 (요율은 % 단위 그대로)
+BASIC_KEYS = (
+    'n_day', 'n_night', 'n_shift', 'n_daily', 'n_cars',
+    'car_price', 'car_dep_years', 'car_maint', 'insurance_year',
+    'rent_cost', 'admin_salary_total',
+    'full_days', 'lpg_price',
+    'fuel_day', 'fuel_night', 'fuel_shift', 'fuel_daily',
+    'rate_pension', 'rate_health', 'rate_care_ratio',
+    'rate_emp_unemp', 'rate_emp_stabil', 'rate_sanjae'
+)
+RATE_KEYS = BASIC_KEYS[-6:]
+BASIC_DEFAULTS = dict.fromkeys(BASIC_KEYS, 0)
+BASIC_DEFAULTS.update({
+    'rate_pension': 4.75, 'rate_health': 3.595, 'rate_care_ratio': 13.14,
+    'rate_emp_unemp': 0.90, 'rate_emp_stabil': 0.25, 'rate_sanjae': 0.65,
+})
+
+VAT_RATIO = 10 / 110
+CARD_FEE_RATE = 0.015
+
+ScenarioBatch = namedtuple("ScenarioBatch", ["names", "hourly", "work_time", "pay", "tf", "sanap"])
+
+
+def normalize_basic(basic_info):
+    """누락된 키를 사이드바 기본값으로 채운 basic_info 사본."""
+    info = dict(BASIC_DEFAULTS)
+    info.update({k: basic_info[k] for k in BASIC_KEYS if k in basic_info})
+    return info
+
+
+def column(value):
+    """스칼라는 그대로, 시나리오별 (N,) 배열은 (N, 1) 로 바꿔 (N, 4) 배열과 브로드캐스트되게 한다."""
+    value = np.asarray(value, dtype=float)
+    return value[:, None] if value.ndim == 1 else value
+
+
+def _per_shift(basic_info, prefix):
+    values = np.broadcast_arrays(*(np.asarray(basic_info[prefix + k], dtype=float) for k in SHIFT_KEYS))
+    return np.stack(values, axis=-1)
+
+
+def driver_counts(basic_info):
+    """근무형태별 기사 수. (4,) 또는 basic_info 값이 배열이면 (N, 4)."""
+    return _per_shift(basic_info, 'n_')
+
+
+def fuel_liters(basic_info):
+    """근무형태별 1일 평균 연료량(L). (4,) 또는 (N, 4)."""
+    return _per_shift(basic_info, 'fuel_')
+
+
+def insurance_rates(basic_info):
+    """% 단위 요율을 사이드바와 같은 방식(/100)으로 비율로 변환."""
+    return {k: basic_info[k] / 100 for k in RATE_KEYS}
+
+
+def safe_div(num, den):
+    """den > 0 인 곳만 num / den, 나머지는 0."""
+    num, den = np.broadcast_arrays(np.asarray(num, dtype=float), np.asarray(den, dtype=float))
+    out = np.zeros(num.shape)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def fixed_costs(basic_info):
+    """차량 고정비와 공통 운영비 (시나리오와 무관한 회사 단위 값).
+
+    basic_info 값이 (N,) 배열이면 결과도 (N,) 배열, 모두 스칼라면 스칼라.
+    """
+    v = {k: np.asarray(basic_info[k], dtype=float) for k in BASIC_KEYS if not k.startswith(('fuel_', 'rate_'))}
+    n_day, n_night, n_shift, n_daily = (v['n_' + k] for k in SHIFT_KEYS)
+    total_drivers = n_day + n_night + n_shift + n_daily
+
+    net_rent_cost = v['rent_cost'] / 1.1
+    net_admin_salary = v['admin_salary_total']
+    net_car_price = v['car_price'] / 1.1
+    net_car_maint_val = v['car_maint'] / 1.1
+    monthly_dep = safe_div(net_car_price, v['car_dep_years']) / 12
+    monthly_ins = (v['insurance_year'] / 12)
+    car_fixed_cost_monthly = monthly_dep + monthly_ins + net_car_maint_val
+
+    cars_available_for_shared = np.maximum(v['n_cars'] - n_daily, 0)
+    total_slots_shared = cars_available_for_shared * 2
+    used_slots_shared = n_day + n_night + n_shift
+    empty_slots = np.maximum(total_slots_shared - used_slots_shared, 0)
+    cost_per_half_slot = car_fixed_cost_monthly / 2
+    total_leakage_cost = empty_slots * cost_per_half_slot
+    total_overhead_sum = net_rent_cost + net_admin_salary + total_leakage_cost
+    cost_overhead = safe_div(total_overhead_sum, total_drivers)
+
+    fixed = {
+        "total_drivers": total_drivers,
+        "net_rent_cost": net_rent_cost,
+        "net_admin_salary": net_admin_salary,
+        "monthly_dep": monthly_dep,
+        "monthly_ins": monthly_ins,
+        "net_car_maint_val": net_car_maint_val,
+        "car_fixed_cost_monthly": car_fixed_cost_monthly,
+        "cars_available_for_shared": cars_available_for_shared,
+        "empty_slots": empty_slots,
+        "total_leakage_cost": total_leakage_cost,
+        "total_overhead_sum": total_overhead_sum,
+        "cost_overhead": cost_overhead,
+    }
+    # 0차원 배열은 numpy 스칼라로
+    return {k: val[()] for k, val in fixed.items()}
+
+
+def pack_scenarios(scenarios, override_sanap=None):
+    """시나리오 dict 목록을 (N,) / (N, 4) 배열로 변환.
+
+    override_sanap 이 주어지면 모든 시나리오의 사납금을 {'day': .., ...} 값으로 대체한다.
+    """
+    n = len(scenarios)
+    pay = np.empty((n, 4))
+    tf = np.empty((n, 4))
+    sanap = np.empty((n, 4))
+    for i, sc in enumerate(scenarios):
+        for j, k in enumerate(SHIFT_KEYS):
+            pay[i, j] = sc[k]['pay']
+            tf[i, j] = sc[k]['tf']
+            sanap[i, j] = override_sanap[k] if override_sanap else sc[k]['sanap']
+    return ScenarioBatch(
+        names=[sc['name'] for sc in scenarios],
+        hourly=np.array([sc['hourly'] for sc in scenarios], dtype=float),
+        work_time=np.array([sc['work_time'] for sc in scenarios], dtype=float),
+        pay=pay, tf=tf, sanap=sanap,
+    )
+
+
+def labor_terms(rates, hourly, work_time, pay, tf):
+    """인건비·4대보험 항목. 요율과 급여 입력에만 의존하므로 연료/차량 값이 바뀌어도 재사용 가능."""
+    total_pay = pay
+    taxable_pay = np.maximum(pay - tf, 0)
+    severance = total_pay / 12
+    annual_leave = np.broadcast_to((hourly * work_time * 1.25)[..., None], pay.shape)
+
+    rates = {k: column(v) for k, v in rates.items()}
+    ins_pension = taxable_pay * rates['rate_pension']
+    ins_health = taxable_pay * rates['rate_health']
+    ins_care = ins_health * rates['rate_care_ratio']
+    ins_emp = taxable_pay * (rates['rate_emp_unemp'] + rates['rate_emp_stabil'])
+    ins_sanjae = total_pay * rates['rate_sanjae']
+
+    total_4ins = ins_pension + ins_health + ins_care + ins_emp + ins_sanjae
+    total_labor_cost = total_pay + severance + annual_leave + total_4ins
+    return {
+        "total_pay": total_pay,
+        "taxable_pay": taxable_pay,
+        "severance": severance,
+        "annual_leave": annual_leave,
+        "ins_pension": ins_pension,
+        "ins_health": ins_health,
+        "ins_care": ins_care,
+        "ins_emp": ins_emp,
+        "ins_sanjae": ins_sanjae,
+        "total_4ins": total_4ins,
+        "total_labor_cost": total_labor_cost,
+    }
+
+
+def safe_ratio(num, den):
+    """den > 0 인 곳만 num / den * 100, 나머지는 0."""
+    return safe_div(num, den) * 100
+
+
+def evaluate(basic_info, batch, labor=None):
+    """배치 전체의 1인당 항목과 시나리오별 합계를 한 번에 계산.
+
+    labor 에 labor_terms 결과를 넘기면 인건비 계산을 건너뛴다.
+    basic_info 값에는 스칼라 대신 시나리오별 (N,) 배열을 넣을 수 있다 (민감도·시뮬레이션용).
+    """
+    info = normalize_basic(basic_info)
+    fixed = fixed_costs(info)
+    full_days = column(info['full_days'])
+    if labor is None:
+        labor = labor_terms(insurance_rates(info), batch.hourly, batch.work_time, batch.pay, batch.tf)
+
+    monthly_sanap = batch.sanap * full_days
+    shape = monthly_sanap.shape
+    vat_out = monthly_sanap * VAT_RATIO
+    card_fee = monthly_sanap * CARD_FEE_RATE
+    fuel_liter = fuel_liters(info) * full_days
+    net_fuel_cost = np.broadcast_to(fuel_liter * column(np.asarray(info['lpg_price']) / 1.1), shape)
+    c_dep = np.broadcast_to(column(fixed['monthly_dep']) * CAR_RATIO, shape)
+    c_ins = np.broadcast_to(column(fixed['monthly_ins']) * CAR_RATIO, shape)
+    c_maint = np.broadcast_to(column(fixed['net_car_maint_val']) * CAR_RATIO, shape)
+    total_car_fixed = c_dep + c_ins + c_maint
+    total_labor_cost = labor['total_labor_cost']
+    cost_overhead = np.broadcast_to(column(fixed['cost_overhead']), shape)
+
+    total_cost_person = (vat_out + card_fee + net_fuel_cost + total_car_fixed + total_labor_cost + cost_overhead)
+    profit_person = monthly_sanap - total_cost_person
+
+    # 인원 0명인 근무형태는 합계에서 제외 (원래 루프의 continue 와 동일한 순서로 누적)
+    counts = np.broadcast_to(driver_counts(info), shape)
+    active = counts != 0
+    total_profit = np.zeros(shape[0])
+    total_revenue = np.zeros(shape[0])
+    total_labor = np.zeros(shape[0])
+    for j in range(len(SHIFT_KEYS)):
+        total_profit = total_profit + np.where(active[:, j], profit_person[:, j] * counts[:, j], 0)
+        total_revenue = total_revenue + np.where(active[:, j], monthly_sanap[:, j] * counts[:, j], 0)
+        total_labor = total_labor + np.where(active[:, j], total_labor_cost[:, j] * counts[:, j], 0)
+
+    result = {
+        "names": batch.names,
+        "counts": counts,
+        "active": active,
+        "fixed": fixed,
+        "monthly_sanap": monthly_sanap,
+        "vat_out": vat_out,
+        "card_fee": card_fee,
+        "net_fuel_cost": net_fuel_cost,
+        "c_dep": c_dep,
+        "c_ins": c_ins,
+        "c_maint": c_maint,
+        "total_car_fixed": total_car_fixed,
+        "cost_overhead": cost_overhead,
+        "total_cost_person": total_cost_person,
+        "profit_person": profit_person,
+        "labor_ratio": safe_ratio(total_labor_cost, monthly_sanap),
+        "revenue": total_revenue,
+        "profit": total_profit,
+        "labor": total_labor,
+        "margin": safe_ratio(total_profit, total_revenue),
+        "labor_rate": safe_ratio(total_labor, total_revenue),
+    }
+    result.update(labor)
+    return result
+
+
+def summarize(result):
+    """evaluate 결과를 calculate_scenario 와 같은 시나리오별 dict 목록으로 변환 (debug 제외)."""
+    summaries = []
+    for i, name in enumerate(result['names']):
+        details = []
+        for j in np.flatnonzero(result['active'][i]):
+            details.append({
+                "근무형태": SHIFT_LABELS[j],
+                "1인 매출": result['monthly_sanap'][i, j],
+                "1인 영업이익": result['profit_person'][i, j],
+                "1인 인건비": result['total_labor_cost'][i, j],
+                "인건비율": result['labor_ratio'][i, j]
+            })
+        summaries.append({
+            "name": name,
+            "revenue": result['revenue'][i],
+            "profit": result['profit'][i],
+            "labor": result['labor'][i],
+            "margin": result['margin'][i],
+            "labor_rate": result['labor_rate'][i],
+            "details": details,
+        })
+    return summaries
+
+
+def summary_row(res):
+    """시나리오 비교표 한 줄."""
+    return {
+        "시나리오명": res['name'],
+        "총 매출 (월)": res['revenue'],
+        "총 인건비 (월)": res['labor'],
+        "영업이익 (월)": res['profit'],
+        "인건비율": res['labor_rate'],
+        "이익률": res['margin']
+    }
+
+
+def with_sanap(sc_data, sanap_map):
+    """사납금만 바꾼 시나리오 사본 (원본은 수정하지 않음)."""
+    updated = dict(sc_data)
+    for k in SHIFT_KEYS:
+        updated[k] = dict(sc_data[k], sanap=sanap_map[k])
+    return updated
+
+
+def debug_index(basic_info, scenarios):
+    """상세 계산 검증 선택 목록 {"시나리오 - 근무형태": 시나리오 위치}. 내역은 만들지 않는다."""
+    active = np.flatnonzero(driver_counts(normalize_basic(basic_info)) != 0)
+    index = {}
+    for i, sc in enumerate(scenarios):
+        for j in active:
+            index[f"{sc['name']} - {SHIFT_LABELS[j]}"] = i
+    return index
+
+
+def debug_rows(basic_info, sc_data, result, i):
+    """상세 계산 검증 탭의 항목별 내역 {"시나리오 - 근무형태": [(항목, 금액, 비고), ...]}."""
+    info = normalize_basic(basic_info)
+    rates = insurance_rates(info)
+    full_days = info['full_days']
+    fixed = {k: (v[i] if np.ndim(v) else v) for k, v in result['fixed'].items()}
+    total_drivers = fixed['total_drivers']
+    total_leakage_cost = fixed['total_leakage_cost']
+    r = result
+    hourly_wage = sc_data['hourly']
+    work_time_sc = sc_data['work_time']
+
+    debug = {}
+    for j in np.flatnonzero(r['active'][i]):
+        sanap = sc_data[SHIFT_KEYS[j]]['sanap']
+        vat_out = r['vat_out'][i, j]
+        card_fee = r['card_fee'][i, j]
+
+        rows = []
+        rows.append(("1. 월 매출(사납금)", r['monthly_sanap'][i, j], f"{sanap:,}원 × {full_days}일"))
+
+        rows.append(("▼ 매출 공제(세금/수수료)", -(vat_out + card_fee), ""))
+        rows.append(("   └ 부가세(매출세액)", -vat_out, "사납금의 10/110"))
+        rows.append(("   └ 카드수수료", -card_fee, "사납금의 1.5%"))
+
+        rows.append(("▼ 연료비(Net)", -r['net_fuel_cost'][i, j], "부가세 제외 공급가 기준"))
+
+        rows.append(("▼ 차량 고정비 합계", -r['total_car_fixed'][i, j], "감가+보험+유지"))
+        rows.append(("   └ 감가상각비", -r['c_dep'][i, j], ""))
+        rows.append(("   └ 보험료", -r['c_ins'][i, j], ""))
+        rows.append(("   └ 유지비", -r['c_maint'][i, j], ""))
+
+        rows.append(("▼ 인건비 합계", -r['total_labor_cost'][i, j], f"매출 대비 {r['labor_ratio'][i, j]:.1f}%"))
+        rows.append(("   └ 급여 지급액(Gross)", -r['total_pay'][i, j], "입력된 총액"))
+        rows.append(("   └ 퇴직금 적립액", -r['severance'][i, j], "급여총액 ÷ 12"))
+        rows.append(("   └ 연차수당", -r['annual_leave'][i, j], f"{hourly_wage:,}원×{work_time_sc}h×1.25"))
+        rows.append(("   ▼ [상세] 4대보험 계", -r['total_4ins'][i, j], ""))
+        rows.append(("      - 국민연금", -r['ins_pension'][i, j], f"{rates['rate_pension']*100:.2f}%"))
+        rows.append(("      - 건강보험", -r['ins_health'][i, j], f"{rates['rate_health']*100:.3f}%"))
+        rows.append(("      - 장기요양", -r['ins_care'][i, j], f"건보료의 {rates['rate_care_ratio']*100:.2f}%"))
+        rows.append(("      - 고용보험", -r['ins_emp'][i, j], f"{(rates['rate_emp_unemp']+rates['rate_emp_stabil'])*100:.2f}%"))
+        rows.append(("      - 산재보험", -r['ins_sanjae'][i, j], f"{rates['rate_sanjae']*100:.2f}%"))
+
+        rows.append(("▼ 공통 운영비 합계", -r['cost_overhead'][i, j], ""))
+        rows.append(("   └ 차고지 임대료", -(fixed['net_rent_cost']/total_drivers), ""))
+        rows.append(("   └ 관리직원 급여", -(fixed['net_admin_salary']/total_drivers), ""))
+        if total_leakage_cost > 0:
+            rows.append(("   └ ⚠️ 차량 유휴비용", -(total_leakage_cost/total_drivers), f"총 {int(total_leakage_cost):,}원 배분"))
+
+        rows.append(("■ 최종 영업이익", r['profit_person'][i, j], "매출 - 비용합계"))
+        debug[f"{sc_data['name']} - {SHIFT_LABELS[j]}"] = rows
+    return debug
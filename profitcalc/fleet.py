@@ -0,0 +1,149 @@
+"""기사 구성(주간/야간/교대/일차 인원) 최적화.
+
+1인당 공헌이익(공통 운영비 배부 전 이익) a_j 는 인원수와 무관하므로 회사 월 영업이익은
+    Σ n_j × a_j - (임대료 + 관리직 급여) - 반대분 차량비 × 빈 슬롯 수
+    빈 슬롯 수 = max(2 × (차량 - 일차) - (주간 + 야간 + 교대), 0)
+로 쓸 수 있다. 일차 인원 d 와 공유 차량 인원 합계 S 만 정하면 빈 슬롯 비용이 정해지므로,
+(d, S) 쌍마다 상한값을 구해 큰 순서로 살펴보고 현재 k 번째 해보다 상한이 낮으면 탐색을 멈춘다.
+"""
+import heapq
+
+import numpy as np
+
+from . import engine
+
+SHARED = (0, 1, 2)  # 주간, 야간, 교대 (차량 1대를 2명이 나눠 씀)
+DAILY = 3           # 일차 (차량 1대 단독)
+
+
+def contributions(basic_info, scenarios):
+    """시나리오 × 근무형태별 1인 공헌이익 (N, 4)."""
+    r = engine.evaluate(basic_info, engine.pack_scenarios(scenarios))
+    return r['profit_person'] + r['cost_overhead']
+
+
+def _bounds(bounds, n_cars, max_total, min_daily):
+    lo = np.zeros(4, dtype=int)
+    hi = np.array([2 * n_cars] * 3 + [n_cars], dtype=int)
+    for j, k in enumerate(engine.SHIFT_KEYS):
+        if bounds and k in bounds:
+            b_lo, b_hi = bounds[k]
+            lo[j] = max(lo[j], b_lo if b_lo is not None else 0)
+            if b_hi is not None:
+                hi[j] = min(hi[j], b_hi)
+    lo[DAILY] = max(lo[DAILY], min_daily)
+    hi = np.minimum(hi, max_total)
+    return lo, hi
+
+
+def _best_shared(a, lo, hi, s_values):
+    """공유 인원 합계 S 별 최대 Σ a_j x_j (하한부터 채우고 남은 인원은 공헌이익 큰 순서로)."""
+    value = np.full(s_values.shape, float(a[list(SHARED)] @ lo[list(SHARED)]))
+    remaining = s_values - lo[list(SHARED)].sum()
+    for j in sorted(SHARED, key=lambda j: -a[j]):
+        fill = np.minimum(remaining, hi[j] - lo[j])
+        value = value + a[j] * fill
+        remaining = remaining - fill
+    return value
+
+
+def _top_splits(a, lo, hi, s, k):
+    """공유 인원 합계가 s 일 때 Σ a_j x_j 상위 k 개 (x_주간, x_야간, x_교대, 값)."""
+    x0 = np.arange(lo[0], min(hi[0], s) + 1)
+    # x0 마다 x1 의 가능 구간에서 a1 - a2 부호에 따라 한쪽 끝부터 k 개만 후보로 둔다
+    x1_lo = np.maximum(lo[1], s - x0 - hi[2])
+    x1_hi = np.minimum(hi[1], s - x0 - lo[2])
+    offsets = np.arange(k)
+    if a[1] >= a[2]:
+        x1 = x1_hi[:, None] - offsets
+    else:
+        x1 = x1_lo[:, None] + offsets
+    x0 = np.broadcast_to(x0[:, None], x1.shape)
+    valid = (x1 >= x1_lo[:, None]) & (x1 <= x1_hi[:, None])
+    x0, x1 = x0[valid], x1[valid]
+    x2 = s - x0 - x1
+    value = a[0] * x0 + a[1] * x1 + a[2] * x2
+    if len(value) > k:
+        keep = np.argpartition(-value, k - 1)[:k]
+        x0, x1, x2, value = x0[keep], x1[keep], x2[keep], value[keep]
+    return zip(x0.tolist(), x1.tolist(), x2.tolist(), value.tolist())
+
+
+def search(a, n_cars, fixed_overhead, half_slot_cost, max_total, lo, hi, top_k=5):
+    """공헌이익 a (4,) 에 대한 상위 top_k 인원 구성 [(추정 이익, (주간, 야간, 교대, 일차)), ...]."""
+    s_lo = int(lo[list(SHARED)].sum())
+    heap = []
+    d_values = np.arange(lo[DAILY], min(hi[DAILY], n_cars, max_total) + 1)
+    if len(d_values) == 0:
+        return []
+    s_max = int(min(hi[list(SHARED)].sum(), 2 * n_cars, max_total))
+    s_values = np.arange(s_lo, s_max + 1)
+    if len(s_values) == 0:
+        return []
+    best_shared = _best_shared(a, lo, hi, s_values)
+
+    # (d, S) 쌍별 상한 = 정확한 최대값 (S 내부 배분은 위에서 최적으로 계산)
+    dd, ss = np.meshgrid(d_values, s_values, indexing="ij")
+    capacity = 2 * (n_cars - dd)
+    feasible = (ss <= capacity) & (dd + ss <= max_total) & (dd + ss > 0)
+    penalty = half_slot_cost * np.maximum(capacity - ss, 0)
+    upper = a[DAILY] * dd + best_shared[None, :] - fixed_overhead - penalty
+    upper = np.where(feasible, upper, -np.inf)
+    order = np.argsort(-upper, axis=None)
+
+    for flat in order:
+        bound = upper.flat[flat]
+        if bound == -np.inf or (len(heap) == top_k and bound <= heap[0][0]):
+            break
+        d = int(dd.flat[flat])
+        s = int(ss.flat[flat])
+        base = a[DAILY] * d - fixed_overhead - penalty.flat[flat]
+        for x0, x1, x2, value in _top_splits(a, lo, hi, s, top_k):
+            item = (base + value, (x0, x1, x2, d))
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+    return sorted(heap, reverse=True)
+
+
+def optimize(basic_info, scenarios, max_total=None, min_daily=0, bounds=None, top_k=5):
+    """시나리오별 이익 상위 top_k 기사 구성.
+
+    차량 대수는 basic_info 의 n_cars 로 고정하고, 일차 인원은 차량 대수 이하,
+    공유 인원은 남은 차량 × 2 이하로 제한한다. bounds 로 근무형태별 (최소, 최대) 인원을 줄 수 있다.
+    반환 값의 금액은 engine 으로 다시 계산한 값이다.
+    """
+    info = engine.normalize_basic(basic_info)
+    fixed = engine.fixed_costs(info)
+    n_cars = int(info['n_cars'])
+    if max_total is None:
+        max_total = 2 * n_cars
+    lo, hi = _bounds(bounds, n_cars, max_total, min_daily)
+    fixed_overhead = fixed['net_rent_cost'] + fixed['net_admin_salary']
+    half_slot_cost = fixed['car_fixed_cost_monthly'] / 2
+    contrib = contributions(info, scenarios)
+
+    results = []
+    for i, sc in enumerate(scenarios):
+        found = search(contrib[i], n_cars, fixed_overhead, half_slot_cost, max_total, lo, hi, top_k)
+        if not found:
+            results.append([])
+            continue
+        mixes = np.array([mix for _, mix in found], dtype=float)
+        mix_info = dict(info)
+        for j, k in enumerate(engine.SHIFT_KEYS):
+            mix_info['n_' + k] = mixes[:, j]
+        batch = engine.pack_scenarios([sc] * len(mixes))
+        r = engine.evaluate(mix_info, batch)
+        rows = []
+        for m in np.argsort(-r['profit'], kind="stable"):
+            rows.append({
+                **{'n_' + k: int(mixes[m, j]) for j, k in enumerate(engine.SHIFT_KEYS)},
+                "revenue": r['revenue'][m],
+                "profit": r['profit'][m],
+                "margin": r['margin'][m],
+                "empty_slots": r['fixed']['empty_slots'][m],
+            })
+        results.append(rows)
+    return results
@@ -0,0 +1,165 @@
+"""급여 조건 일괄 생성과 파레토 프런티어.
+
+기준 시나리오(템플릿)를 통상 시급 · 1일 소정근로 · 비과세 조정액 · 근무형태별 사납금 축의
+모든 조합으로 펼친다. 조합은 dict 로 만들지 않고 축 값 배열만 들고 있다가, 위치 i 를
+축별 눈금으로 풀어(np.unravel_index) 구간 단위 ScenarioBatch 를 만들어 한 번에 계산한다.
+결과도 시나리오별 회사 월 영업이익과 기사 평균 실수령액 두 열만 남긴다.
+
+기사 실수령액 = 급여 총액 - 근로자 부담 4대보험 (국민연금·건강보험·장기요양·실업급여, 과세분 기준)
+              + (1일 운송수입 - 사납금) × 만근일수  (운송수입을 준 경우, 모자라면 기사 부담).
+소득세·지방소득세는 개인별 공제에 따라 달라서 넣지 않는다.
+"""
+import numpy as np
+
+from . import engine
+
+AXES = ("hourly", "work_time", "tf", *(f"sanap_{k}" for k in engine.SHIFT_KEYS))
+AXIS_LABELS = {
+    "hourly": "통상 시급",
+    "work_time": "1일 소정근로(h)",
+    "tf": "비과세 조정액",
+    **{f"sanap_{k}": f"{label} 사납금" for k, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+}
+MAX_SCENARIOS = 2_000_000
+CHUNK = 200_000
+
+
+def value_range(start, stop, step):
+    """start 부터 stop 까지 step 간격 값 (stop 포함, step <= 0 이면 start 하나)."""
+    if step <= 0 or stop <= start:
+        return np.array([start], dtype=float)
+    return np.arange(start, stop + step / 2, step, dtype=float)
+
+
+def parse_values(text):
+    """"4, 5.5, 6" 같은 쉼표 구분 숫자 목록. 중복은 빼고 입력 순서 유지."""
+    values = []
+    for part in str(text).replace("\n", ",").split(","):
+        part = part.strip().replace(" ", "")
+        if part:
+            try:
+                value = float(part.replace("_", ""))
+            except ValueError:
+                raise ValueError(f"숫자가 아닌 값이 있습니다: {part}") from None
+            if value not in values:
+                values.append(value)
+    if not values:
+        raise ValueError("값을 하나 이상 입력해주세요.")
+    return np.array(values, dtype=float)
+
+
+class ScenarioGrid:
+    """템플릿 × 축 조합. axes 에 없는 축은 템플릿 값 하나로 고정한다.
+
+    link_pay 면 (시급 × 소정근로 × 만근일수) 가 템플릿보다 늘어난 만큼 급여 총액도 늘린다.
+    tf 축 값은 템플릿 비과세에 더하는 금액이다 (0 ~ 급여 총액 범위로 자름).
+    """
+
+    def __init__(self, template, axes, link_pay=True):
+        self.template = template
+        self.link_pay = link_pay
+        defaults = {"hourly": template['hourly'], "work_time": template['work_time'], "tf": 0,
+                    **{f"sanap_{k}": template[k]['sanap'] for k in engine.SHIFT_KEYS}}
+        self.axes = {}
+        for name in AXES:
+            values = axes.get(name)
+            self.axes[name] = np.atleast_1d(np.asarray(defaults[name] if values is None else values, dtype=float))
+        self.shape = tuple(len(self.axes[name]) for name in AXES)
+
+    def __len__(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def values(self, index):
+        """위치 배열 → {축 이름: 값 배열}."""
+        digits = np.unravel_index(np.asarray(index, dtype=np.int64), self.shape)
+        return {name: self.axes[name][d] for name, d in zip(AXES, digits)}
+
+    def batch(self, basic_info, start, stop):
+        """start <= i < stop 조합의 ScenarioBatch (names 는 위치 번호)."""
+        index = np.arange(start, stop)
+        v = self.values(index)
+        n = len(index)
+        base = engine.pack_scenarios([self.template])
+        pay = np.repeat(base.pay, n, axis=0)
+        if self.link_pay:
+            full_days = engine.normalize_basic(basic_info)['full_days']
+            base_wage = self.template['hourly'] * self.template['work_time']
+            pay = pay + ((v["hourly"] * v["work_time"] - base_wage) * full_days)[:, None]
+        tf = np.clip(np.repeat(base.tf, n, axis=0) + v["tf"][:, None], 0, pay)
+        sanap = np.stack([v[f"sanap_{k}"] for k in engine.SHIFT_KEYS], axis=-1)
+        return engine.ScenarioBatch(names=index, hourly=v["hourly"], work_time=v["work_time"], pay=pay, tf=tf, sanap=sanap)
+
+    def scenario(self, basic_info, i, name=None):
+        """위치 i 의 시나리오 dict (app 의 시나리오 목록에 그대로 넣을 수 있는 형식)."""
+        b = self.batch(basic_info, i, i + 1)
+        v = self.values([i])
+        sc = {
+            "name": name or self.name(v),
+            "hourly": _number(b.hourly[0]),
+            "work_time": float(b.work_time[0]),
+        }
+        for j, k in enumerate(engine.SHIFT_KEYS):
+            sc[k] = {"pay": _number(b.pay[0, j]), "tf": _number(b.tf[0, j]), "sanap": _number(b.sanap[0, j])}
+        return sc
+
+    def name(self, v):
+        sanap = "/".join(f"{v[f'sanap_{k}'][0] / 1000:g}" for k in engine.SHIFT_KEYS)
+        tf = f" · 비과세+{v['tf'][0]:,.0f}" if v['tf'][0] else ""
+        return f"{self.template['name']} · 시급 {v['hourly'][0]:,.0f} · {v['work_time'][0]:g}h{tf} · 사납금 {sanap}천"
+
+
+def _number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def take_home(rates, pay, tf):
+    """근로자 부담 4대보험을 뺀 월 실수령액 (소득세 제외). rates 는 engine.insurance_rates 형식."""
+    taxable = np.maximum(pay - tf, 0)
+    health = taxable * rates['rate_health']
+    deduction = taxable * rates['rate_pension'] + health + health * rates['rate_care_ratio'] + taxable * rates['rate_emp_unemp']
+    return pay - deduction
+
+
+def evaluate(basic_info, grid, revenue=None, chunk=CHUNK):
+    """모든 조합의 회사 월 영업이익·이익률과 기사 평균 실수령액 (각 (N,) 배열).
+
+    revenue: 근무형태별 기사 1일 평균 운송수입 (4,). 주면 사납금과의 차액을 실수령액에 더한다
+    (없으면 사납금이 실수령액에 영향을 주지 않아 프런티어가 항상 가장 높은 사납금으로 몰린다).
+    CHUNK 개씩 나눠 계산해 중간 배열 메모리를 제한한다.
+    """
+    n = len(grid)
+    if n > MAX_SCENARIOS:
+        raise ValueError(f"조합이 {n:,}개로 최대 {MAX_SCENARIOS:,}개를 넘습니다. 범위나 간격을 줄여주세요.")
+    info = engine.normalize_basic(basic_info)
+    rates = engine.insurance_rates(info)
+    counts = engine.driver_counts(info)
+    total = counts.sum()
+    out = {"profit": np.empty(n), "margin": np.empty(n), "take_home": np.empty(n)}
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        batch = grid.batch(info, start, stop)
+        r = engine.evaluate(info, batch)
+        out["profit"][start:stop] = r['profit']
+        out["margin"][start:stop] = r['margin']
+        pay_home = take_home(rates, batch.pay, batch.tf)
+        if revenue is not None:
+            pay_home = pay_home + (np.asarray(revenue, dtype=float) - batch.sanap) * info['full_days']
+        out["take_home"][start:stop] = (pay_home * counts).sum(axis=1) / total if total > 0 else 0
+    return out
+
+
+def pareto_front(profit, take_home):
+    """둘 다 클수록 좋은 두 지표의 파레토 프런티어 위치 (영업이익 큰 순서).
+
+    영업이익 내림차순(같으면 실수령액 내림차순)으로 훑으면서 지금까지의 최대 실수령액보다
+    큰 점만 남긴다. 두 지표가 똑같은 점은 처음 것 하나만 남는다.
+    """
+    profit = np.asarray(profit, dtype=float)
+    take_home = np.asarray(take_home, dtype=float)
+    if len(profit) == 0:
+        return np.array([], dtype=np.int64)
+    order = np.lexsort((-take_home, -profit))
+    ordered = take_home[order]
+    best_before = np.concatenate(([-np.inf], np.maximum.accumulate(ordered)[:-1]))
+    return order[ordered > best_before]
@@ -0,0 +1,27 @@
+"""처음 사용할 때 import 되는 모듈.
+
+pandas, plotly, google.generativeai 처럼 import 에 수백 ms~1초가 걸리는 모듈을
+app.py 맨 위에 이름만 선언해 두고, 실제 import 는 그 모듈의 속성을 처음 쓸 때 한다.
+"""
+import importlib
+
+
+class LazyModule:
+    """모듈 대리 객체. pd.DataFrame 처럼 속성에 처음 접근하는 순간 실제 모듈을 import 한다."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
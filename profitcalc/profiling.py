@@ -0,0 +1,271 @@
+"""재실행(rerun)별 구간 시간 측정.
+
+    profiler = Profiler(enabled=True)
+    with profiler.span("계산"):
+        ...
+    profiler.finish()      # METRICS 누적 + (설정 시) JSON 로그 한 줄
+
+꺼져 있으면 span 은 아무것도 하지 않는 컨텍스트를 돌려주므로 항상 코드에 남겨 둔다.
+memory=True 면 tracemalloc 으로 구간별 최고 메모리를 잰다 (파이썬 할당만, 실행이 2~3배 느려짐).
+tracemalloc 은 프로세스 전역이라 여러 세션이 동시에 재는 동안에는 값이 섞일 수 있다.
+
+환경 변수
+  - TAXI_PROFIT_PROFILE=1: 모든 세션에서 기본으로 켠다
+  - TAXI_PROFIT_PROFILE_LOG: 재실행마다 JSON 한 줄을 쓸 파일 ("-" 이면 stderr)
+  - TAXI_PROFIT_METRICS_PORT: 누적 지표를 Prometheus 텍스트 형식으로 내보낼 로컬 포트 (/metrics)
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("taxi_profit.profile")
+# 설정 문제 경고용 (JSON 로그 파일에 섞이지 않도록 따로 둔다)
+log = logging.getLogger(__name__)
+
+ENABLED_BY_DEFAULT = os.environ.get("TAXI_PROFIT_PROFILE", "").lower() in ("1", "true", "yes", "on")
+LOG_TARGET = os.environ.get("TAXI_PROFIT_PROFILE_LOG", "")
+METRICS_PORT = os.environ.get("TAXI_PROFIT_METRICS_PORT", "")
+
+
+_memory_lock = threading.Lock()
+_memory_users = 0
+_memory_owned = False
+
+
+def _acquire_tracemalloc():
+    global _memory_users, _memory_owned
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_owned = True
+        _memory_users += 1
+
+
+def _release_tracemalloc():
+    global _memory_users, _memory_owned
+    with _memory_lock:
+        _memory_users -= 1
+        if _memory_users == 0 and _memory_owned:
+            tracemalloc.stop()
+            _memory_owned = False
+
+
+class _Frame:
+    __slots__ = ("name", "started", "start_memory", "peak")
+
+    def __init__(self, name, started, start_memory):
+        self.name = name
+        self.started = started
+        self.start_memory = start_memory
+        self.peak = 0
+
+
+class Profiler:
+    """한 번의 재실행 동안 이름 붙은 구간의 횟수·누적 시간·최대 시간·최고 메모리를 모은다."""
+
+    def __init__(self, enabled=True, memory=False, context=None):
+        self.enabled = enabled
+        self.memory = memory and enabled
+        self.context = context or {}
+        self.started = time.perf_counter()
+        self.stats = {}
+        self._stack = []
+        self._release = None
+        if self.memory:
+            _acquire_tracemalloc()
+            # st.rerun() 등으로 finish 까지 못 가도 객체가 사라질 때 tracemalloc 을 돌려놓는다
+            self._release = weakref.finalize(self, _release_tracemalloc)
+
+    def span(self, name):
+        if not self.enabled:
+            return nullcontext()
+        return _Span(self, name)
+
+    def _enter(self, name):
+        start_memory = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # 바깥 구간의 최고치를 넘겨받은 뒤 안쪽 구간용으로 초기화
+            for frame in self._stack:
+                frame.peak = max(frame.peak, peak)
+            tracemalloc.reset_peak()
+            start_memory = current
+        if name not in self.stats:
+            self.stats[name] = {"count": 0, "total": 0.0, "max": 0.0, "peak": None, "depth": len(self._stack)}
+        self._stack.append(_Frame(name, time.perf_counter(), start_memory))
+
+    def _exit(self):
+        frame = self._stack.pop()
+        elapsed = time.perf_counter() - frame.started
+        peak = None
+        if self.memory:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            peak = frame.peak - frame.start_memory
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+        entry = self.stats[frame.name]
+        entry["count"] += 1
+        entry["total"] += elapsed
+        entry["max"] = max(entry["max"], elapsed)
+        if peak is not None:
+            entry["peak"] = max(entry["peak"] or 0, peak)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def records(self):
+        """[{name, count, total_ms, max_ms, peak_kb, depth}, ...] (처음 시작한 순서)."""
+        rows = []
+        for name, s in self.stats.items():
+            rows.append({
+                "name": name,
+                "count": s["count"],
+                "total_ms": s["total"] * 1000,
+                "max_ms": s["max"] * 1000,
+                "peak_kb": None if s["peak"] is None else s["peak"] / 1024,
+                "depth": s["depth"],
+            })
+        return rows
+
+    def finish(self):
+        """재실행 결과를 METRICS 에 더하고 JSON 로그를 남긴다. 기록한 줄 목록을 돌려준다."""
+        if self._release is not None:
+            self._release()
+        if not self.enabled:
+            return []
+        rows = self.records()
+        METRICS.add(rows, rerun=self.context.get("event", "rerun") == "rerun")
+        if logger.handlers:
+            logger.info(json.dumps({
+                "ts": time.time(), "event": "rerun", "total_ms": self.elapsed() * 1000,
+                **self.context, "spans": rows,
+            }, ensure_ascii=False))
+        return rows
+
+
+class _Span:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._exit()
+        return False
+
+
+def timed(name, func, enabled=True, **context):
+    """재실행이 끝난 뒤 따로 불리는 함수(다운로드 버튼 data 콜백 등)를 한 구간으로 재는 래퍼."""
+    def wrapper(*args, **kwargs):
+        profiler = Profiler(enabled=enabled, context=dict(context, event="callback"))
+        try:
+            with profiler.span(name):
+                return func(*args, **kwargs)
+        finally:
+            profiler.finish()
+    return wrapper
+
+
+class MetricsRegistry:
+    """프로세스 전체(모든 세션) 구간별 누적 횟수·시간·최대 시간."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = {}
+        self.reruns = 0
+
+    def add(self, rows, rerun=True):
+        with self._lock:
+            self.reruns += rerun
+            for row in rows:
+                s = self._spans.setdefault(row["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                s["count"] += row["count"]
+                s["total_ms"] += row["total_ms"]
+                s["max_ms"] = max(s["max_ms"], row["max_ms"])
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(s) for name, s in self._spans.items()}
+
+    def prometheus(self):
+        lines = [
+            "# HELP taxi_profit_reruns_total Profiled reruns.",
+            "# TYPE taxi_profit_reruns_total counter",
+            f"taxi_profit_reruns_total {self.reruns}",
+            "# HELP taxi_profit_span_seconds Time spent in named spans.",
+            "# TYPE taxi_profit_span_seconds summary",
+        ]
+        spans = self.snapshot()
+        for name, s in spans.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'taxi_profit_span_seconds_count{{span="{label}"}} {s["count"]}')
+            lines.append(f'taxi_profit_span_seconds_sum{{span="{label}"}} {s["total_ms"] / 1000:.6f}')
+        lines.append("# HELP taxi_profit_span_max_seconds Longest single span.")
+        lines.append("# TYPE taxi_profit_span_max_seconds gauge")
+        for name, s in spans.items():
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'taxi_profit_span_max_seconds{{span="{label}"}} {s["max_ms"] / 1000:.6f}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+def configure_log(target=LOG_TARGET):
+    """JSON 로그 출력 대상 설정 (target 이 비어 있으면 로그를 쓰지 않는다). 여러 번 불러도 한 번만 붙인다."""
+    if not target or logger.handlers:
+        return
+    try:
+        handler = logging.StreamHandler(sys.stderr) if target == "-" else logging.FileHandler(target, encoding="utf-8")
+    except OSError as e:
+        log.warning("프로파일 로그 파일을 열 수 없어 JSON 로그를 끕니다 (%s): %s", target, e)
+        return
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def serve_metrics(port=METRICS_PORT, host="127.0.0.1"):
+    """METRICS 를 http://host:port/metrics 로 내보내는 데몬 스레드 서버.
+
+    port 가 비어 있거나, 숫자가 아니거나, 이미 쓰이고 있으면(다른 Streamlit 프로세스, 재시작 직후
+    TIME_WAIT 등) 경고만 남기고 None 을 돌려준다. 진단 기능 때문에 앱이 멈추지 않게 하기 위함.
+    """
+    if not port:
+        return None
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = METRICS.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, int(port)), Handler)
+    except (OSError, ValueError) as e:
+        log.warning("지표 엔드포인트를 열 수 없어 건너뜁니다 (%s:%s): %s", host, port, e)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
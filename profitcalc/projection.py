@@ -0,0 +1,176 @@
+"""다년도 월별 손익 전망.
+
+전망 기간의 월 M 개 × 시나리오 S 개를 S·M 행으로 펼쳐 engine.evaluate 를 한 번만 호출한다.
+월마다 달라지는 값(4대보험 요율, LPG 단가, 물가)은 basic_info 에 (S·M,) 배열로,
+임금·사납금 인상은 ScenarioBatch 에 월별 배율을 곱해 넣는다.
+차량 감가상각비는 engine 의 차량 1대 단가로 바꾸지 않고 (차량 구입가 0 으로 계산한 뒤)
+차량 구입 일정(depreciation_schedule)의 월 합계를 회사 이익에서 그대로 뺀다.
+
+연도별 값은 {연도: 값} 표로 받고, 표에 없는 연도는 직전 연도 값을 그대로 쓴다.
+"""
+import numpy as np
+
+from . import engine
+
+MAX_YEARS = 10
+
+
+def month_labels(start_year, start_month, n_months):
+    """전망 월 이름 ["2026-01", ...] 과 월별 연도 (M,)."""
+    index = (start_month - 1) + np.arange(n_months)
+    years = start_year + index // 12
+    months = index % 12 + 1
+    return [f"{y}-{m:02d}" for y, m in zip(years, months)], years
+
+
+def year_table(table, years, base):
+    """{연도: 값} 표를 월별 (M,) 배열로. 첫 표 연도 이전은 base, 표 사이는 직전 연도 값."""
+    values = np.full(len(years), float(base))
+    for year in sorted(table or {}):
+        values[years >= int(year)] = float(table[year])
+    return values
+
+
+def growth_factor(years, start_year, rate):
+    """연 rate% 씩 매년 1월에 오르는 배율 (M,)."""
+    return (1 + rate / 100) ** (years - start_year)
+
+
+def _month_index(ym, start_year, start_month):
+    """"YYYY-MM" 을 전망 시작 월 기준 월 위치로 (이전이면 음수)."""
+    year, month = (int(x) for x in str(ym).split("-")[:2])
+    return (year - start_year) * 12 + (month - start_month)
+
+
+def depreciation_schedule(vehicles, n_months, start_year, start_month, dep_years,
+                          replace=True, price_growth=0.0):
+    """차량별 정액 감가상각비 합계 (M,) (부가세 제외).
+
+    vehicles 는 [{"purchased": "YYYY-MM", "count": 대수, "price": 구입가(VAT 포함)}, ...].
+    내용연수(dep_years)가 끝난 차량은 replace=True 면 그 달에 같은 대수를 새로 사며,
+    새 차 구입가는 전망 시작 연도 대비 연 price_growth% 씩 오른 값이다.
+    """
+    life = int(round(dep_years * 12))
+    if life <= 0 or not vehicles:
+        return np.zeros(n_months)
+    m = np.arange(n_months)
+    purchased = np.array([_month_index(v['purchased'], start_year, start_month) for v in vehicles])
+    count = np.array([float(v.get('count', 1)) for v in vehicles])
+    price = np.array([float(v['price']) for v in vehicles])
+
+    age = m[None, :] - purchased[:, None]                       # (V, M)
+    cycle = np.where(age >= 0, age // life, -1)
+    in_service = (cycle == 0) | ((cycle > 0) & replace)
+    # 교체 차량 구입가: 교체한 달의 연도 기준 상승 배율
+    bought_at = purchased[:, None] + np.maximum(cycle, 0) * life
+    bought_year = start_year + (start_month - 1 + bought_at) // 12
+    growth = (1 + price_growth / 100) ** np.maximum(bought_year - start_year, 0)
+    cycle_price = np.where(cycle > 0, price[:, None] * growth, price[:, None])
+    monthly = cycle_price / 1.1 / life
+    return (np.where(in_service, monthly, 0) * count[:, None]).sum(axis=0)
+
+
+def project(basic_info, scenarios, start_year, start_month=1, years=5,
+            rate_table=None, hourly_growth=0.0, min_wage=None, pay_growth=0.0, sanap_growth=0.0,
+            lpg_table=None, lpg_growth=0.0, cost_growth=0.0,
+            vehicles=None, replace=True, car_price_growth=0.0):
+    """시나리오별 월별 손익 전망.
+
+    rate_table: {연도: {"rate_pension": %, ...}} (없는 요율·연도는 현재 값)
+    min_wage: {연도: 최저시급} - 인상률을 적용한 시급이 이보다 낮으면 최저시급으로 올리고,
+        근무형태별 급여 총액도 최저시급 × 1일 소정근로 × 만근일수 (주휴·연장수당 제외) 아래로 내려가지 않게 한다.
+    lpg_table: {연도: LPG 단가} - 없으면 현재 단가에 lpg_growth% 연 인상.
+    cost_growth: 임대료·관리직 급여·차량 유지비·보험료의 연 인상률(%).
+    vehicles: depreciation_schedule 형식. 없으면 현재 n_cars 대를 전망 시작 월에 산 것으로 본다 (0대면 감가상각비 0).
+        감가상각비는 이 일정의 월 합계 그대로 반영한다 (n_cars 와 대수가 달라도 됨).
+        보험료·유지비와 빈 차량 비용은 지금처럼 n_cars 기준이다.
+    """
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"전망 기간은 1~{MAX_YEARS}년이어야 합니다")
+    info = engine.normalize_basic(basic_info)
+    n_months = 12 * years
+    labels, month_years = month_labels(start_year, start_month, n_months)
+    n_sc = len(scenarios)
+
+    def tile(values):
+        return np.tile(values, n_sc)
+
+    monthly = dict(info)
+    for key in engine.RATE_KEYS:
+        table = {y: rates[key] for y, rates in (rate_table or {}).items() if key in rates}
+        monthly[key] = tile(year_table(table, month_years, info[key]))
+    if lpg_table:
+        lpg = year_table(lpg_table, month_years, info['lpg_price'])
+    else:
+        lpg = info['lpg_price'] * growth_factor(month_years, start_year, lpg_growth)
+    monthly['lpg_price'] = tile(lpg)
+    cost_factor = growth_factor(month_years, start_year, cost_growth)
+    for key in ('rent_cost', 'admin_salary_total', 'car_maint', 'insurance_year'):
+        monthly[key] = tile(info[key] * cost_factor)
+
+    if vehicles is None:
+        vehicles = [{"purchased": f"{start_year}-{start_month:02d}", "count": info['n_cars'], "price": info['car_price']}]
+    fleet_dep = depreciation_schedule(vehicles, n_months, start_year, start_month, info['car_dep_years'],
+                                      replace, car_price_growth)
+    # engine 은 감가상각비를 차량 1대 단가 × n_cars 로 나누어 매기므로 0 으로 두고 아래에서 월 합계를 뺀다
+    monthly['car_price'] = 0.0
+
+    base = engine.pack_scenarios(scenarios)
+    hourly = np.repeat(base.hourly, n_months) * tile(growth_factor(month_years, start_year, hourly_growth))
+    work_time = np.repeat(base.work_time, n_months)
+    pay_factor = tile(growth_factor(month_years, start_year, pay_growth))[:, None]
+    pay = np.repeat(base.pay, n_months, axis=0) * pay_factor
+    if min_wage:
+        floor = tile(year_table(min_wage, month_years, 0))
+        hourly = np.maximum(hourly, floor)
+        pay = np.maximum(pay, (floor * work_time * info['full_days'])[:, None])
+    sanap_factor = tile(growth_factor(month_years, start_year, sanap_growth))[:, None]
+    batch = engine.ScenarioBatch(
+        names=[name for name in base.names for _ in range(n_months)],
+        hourly=hourly,
+        work_time=work_time,
+        pay=pay,
+        tf=np.repeat(base.tf, n_months, axis=0),
+        sanap=np.repeat(base.sanap, n_months, axis=0) * sanap_factor,
+    )
+    r = engine.evaluate(monthly, batch)
+
+    shape = (n_sc, n_months)
+    revenue = r['revenue'].reshape(shape)
+    profit = r['profit'].reshape(shape) - fleet_dep
+    labor = r['labor'].reshape(shape)
+    return {
+        "names": base.names,
+        "months": labels,
+        "years": month_years,
+        "revenue": revenue,
+        "profit": profit,
+        "labor": labor,
+        "cumulative_profit": np.cumsum(profit, axis=1),
+        "margin": engine.safe_ratio(profit, revenue),
+        "depreciation": fleet_dep,
+        "lpg_price": lpg,
+        "hourly": hourly.reshape(shape),
+    }
+
+
+def annual_rows(result):
+    """시나리오 × 연도 합계표 행 목록."""
+    rows = []
+    year_values = np.unique(result['years'])
+    for i, name in enumerate(result['names']):
+        for year in year_values:
+            mask = result['years'] == year
+            revenue = result['revenue'][i, mask].sum()
+            labor = result['labor'][i, mask].sum()
+            profit = result['profit'][i, mask].sum()
+            rows.append({
+                "시나리오명": name,
+                "연도": int(year),
+                "개월 수": int(mask.sum()),
+                "총 매출": revenue,
+                "총 인건비": labor,
+                "영업이익": profit,
+                "이익률": (profit / revenue * 100) if revenue > 0 else 0,
+            })
+    return rows
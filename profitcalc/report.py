@@ -0,0 +1,114 @@
+"""시나리오 비교 엑셀 보고서.
+
+시트: Summary(시나리오 비교) / 근무형태별 / 상세 계산 검증 (모든 시나리오 × 근무형태).
+상세 계산 검증은 시나리오 1,000개면 10만 행 가까이 되므로 openpyxl write-only 모드로 행을 흘려 쓴다
+(시트 전체를 메모리에 들지 않는다). 이 크기면 몇 초 걸리므로 app 은 다운로드 버튼을 누를 때만 만들고
+ReportCache 로 같은 입력의 결과를 재사용한다.
+"""
+import io
+import math
+import re
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from . import engine
+from .cache import LRUCache, fingerprint
+
+SUMMARY_COLUMNS = ["시나리오명", "총 매출 (월)", "총 인건비 (월)", "영업이익 (월)", "인건비율", "이익률"]
+DETAIL_COLUMNS = ["시나리오명", "근무형태", "1인 매출", "1인 영업이익", "1인 인건비", "인건비율"]
+BREAKDOWN_COLUMNS = ["시나리오명", "근무형태", "항목", "금액(원)", "비고"]
+
+# 열 서식 (None 이면 일반)
+MONEY = "#,##0"
+PERCENT = '0.0"%"'
+HEADER_FONT = Font(bold=True)
+
+# XML 1.0 에 쓸 수 없는 문자 (탭·줄바꿈·CR 제외 제어 문자, 짝 없는 서로게이트, U+FFFE/U+FFFF)
+_ILLEGAL_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def clean_text(value):
+    """XML 에 넣을 수 없는 문자를 뺀 문자열 (시나리오명·비고에 붙여넣은 제어 문자 등)."""
+    return _ILLEGAL_XML_CHARS.sub("", value)
+
+
+def _cell(sheet, value, number_format=None):
+    if isinstance(value, str):
+        value = clean_text(value)
+    elif value is not None:
+        value = float(value)
+        if not math.isfinite(value):
+            value = None
+    if number_format is None or value is None:
+        return value
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.number_format = number_format
+    return cell
+
+
+def _write_sheet(book, title, columns, rows, widths, formats):
+    """머리글(굵게, 틀 고정) + rows 를 write-only 시트 하나로."""
+    sheet = book.create_sheet(clean_text(title))
+    sheet.freeze_panes = "A2"
+    for i, width in enumerate(widths, 1):
+        sheet.column_dimensions[get_column_letter(i)].width = width
+    header = []
+    for name in columns:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = HEADER_FONT
+        header.append(cell)
+    sheet.append(header)
+    for row in rows:
+        sheet.append([_cell(sheet, value, fmt) for value, fmt in zip(row, formats)])
+
+
+def write_report(target, basic_info, scenarios):
+    """보고서를 target(경로 또는 바이너리 파일 객체)에 기록."""
+    info = engine.normalize_basic(basic_info)
+    r = engine.evaluate(info, engine.pack_scenarios(scenarios)) if scenarios else None
+    results = engine.summarize(r) if scenarios else []
+
+    def detail_rows():
+        for sc, res in zip(scenarios, results):
+            for d in res['details']:
+                yield [sc['name'], d["근무형태"], d["1인 매출"], d["1인 영업이익"], d["1인 인건비"], d["인건비율"]]
+
+    def breakdown_rows():
+        for i, sc in enumerate(scenarios):
+            for key, rows in engine.debug_rows(info, sc, r, i).items():
+                shift_label = key.rsplit(" - ", 1)[1]
+                for item, amount, note in rows:
+                    yield [sc['name'], shift_label, item, amount, note]
+
+    book = Workbook(write_only=True)
+    _write_sheet(book, "Summary", SUMMARY_COLUMNS, (list(engine.summary_row(res).values()) for res in results),
+                 widths=[24, 16, 16, 16, 10, 10], formats=[None, MONEY, MONEY, MONEY, PERCENT, PERCENT])
+    _write_sheet(book, "근무형태별", DETAIL_COLUMNS, detail_rows(),
+                 widths=[24, 10, 14, 14, 14, 10], formats=[None, None, MONEY, MONEY, MONEY, PERCENT])
+    _write_sheet(book, "상세 계산 검증", BREAKDOWN_COLUMNS, breakdown_rows(),
+                 widths=[24, 10, 28, 16, 28], formats=[None, None, None, MONEY, None])
+    book.save(target)
+
+
+def report_bytes(basic_info, scenarios):
+    buffer = io.BytesIO()
+    write_report(buffer, basic_info, scenarios)
+    return buffer.getvalue()
+
+
+class ReportCache:
+    """입력 지문별 보고서 바이트 캐시. 데이터가 그대로면 다시 만들지 않는다."""
+
+    def __init__(self, maxsize=8):
+        self.cache = LRUCache(maxsize)
+
+    def get(self, basic_info, scenarios):
+        key = fingerprint([engine.normalize_basic(basic_info), scenarios])
+        data = self.cache.get(key)
+        if data is None:
+            data = report_bytes(basic_info, scenarios)
+            self.cache.put(key, data)
+        return data
@@ -0,0 +1,272 @@
+"""몬테카를로 리스크 시뮬레이션.
+
+연료량, 실근무 일수, LPG 단가, 기사 결원을 분포에서 뽑아 월 영업이익 분포를 구한다.
+표본은 chunk_size 단위로 나눠 계산하고, 끝난 chunk 는 바로 시나리오별 요약(ProfitSummary)에
+합친 뒤 버리므로 메모리가 표본 수와 무관하다. chunk 마다 SeedSequence 를 나눠 쓰고 결과를
+제출 순서대로 합치기 때문에 프로세스 수와 상관없이 seed 가 같으면 결과도 같다.
+"""
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import engine
+
+# 시뮬레이션 변수: 키 -> 표시명
+VARIABLES = {
+    "lpg_price": "LPG 단가",
+    "full_days": "실근무 일수",
+    **{f"fuel_{k}": f"{label} 연료(L)" for k, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+    "vacancy": "기사 결원율",
+}
+DISTRIBUTIONS = ("fixed", "normal", "uniform", "triangular")
+PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+
+
+def draw(rng, spec, size):
+    """spec 분포에서 size 개 표본.
+
+    {"dist": "fixed", "value"} / {"dist": "normal", "mean", "std"} /
+    {"dist": "uniform", "low", "high"} / {"dist": "triangular", "low", "mode", "high"}
+    """
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        return np.full(size, float(spec["value"]))
+    if dist == "normal":
+        return rng.normal(spec["mean"], spec["std"], size)
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    raise ValueError(f"지원하지 않는 분포: {dist}")
+
+
+def _simulate_chunk(basic_info, sc_data, specs, size, seed_seq):
+    """한 chunk 의 월 영업이익 표본."""
+    rng = np.random.default_rng(seed_seq)
+    info = engine.normalize_basic(basic_info)
+    for key in VARIABLES:
+        if key in specs and key != "vacancy":
+            info[key] = np.maximum(draw(rng, specs[key], size), 0)
+    if "vacancy" in specs:
+        rate = np.clip(draw(rng, specs["vacancy"], size), 0, 1)
+        for k in engine.SHIFT_KEYS:
+            n = int(info['n_' + k])
+            if n > 0:
+                info['n_' + k] = n - rng.binomial(n, rate)
+
+    base = engine.pack_scenarios([sc_data])
+    # 시뮬레이션 변수는 인건비와 무관하므로 인건비는 한 번만 계산해 모든 표본에 브로드캐스트
+    shape = (size, len(engine.SHIFT_KEYS))
+    labor = engine.labor_terms(engine.insurance_rates(info), base.hourly, base.work_time, base.pay, base.tf)
+    labor = {k: np.broadcast_to(v, shape) for k, v in labor.items()}
+    batch = engine.ScenarioBatch(
+        names=[sc_data['name']] * size,
+        hourly=np.broadcast_to(base.hourly, (size,)),
+        work_time=np.broadcast_to(base.work_time, (size,)),
+        pay=np.broadcast_to(base.pay, shape),
+        tf=np.broadcast_to(base.tf, shape),
+        sanap=np.broadcast_to(base.sanap, shape),
+    )
+    return engine.evaluate(info, batch, labor)['profit']
+
+
+def _chunk_task(args):
+    return args[0], args[1], _simulate_chunk(*args[2:])
+
+
+def summarize_samples(profit, alpha=0.05):
+    """이익 표본 전체로 구한 정확한 분위수, 손실 확률, 기대 손실(하위 alpha 평균)."""
+    n_tail = max(int(np.ceil(len(profit) * alpha)), 1)
+    tail = np.partition(profit, n_tail - 1)[:n_tail]
+    return {
+        "n_samples": len(profit),
+        "mean": float(profit.mean()),
+        "std": float(profit.std()),
+        "percentiles": dict(zip(PERCENTILES, np.percentile(profit, PERCENTILES).tolist())),
+        "prob_loss": float((profit < 0).mean()),
+        "var": float(tail.max()),
+        "expected_shortfall": float(tail.mean()),
+        "alpha": alpha,
+    }
+
+
+class ProfitSummary:
+    """한 시나리오의 이익 표본을 chunk 단위로 받아 요약만 누적한다 (표본은 보관하지 않음).
+
+    평균·표준편차·손실 확률은 정확한 값 (chunk 별 평균·편차제곱합을 병합),
+    분위수·VaR·기대 손실은 첫 chunk 범위를 양쪽으로 50% 넓힌 bins 칸 히스토그램(칸별 개수·합계)에서
+    구한다. 오차는 칸 너비 이내이고, 범위를 벗어난 표본(드문 꼬리)은 값 그대로 따로 모은다.
+    """
+
+    def __init__(self, bins=8192):
+        self.bins = bins
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.losses = 0
+        self.lo = self.width = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.sums = np.zeros(bins)
+        self.outside = []
+
+    def add(self, profit):
+        profit = np.asarray(profit, dtype=float)
+        n = len(profit)
+        if n == 0:
+            return
+        mean = profit.mean()
+        m2 = ((profit - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.losses += int((profit < 0).sum())
+
+        if self.lo is None:
+            lo, hi = profit.min(), profit.max()
+            pad = (hi - lo) * 0.5 or max(abs(lo), 1.0) * 1e-6
+            self.lo = lo - pad
+            self.width = (hi - lo + 2 * pad) / self.bins
+        index = np.floor((profit - self.lo) / self.width).astype(np.int64)
+        inside = (index >= 0) & (index < self.bins)
+        self.counts += np.bincount(index[inside], minlength=self.bins)
+        self.sums += np.bincount(index[inside], weights=profit[inside], minlength=self.bins)
+        if not inside.all():
+            self.outside.append(profit[~inside])
+
+    def _parts(self):
+        outside = np.sort(np.concatenate(self.outside)) if self.outside else np.empty(0)
+        below = outside[outside < self.lo]
+        return below, outside[len(below):]
+
+    def _nth(self, k, below, above, cum):
+        """오름차순 k 번째(0부터) 표본의 근삿값. 칸 안의 표본은 칸 너비에 고르게 퍼져 있다고 본다."""
+        if k < len(below):
+            return float(below[k])
+        if k >= self.count - len(above):
+            return float(above[k - (self.count - len(above))])
+        k -= len(below)
+        b = int(np.searchsorted(cum, k, side="right"))
+        before = cum[b - 1] if b else 0
+        return float(self.lo + self.width * (b + (k - before + 0.5) / self.counts[b]))
+
+    def _value_at(self, rank, below, above):
+        """오름차순 rank 번째(소수 허용) 값. np.percentile 처럼 양옆 표본 사이를 선형 보간."""
+        cum = np.cumsum(self.counts)
+        lower = math.floor(rank)
+        value = self._nth(lower, below, above, cum)
+        if rank > lower:
+            value += (rank - lower) * (self._nth(lower + 1, below, above, cum) - value)
+        return value
+
+    def _lowest_sum(self, k, below):
+        """가장 작은 k 개 표본의 합 (근삿값)."""
+        if k <= len(below):
+            return float(below[:k].sum())
+        total = float(below.sum())
+        k -= len(below)
+        cum = np.cumsum(self.counts)
+        b = int(np.searchsorted(cum, k))
+        if b >= self.bins:
+            return total + float(self.sums.sum())
+        before = cum[b - 1] if b else 0
+        partial = (k - before) * self.sums[b] / self.counts[b]
+        return total + float(self.sums[:b].sum() + partial)
+
+    def result(self, alpha=0.05):
+        """summarize_samples 와 같은 형식의 요약."""
+        if self.count == 0:
+            raise ValueError("표본이 없습니다.")
+        below, above = self._parts()
+        n_tail = max(math.ceil(self.count * alpha), 1)
+        return {
+            "n_samples": self.count,
+            "mean": float(self.mean),
+            "std": float(math.sqrt(self.m2 / self.count)),
+            "percentiles": {p: self._value_at(p / 100 * (self.count - 1), below, above) for p in PERCENTILES},
+            "prob_loss": self.losses / self.count,
+            "var": self._value_at(n_tail - 1, below, above),
+            "expected_shortfall": self._lowest_sum(n_tail, below) / n_tail,
+            "alpha": alpha,
+        }
+
+
+def _chunk_results(tasks, workers):
+    """제출 순서대로 chunk 결과를 돌려준다. 동시에 계산 중인 chunk 수를 제한해 메모리를 일정하게 유지."""
+    if workers == 1 or len(tasks) == 1:
+        yield from map(_chunk_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_chunk_task, task))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def simulate(basic_info, scenarios, specs, n_samples=1_000_000, seed=None,
+             chunk_size=20_000, workers=None, alpha=0.05, return_samples=False):
+    """시나리오별 월 영업이익 분포 요약 목록.
+
+    workers=1 이면 현재 프로세스에서, 그 외에는 ProcessPoolExecutor 로 chunk 를 병렬 계산한다
+    (Streamlit 앱은 workers=1, 병렬 계산은 CLI·벤치마크용).
+    모든 시나리오가 같은 chunk 별 seed 를 쓰므로(공통 난수) 시나리오 간 비교의 잡음이 적다.
+    요약은 ProfitSummary 로 누적한다. return_samples=True 일 때만 표본 전체를 모아 두고
+    (시나리오당 n_samples × 8바이트) summarize_samples 로 정확한 요약과 함께 "samples" 로 돌려준다.
+    """
+    unknown = set(specs) - set(VARIABLES)
+    if unknown:
+        raise ValueError(f"지원하지 않는 시뮬레이션 변수: {sorted(unknown)}")
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)
+
+    samples = [np.empty(n_samples) for _ in scenarios] if return_samples else None
+    running = [ProfitSummary() for _ in scenarios]
+    tasks = [(i, c, basic_info, sc, specs, size, seeds[c])
+             for i, sc in enumerate(scenarios) for c, size in enumerate(sizes)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    for i, c, profit in _chunk_results(tasks, workers):
+        if samples is not None:
+            samples[i][offsets[c]:offsets[c] + sizes[c]] = profit
+        else:
+            running[i].add(profit)
+
+    summaries = []
+    for i, sc in enumerate(scenarios):
+        if samples is not None:
+            summary = summarize_samples(samples[i], alpha)
+            summary["samples"] = samples[i]
+        else:
+            summary = running[i].result(alpha)
+        summary["name"] = sc['name']
+        summaries.append(summary)
+    return summaries
+
+
+def basic_specs(basic_info, lpg_cv=0.05, fuel_cv=0.10, min_days=None, max_vacancy=0.10):
+    """현재 입력값을 중심으로 한 기본 분포 설정.
+
+    LPG 단가·연료량은 정규분포(변동계수 cv), 실근무 일수는 min_days~만근 삼각분포,
+    결원율은 0~max_vacancy 균등분포.
+    """
+    info = engine.normalize_basic(basic_info)
+    full_days = info['full_days']
+    specs = {"lpg_price": {"dist": "normal", "mean": info['lpg_price'], "std": info['lpg_price'] * lpg_cv}}
+    for k in engine.SHIFT_KEYS:
+        fuel = info['fuel_' + k]
+        specs['fuel_' + k] = {"dist": "normal", "mean": fuel, "std": fuel * fuel_cv}
+    if min_days is not None and min_days < full_days:
+        specs["full_days"] = {"dist": "triangular", "low": min_days, "mode": full_days, "high": full_days}
+    if max_vacancy > 0:
+        specs["vacancy"] = {"dist": "uniform", "low": 0.0, "high": max_vacancy}
+    return specs
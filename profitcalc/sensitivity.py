@@ -0,0 +1,123 @@
+"""2차원 민감도 분석.
+
+두 입력값을 각각 구간으로 나눠 격자의 모든 칸을 한 번의 배치 계산으로 평가한다.
+격자 칸 하나가 engine 배치의 한 행이 되고, 회사 단위 값(LPG 단가, 만근일수 등)은
+행별 배열로 넘긴다. 전 근무형태 사납금 축("sanap")은 값 하나로 덮어쓰지 않고
+근무형태별 사납금에 곱하는 배율(%)이라, 100% 칸이 시나리오 그대로다.
+기사 수·차량 대수 축은 정수로 반올림하고 겹치는 값은 하나만 남긴다.
+"""
+import numpy as np
+
+from . import engine
+
+# 분석 가능한 입력값: 키 -> 표시명
+PARAMS = {
+    "sanap": "1일 사납금 배율 (전 근무형태, %)",
+    **{f"sanap_{k}": f"{label} 1일 사납금" for k, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+    "hourly": "통상 시급",
+    "work_time": "1일 소정근로(시간)",
+    "lpg_price": "LPG 단가",
+    "full_days": "월 만근 일수",
+    **{f"fuel_{k}": f"{label} 연료(L)" for k, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+    **{f"n_{k}": f"{label} 기사 수" for k, label in zip(engine.SHIFT_KEYS, engine.SHIFT_LABELS)},
+    "n_cars": "차량 등록 대수",
+    "rent_cost": "차고지 임대료",
+    "admin_salary_total": "관리 직원 급여",
+}
+
+# 인건비 항목에 영향을 주는 입력값 (나머지는 인건비를 한 번만 계산해 재사용)
+LABOR_PARAMS = {"hourly", "work_time", *engine.RATE_KEYS}
+
+# 정수 값만 의미가 있는 입력값 (사람·차량 수)
+COUNT_PARAMS = {*(f"n_{k}" for k in engine.SHIFT_KEYS), "n_cars"}
+
+# 현재 값이 0 일 때 기본 범위 0 ~ 이 값 (없는 항목은 10)
+ZERO_SPAN = {
+    "hourly": 20_000,
+    "work_time": 8,
+    "lpg_price": 1_500,
+    "full_days": 26,
+    **{f"fuel_{k}": 50 for k in engine.SHIFT_KEYS},
+    **{f"sanap_{k}": 200_000 for k in engine.SHIFT_KEYS},
+    "rent_cost": 10_000_000,
+    "admin_salary_total": 10_000_000,
+}
+
+
+def current_value(basic_info, sc_data, param):
+    """현재 입력된 값 (사납금 배율은 100%)."""
+    if param == "sanap":
+        return 100.0
+    if param.startswith("sanap_"):
+        return sc_data[param[len("sanap_"):]]['sanap']
+    if param in ("hourly", "work_time"):
+        return sc_data[param]
+    return engine.normalize_basic(basic_info)[param]
+
+
+def default_range(param, current):
+    """축 기본 범위 (시작, 끝): 현재 값 ±20%, 현재 값이 0 이면 0 ~ ZERO_SPAN."""
+    if current == 0:
+        return 0.0, float(ZERO_SPAN.get(param, 10))
+    return current * 0.8, current * 1.2
+
+
+def axis_values(param, lo, hi, steps):
+    """lo ~ hi 를 steps 개로 나눈 축 값. 기사 수·차량 대수는 0 이상의 정수로 반올림해 중복을 뺀다."""
+    values = np.linspace(lo, hi, int(steps))
+    if param in COUNT_PARAMS:
+        values = np.unique(np.maximum(np.round(values), 0))
+    return values
+
+
+def _apply(info, batch, param, values):
+    if param == "sanap":
+        batch.sanap[:] = batch.sanap * values[:, None] / 100
+    elif param.startswith("sanap_"):
+        batch.sanap[:, engine.SHIFT_KEYS.index(param[len("sanap_"):])] = values
+    elif param == "hourly":
+        batch.hourly[:] = values
+    elif param == "work_time":
+        batch.work_time[:] = values
+    elif param in engine.BASIC_KEYS:
+        info[param] = values
+    else:
+        raise ValueError(f"지원하지 않는 민감도 항목: {param}")
+
+
+def grid(basic_info, sc_data, x_param, x_values, y_param, y_values):
+    """x × y 격자의 월 영업이익과 이익률.
+
+    반환값의 profit, margin, revenue 는 (len(y_values), len(x_values)) 배열이다.
+    """
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    xx, yy = np.meshgrid(x_values, y_values)
+    cells = xx.size
+
+    base = engine.pack_scenarios([sc_data])
+    batch = engine.ScenarioBatch(
+        names=[sc_data['name']] * cells,
+        hourly=np.repeat(base.hourly, cells),
+        work_time=np.repeat(base.work_time, cells),
+        pay=np.repeat(base.pay, cells, axis=0),
+        tf=np.repeat(base.tf, cells, axis=0),
+        sanap=np.repeat(base.sanap, cells, axis=0),
+    )
+    info = engine.normalize_basic(basic_info)
+    labor = None
+    if not {x_param, y_param} & LABOR_PARAMS:
+        once = engine.labor_terms(engine.insurance_rates(info), base.hourly, base.work_time, base.pay, base.tf)
+        labor = {k: np.broadcast_to(v, batch.pay.shape) for k, v in once.items()}
+    _apply(info, batch, x_param, xx.ravel())
+    _apply(info, batch, y_param, yy.ravel())
+
+    r = engine.evaluate(info, batch, labor)
+    shape = xx.shape
+    return {
+        "x": x_values,
+        "y": y_values,
+        "profit": r['profit'].reshape(shape),
+        "margin": r['margin'].reshape(shape),
+        "revenue": r['revenue'].reshape(shape),
+    }
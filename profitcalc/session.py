@@ -0,0 +1,86 @@
+"""세션 상태(st.session_state) 정리와 메모리 사용량 집계.
+
+시나리오 등록 폼은 추가할 때마다 form_id 를 올려 새 위젯 키(reg_*_{form_id})를 쓰므로
+현재 form_id 가 아닌 키는 다시 쓰이지 않아 evict 로 지운다. 사납금 조정 탭은 시나리오 위치마다
+sim_*_{idx} 키를 쓰는데, 이쪽은 시나리오가 삭제되어 없는 위치의 키만 지우고 다른 시나리오를
+보는 동안에는 keep 으로 값을 남겨 둔다. session_state 처럼 dict 로 쓸 수 있는 객체면 된다.
+"""
+import sys
+
+import numpy as np
+
+from . import engine
+
+FORM_FIELDS = (
+    "reg_name", "reg_hourly", "reg_time",
+    *(f"reg_{field}_{k}" for field in ("pay", "tf", "sanap") for k in engine.SHIFT_KEYS),
+)
+SIM_FIELDS = tuple(f"sim_{k}" for k in engine.SHIFT_KEYS)
+
+
+def numbered_keys(fields, number):
+    """fields 각각에 _{number} 를 붙인 키 집합."""
+    return {f"{field}_{number}" for field in fields}
+
+
+def orphan_keys(state, fields, live):
+    """"{field}_{번호}" 형식이면서 live 에 없는 키 목록."""
+    fields = set(fields)
+    orphans = []
+    for key in list(state.keys()):
+        if not isinstance(key, str) or key in live:
+            continue
+        field, _, number = key.rpartition("_")
+        if field in fields and number.isdigit():
+            orphans.append(key)
+    return orphans
+
+
+def evict(state, fields, live):
+    """orphan_keys 를 지우고 지운 키 목록을 돌려준다."""
+    orphans = orphan_keys(state, fields, live)
+    for key in orphans:
+        del state[key]
+    return orphans
+
+
+def keep(state, keys):
+    """이번 실행에 그리지 않을 위젯 키의 값을 남긴다.
+
+    Streamlit 은 한 번의 실행에서 그려지지 않은 위젯의 상태를 실행이 끝날 때 지우는데,
+    같은 값을 다시 대입하면 일반 세션 값으로 바뀌어 다음에 위젯을 그릴 때 그대로 쓰인다.
+    """
+    kept = [key for key in keys if key in state]
+    for key in kept:
+        state[key] = state[key]
+    return kept
+
+
+def sizeof(obj, _seen=None):
+    """객체가 참조하는 메모리의 대략적인 바이트 수 (같은 객체는 한 번만 센다)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    # pandas 가 아직 import 되지 않았다면 DataFrame 도 있을 수 없으므로 여기서 import 하지 않는다
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(k, _seen) + sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sizeof(v, _seen) for v in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += sizeof(vars(obj), _seen)
+    return size
+
+
+def usage(state):
+    """키별 메모리 사용량 [(키, 바이트), ...] (큰 순서)."""
+    seen = set()
+    rows = [(key, sizeof(state[key], seen)) for key in list(state.keys())]
+    return sorted(rows, key=lambda row: -row[1])
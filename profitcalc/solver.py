@@ -0,0 +1,113 @@
+"""사납금 역산 (손익분기 / 목표 이익률 / 목표 이익).
+
+1인 영업이익은 1일 사납금 s 에 대해 1차식이다.
+    profit = s × full_days × (1 - 10/110 - 1.5%) - (연료비 + 차량 고정비 + 인건비 + 공통 운영비)
+부가세와 카드수수료만 사납금에 비례하고 나머지 비용은 사납금과 무관하므로,
+기울기와 고정 비용만 구해 두면 필요한 사납금을 바로 계산할 수 있다.
+"""
+import numpy as np
+
+from . import engine
+
+
+def coefficients(basic_info, batch, labor=None):
+    """시나리오 × 근무형태별 1차식 계수.
+
+    slope: 1일 사납금 1원당 1인 월 영업이익 증가분
+    base_cost: 사납금과 무관한 1인 월 비용 (공통 운영비 제외)
+    fixed_overhead, car_fixed, n_cars: 기사 수와 무관한 공통비(임대료+관리직 급여), 차량 1대 월 고정비, 차량 대수
+        (min_drivers 가 기사 수마다 빈 차량 비용을 다시 계산할 때 쓴다)
+    """
+    info = engine.normalize_basic(basic_info)
+    r = engine.evaluate(info, batch, labor)
+    shape = batch.sanap.shape
+    fixed = r['fixed']
+
+    def per_cell(value):
+        return np.broadcast_to(engine.column(value), shape)
+
+    full_days = per_cell(info['full_days'])
+    return {
+        "names": batch.names,
+        "sanap": batch.sanap,
+        "counts": r['counts'],
+        "active": r['active'],
+        "full_days": full_days,
+        "slope": full_days * (1 - engine.VAT_RATIO - engine.CARD_FEE_RATE),
+        "base_cost": r['net_fuel_cost'] + r['total_car_fixed'] + r['total_labor_cost'],
+        "cost_overhead": r['cost_overhead'],
+        "total_overhead_sum": per_cell(fixed['total_overhead_sum']),
+        "fixed_overhead": per_cell(fixed['net_rent_cost'] + fixed['net_admin_salary']),
+        "car_fixed": per_cell(fixed['car_fixed_cost_monthly']),
+        "n_cars": per_cell(info['n_cars']),
+    }
+
+
+def _solve(num, den):
+    """den > 0 인 경우만 num / den, 해가 없으면 NaN."""
+    num, den = np.broadcast_arrays(num, den)
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def profit_per_person(coef, sanap):
+    return coef['slope'] * sanap - coef['base_cost'] - coef['cost_overhead']
+
+
+def break_even_sanap(coef):
+    """1인 영업이익이 0 이 되는 1일 사납금."""
+    return _solve(coef['base_cost'] + coef['cost_overhead'], coef['slope'])
+
+
+def target_profit_sanap(coef, target_profit):
+    """1인 월 영업이익 target_profit 원을 내기 위한 1일 사납금."""
+    return _solve(target_profit + coef['base_cost'] + coef['cost_overhead'], coef['slope'])
+
+
+def target_margin_sanap(coef, target_margin):
+    """1인 영업이익률(매출 대비 %) target_margin 을 내기 위한 1일 사납금. 달성 불가능하면 NaN."""
+    return _solve(coef['base_cost'] + coef['cost_overhead'],
+                  coef['slope'] - target_margin / 100 * coef['full_days'])
+
+
+def min_drivers(coef, sanap=None):
+    """현재 사납금 기준, 그 근무형태 기사만으로 공통 운영비를 충당하는 데 필요한 최소 기사 수.
+
+    공통 운영비 중 빈 차량 비용은 기사 수에 따라 달라지므로 후보 인원 n 마다 다시 계산한다.
+    근무형태의 차량 점유율을 r(교대 0.5, 일차 1), 1인 공헌이익(공통 운영비 배부 전 이익)을 c 라 하면
+        빈 차량 비용(n) = max(n_cars - r·n, 0) × 차량 1대 고정비
+    이고 회사 이익 n·c - 임대료·관리직 급여 - 빈 차량 비용(n) 은 n 에 대해 증가하므로,
+    두 직선(빈 차량이 남을 때 / 없을 때)의 손익분기 인원 중 큰 쪽이 답이다. c 가 0 이하이면 NaN.
+    """
+    if sanap is None:
+        sanap = coef['sanap']
+    contribution = coef['slope'] * sanap - coef['base_cost']
+    ratio = engine.CAR_RATIO
+    no_idle = _solve(coef['fixed_overhead'], contribution)
+    with_idle = _solve(coef['fixed_overhead'] + coef['n_cars'] * coef['car_fixed'], contribution + ratio * coef['car_fixed'])
+    return np.ceil(np.maximum(no_idle, with_idle))  # c <= 0 이면 no_idle 이 NaN 이라 결과도 NaN
+
+
+def solve_table(basic_info, scenarios, target_margin=0.0, target_profit=0.0):
+    """전체 시나리오의 역산 결과 표 (인원 있는 근무형태만)."""
+    coef = coefficients(basic_info, engine.pack_scenarios(scenarios))
+    bep = np.ceil(break_even_sanap(coef))
+    by_margin = np.ceil(target_margin_sanap(coef, target_margin))
+    by_profit = np.ceil(target_profit_sanap(coef, target_profit))
+    n_min = min_drivers(coef)
+    profit = profit_per_person(coef, coef['sanap'])
+    rows = []
+    for i, name in enumerate(coef['names']):
+        for j in np.flatnonzero(coef['active'][i]):
+            rows.append({
+                "시나리오명": name,
+                "근무형태": engine.SHIFT_LABELS[j],
+                "현재 사납금": coef['sanap'][i, j],
+                "현재 1인 영업이익": profit[i, j],
+                "손익분기 사납금": bep[i, j],
+                "목표 이익률 사납금": by_margin[i, j],
+                "목표 이익 사납금": by_profit[i, j],
+                "공통비 충당 최소 기사 수": n_min[i, j],
+            })
+    return rows
@@ -0,0 +1,227 @@
+"""로컬 SQLite 시나리오 라이브러리.
+
+회사, 회사별 basic_info 버전, 시나리오를 각각 행으로 저장한다. 저장은 시나리오 단위로
+지문(fingerprint)을 비교해 바뀐 행만 쓰고, 목록 조회는 회사·수정일 인덱스로 페이지 단위로 읽는다.
+이름 검색은 부분 일치(LIKE '%검색어%')라 인덱스를 쓰지 못하므로 이름 인덱스는 두지 않는다.
+JSON 내보내기는 get_current_data 와 같은 형식이다.
+
+한 사무실(한 사용자)이 쓰는 단일 테넌트 저장소다. DB 파일 하나를 서버의 모든 세션이 같이 쓰므로
+접속한 사람은 누구나 모든 회사의 시나리오를 보고 불러올 수 있다. 여러 회사가 같은 서버를 쓴다면
+TAXI_PROFIT_DB 로 회사(사용자)마다 DB 파일과 서버를 따로 둔다. 삭제는 회사를 지정해야 하고
+그 회사의 시나리오만 지운다.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from . import engine
+from .cache import fingerprint
+
+DEFAULT_DB_PATH = os.environ.get(
+    "TAXI_PROFIT_DB", os.path.join(os.path.expanduser("~"), ".local", "share", "taxi-profit", "scenarios.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS basic_versions (
+    id INTEGER PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_basic_company_date ON basic_versions(company_id, created_at);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (company_id, name)
+);
+DROP INDEX IF EXISTS idx_scenarios_name;
+CREATE INDEX IF NOT EXISTS idx_scenarios_company_date ON scenarios(company_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_scenarios_date ON scenarios(updated_at);
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class ScenarioStore:
+    """시나리오 라이브러리 DB. 한 연결을 여러 스레드(Streamlit 세션)가 잠금으로 나눠 쓴다."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _company_id(self, company, create=False):
+        row = self._conn.execute("SELECT id FROM companies WHERE name = ?", (company,)).fetchone()
+        if row is not None:
+            return row['id']
+        if not create:
+            return None
+        return self._conn.execute("INSERT INTO companies (name, created_at) VALUES (?, ?)", (company, _now())).lastrowid
+
+    def companies(self):
+        """[(회사명, 시나리오 수, 마지막 수정일), ...]"""
+        rows = self._query("""
+            SELECT c.name, COUNT(s.id) AS n, MAX(s.updated_at) AS updated_at
+            FROM companies c LEFT JOIN scenarios s ON s.company_id = c.id
+            GROUP BY c.id ORDER BY c.name
+        """)
+        return [(r['name'], r['n'], r['updated_at']) for r in rows]
+
+    def save_basic(self, company, basic_info):
+        """basic_info 를 새 버전으로 저장. 최신 버전과 같으면 쓰지 않고 그 id 를 돌려준다."""
+        info = {k: basic_info[k] for k in engine.BASIC_KEYS if k in basic_info}
+        fp = fingerprint(info)
+        with self._lock, self._conn:
+            company_id = self._company_id(company, create=True)
+            latest = self._conn.execute(
+                "SELECT id, fingerprint FROM basic_versions WHERE company_id = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+                (company_id,)).fetchone()
+            if latest is not None and latest['fingerprint'] == fp:
+                return latest['id']
+            return self._conn.execute(
+                "INSERT INTO basic_versions (company_id, fingerprint, data, created_at) VALUES (?, ?, ?, ?)",
+                (company_id, fp, json.dumps(info, ensure_ascii=False), _now())).lastrowid
+
+    def basic_versions(self, company):
+        """[(버전 id, 저장 시각), ...] 최신순."""
+        rows = self._query("""
+            SELECT b.id, b.created_at FROM basic_versions b JOIN companies c ON c.id = b.company_id
+            WHERE c.name = ? ORDER BY b.created_at DESC, b.id DESC
+        """, (company,))
+        return [(r['id'], r['created_at']) for r in rows]
+
+    def load_basic(self, company, version=None):
+        """basic_info (version 이 없으면 최신). 저장된 적이 없으면 None."""
+        sql = "SELECT b.data FROM basic_versions b JOIN companies c ON c.id = b.company_id WHERE c.name = ?"
+        params = [company]
+        if version is not None:
+            sql += " AND b.id = ?"
+            params.append(version)
+        rows = self._query(sql + " ORDER BY b.created_at DESC, b.id DESC LIMIT 1", params)
+        return json.loads(rows[0]['data']) if rows else None
+
+    def save_scenario(self, company, sc_data):
+        """시나리오 한 개 저장 (같은 회사·이름이면 덮어씀). 내용이 같으면 쓰지 않고 False."""
+        return self.sync(company, [sc_data]) == 1
+
+    def sync(self, company, scenarios):
+        """시나리오 목록 중 DB 와 내용이 다른 것만 저장하고 저장한 개수를 돌려준다.
+
+        목록에 없는 DB 시나리오는 지우지 않는다 (삭제는 delete_scenarios).
+        """
+        if not scenarios:
+            return 0
+        prints = {sc['name']: fingerprint(sc) for sc in scenarios}
+        with self._lock, self._conn:
+            company_id = self._company_id(company, create=True)
+            stored = {}
+            names = list(prints)
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT name, fingerprint FROM scenarios WHERE company_id = ? AND name IN ({','.join('?' * len(chunk))})",
+                    [company_id, *chunk]).fetchall()
+                stored.update((r['name'], r['fingerprint']) for r in rows)
+            now = _now()
+            changed = [(company_id, sc['name'], prints[sc['name']], json.dumps(sc, ensure_ascii=False), now)
+                       for sc in scenarios if stored.get(sc['name']) != prints[sc['name']]]
+            self._conn.executemany("""
+                INSERT INTO scenarios (company_id, name, fingerprint, data, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (company_id, name) DO UPDATE SET
+                    fingerprint = excluded.fingerprint, data = excluded.data, updated_at = excluded.updated_at
+            """, changed)
+        return len(changed)
+
+    def _where(self, company=None, name_like=None, since=None, until=None):
+        clauses, params = [], []
+        if company:
+            clauses.append("c.name = ?")
+            params.append(company)
+        if name_like:
+            # 검색어의 % _ 는 와일드카드가 아니라 글자 그대로 찾는다
+            escaped = name_like.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("s.name LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if since:
+            clauses.append("s.updated_at >= ?")
+            params.append(str(since))
+        if until:
+            clauses.append("s.updated_at < ?")
+            params.append(str(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count_scenarios(self, company=None, name_like=None, since=None, until=None):
+        where, params = self._where(company, name_like, since, until)
+        rows = self._query(f"SELECT COUNT(*) AS n FROM scenarios s JOIN companies c ON c.id = s.company_id{where}", params)
+        return rows[0]['n']
+
+    def query_scenarios(self, company=None, name_like=None, since=None, until=None, limit=50, offset=0):
+        """조건에 맞는 시나리오 목록 한 페이지 [{"id", "company", "name", "updated_at"}, ...] (최근 수정순).
+
+        시나리오 내용(data)은 읽지 않는다.
+        """
+        where, params = self._where(company, name_like, since, until)
+        rows = self._query(f"""
+            SELECT s.id, c.name AS company, s.name, s.updated_at
+            FROM scenarios s JOIN companies c ON c.id = s.company_id{where}
+            ORDER BY s.updated_at DESC, s.id DESC LIMIT ? OFFSET ?
+        """, [*params, int(limit), int(offset)])
+        return [dict(r) for r in rows]
+
+    def load_scenarios(self, ids):
+        """id 목록의 시나리오 dict (ids 순서대로)."""
+        found = {}
+        ids = [int(i) for i in ids]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self._query(f"SELECT id, data FROM scenarios WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            found.update((r['id'], json.loads(r['data'])) for r in rows)
+        return [found[i] for i in ids if i in found]
+
+    def delete_scenarios(self, company, ids):
+        """company 의 시나리오 중 ids 에 든 것만 지우고 지운 개수를 돌려준다 (다른 회사 id 는 무시)."""
+        ids = [int(i) for i in ids]
+        with self._lock, self._conn:
+            company_id = self._company_id(company)
+            if company_id is None:
+                return 0
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM scenarios WHERE id = ? AND company_id = ?", [(i, company_id) for i in ids])
+            return self._conn.total_changes - before
+
+    def export_json(self, company):
+        """회사의 최신 basic_info 와 전체 시나리오를 get_current_data 형식 JSON 문자열로."""
+        rows = self._query("""
+            SELECT s.data FROM scenarios s JOIN companies c ON c.id = s.company_id
+            WHERE c.name = ? ORDER BY s.id
+        """, (company,))
+        data = {"basic_info": self.load_basic(company) or {}, "scenarios": [json.loads(r['data']) for r in rows]}
+        return json.dumps(data, indent=4, ensure_ascii=False)
@@ -0,0 +1,38 @@
+"""AI 분석 서비스(profitcalc.ai.AnalysisService) 의 응답 캐시 확인 (스텁 백엔드, 네트워크 없음)."""
+import time
+
+from profitcalc import ai
+
+
+class InvalidKeyBackend(ai.StubBackend):
+    """잘못된 API 키처럼 모델 목록과 생성 요청이 모두 실패하는 백엔드."""
+
+    def list_models(self):
+        raise PermissionError("API key not valid")
+
+    def stream(self, model, prompt):
+        raise PermissionError("API key not valid")
+
+
+def wait(job):
+    while job.running:
+        time.sleep(0.01)
+    return job
+
+
+def test_cache_ignores_date_outside_cache_prompt(tmp_path):
+    service = ai.AnalysisService(cache_dir=str(tmp_path), backend_factory=lambda key: ai.StubBackend(delay=0))
+    first = wait(service.submit("key", "1일 - 데이터", cache_prompt="{today} - 데이터"))
+    second = wait(service.submit("key", "2일 - 데이터", cache_prompt="{today} - 데이터"))
+    assert (first.status, first.cached) == ("done", False)
+    assert (second.status, second.cached) == ("done", True)
+
+
+def test_unverified_key_does_not_get_cached_response(tmp_path):
+    cache = ai.ResponseCache(str(tmp_path))
+    cache.put(cache.key(ai.FALLBACK_MODEL, "프롬프트"), ai.FALLBACK_MODEL, "다른 사용자의 응답")
+    service = ai.AnalysisService(cache_dir=str(tmp_path), backoff=0, backend_factory=lambda key: InvalidKeyBackend(delay=0))
+    job = wait(service.submit("bad-key", "프롬프트"))
+    assert job.status == "error"
+    assert not job.cached
+    assert "다른 사용자의 응답" not in job.text
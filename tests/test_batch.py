@@ -0,0 +1,26 @@
+"""일괄 계산 CLI(profitcalc.batch) 의 XLSX 출력 확인."""
+import json
+import os
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from profitcalc import batch  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "standard.json")
+
+
+def test_xlsx_strips_control_characters(tmp_path):
+    with open(FIXTURE, encoding="utf-8") as f:
+        data = json.load(f)
+    data['scenarios'] = data['scenarios'][:1]
+    data['scenarios'][0]['name'] = "기본\x01안\x1f"
+    src = tmp_path / "company.json"
+    src.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    out = tmp_path / "result.xlsx"
+    n_files, n_rows, failed = batch.run([str(src)], str(out), workers=1, progress=None)
+    assert (n_files, n_rows, failed) == (1, 1, [])
+    sheet = openpyxl.load_workbook(out)["Results"]
+    assert [c.value for c in sheet[1]] == batch.COLUMNS
+    assert sheet["B2"].value == "기본안"
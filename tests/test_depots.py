@@ -0,0 +1,33 @@
+"""다중 차고지 결과 캐시(profitcalc.depots.DepotGroup) 확인."""
+import json
+import os
+
+from profitcalc import depots
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "standard.json")
+
+
+def load_fixture():
+    with open(FIXTURE, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["basic_info"], data["scenarios"]
+
+
+def test_same_inputs_keep_their_own_names():
+    basic_info, scenarios = load_fixture()
+    group = depots.DepotGroup()
+    depot_list = [{"name": name, "basic_info": basic_info, "scenarios": scenarios} for name in ("강남", "강북")]
+    results = group.evaluate(depot_list)
+    assert [dep['name'] for dep in results] == ["강남", "강북"]
+    assert results[0]['results'] == results[1]['results']
+    _, picks = depots.best_mix(results)
+    assert list(picks) == ["강남", "강북"]
+
+
+def test_cached_entry_is_relabelled_per_lookup():
+    basic_info, scenarios = load_fixture()
+    group = depots.DepotGroup()
+    group.evaluate([{"name": "A운수", "basic_info": basic_info, "scenarios": scenarios}])
+    results = group.evaluate([{"name": "B운수", "basic_info": basic_info, "scenarios": scenarios}])
+    assert [dep['name'] for dep in results] == ["B운수"]
+    assert results[0] == depots.evaluate_depot({"name": "B운수", "basic_info": basic_info, "scenarios": scenarios})
@@ -0,0 +1,50 @@
+"""엑셀 보고서(profitcalc.report) 가 openpyxl 로 그대로 열리는지 확인."""
+import copy
+import io
+import json
+import os
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from profitcalc import report  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "standard.json")
+
+
+def load_fixture():
+    with open(FIXTURE, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["basic_info"], data["scenarios"]
+
+
+def open_report(basic_info, scenarios):
+    return openpyxl.load_workbook(io.BytesIO(report.report_bytes(basic_info, scenarios)))
+
+
+def test_report_opens_with_openpyxl():
+    basic_info, scenarios = load_fixture()
+    book = open_report(basic_info, scenarios)
+    assert book.sheetnames == ["Summary", "근무형태별", "상세 계산 검증"]
+    summary = book["Summary"]
+    assert [c.value for c in summary[1]] == report.SUMMARY_COLUMNS
+    assert [row[0].value for row in summary.iter_rows(min_row=2)] == [sc['name'] for sc in scenarios]
+    assert summary["B2"].number_format == "#,##0"
+    assert summary.freeze_panes == "A2"
+
+
+def test_control_characters_are_stripped():
+    basic_info, scenarios = load_fixture()
+    scenarios = copy.deepcopy(scenarios[:1])
+    scenarios[0]['name'] = "기본\x01안\x1f <&>\"' \t탭\ud800"
+    book = open_report(basic_info, scenarios)
+    expected = "기본안 <&>\"' \t탭"
+    assert book["Summary"]["A2"].value == expected
+    assert book["상세 계산 검증"]["A2"].value == expected
+
+
+def test_empty_report():
+    basic_info, _ = load_fixture()
+    book = open_report(basic_info, [])
+    assert book["Summary"].max_row == 1